@@ -23,6 +23,7 @@ from app.models.doctor_leave import DoctorLeave
 from app.models.calendar_watch import CalendarWatch
 from app.models.doctor_account import DoctorAccount
 from app.models.clinic import Clinic
+from app.models.doctor_day_availability import DoctorDayAvailability
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
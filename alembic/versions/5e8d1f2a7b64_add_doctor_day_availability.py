@@ -0,0 +1,35 @@
+"""Add doctor_day_availability materialized table
+
+Merges the 2b1a4c8c7c1a and 2f3b6a4d1c90 heads.
+
+Revision ID: 5e8d1f2a7b64
+Revises: 2b1a4c8c7c1a, 2f3b6a4d1c90
+Create Date: 2026-10-17 00:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "5e8d1f2a7b64"
+down_revision = ("2b1a4c8c7c1a", "2f3b6a4d1c90")
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "doctor_day_availability",
+        sa.Column("doctor_email", sa.String(length=255), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("busy_bitmap", sa.LargeBinary(), nullable=False, server_default=sa.text("''::bytea")),
+        sa.Column("on_leave", sa.Boolean(), nullable=False, server_default=sa.text("false")),
+        sa.Column("version", sa.Integer(), nullable=False, server_default="1"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.ForeignKeyConstraint(["doctor_email"], ["doctors.email"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("doctor_email", "date"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("doctor_day_availability")
@@ -0,0 +1,42 @@
+"""Notify calendar_sync_jobs listeners when jobs are queued
+
+Revision ID: 7c4a9e2d5b13
+Revises: 5e8d1f2a7b64
+Create Date: 2026-10-17 00:00:00.000000
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "7c4a9e2d5b13"
+down_revision = "5e8d1f2a7b64"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # NOTIFY is delivered on commit, so listeners only wake for committed jobs
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION notify_calendar_sync_job() RETURNS trigger AS $$
+        BEGIN
+            IF NEW.status = 'PENDING' THEN
+                PERFORM pg_notify('calendar_sync_jobs', '');
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER calendar_sync_jobs_notify
+        AFTER INSERT OR UPDATE OF status, next_attempt_at ON calendar_sync_jobs
+        FOR EACH ROW EXECUTE FUNCTION notify_calendar_sync_job()
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS calendar_sync_jobs_notify ON calendar_sync_jobs")
+    op.execute("DROP FUNCTION IF EXISTS notify_calendar_sync_job()")
@@ -0,0 +1,23 @@
+"""Add google_calendar_event_etag to appointments
+
+Revision ID: a9d4e6b2c7f1
+Revises: e5a7c2f9d314
+Create Date: 2026-10-17 00:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "a9d4e6b2c7f1"
+down_revision = "e5a7c2f9d314"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("appointments", sa.Column("google_calendar_event_etag", sa.String(length=255), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("appointments", "google_calendar_event_etag")
@@ -0,0 +1,32 @@
+"""Add worker leases to calendar_sync_jobs
+
+Revision ID: b3f1d8a4c6e2
+Revises: 7c4a9e2d5b13
+Create Date: 2026-10-17 00:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b3f1d8a4c6e2"
+down_revision = "7c4a9e2d5b13"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("calendar_sync_jobs", sa.Column("worker_id", sa.String(length=100), nullable=True))
+    op.add_column("calendar_sync_jobs", sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True))
+    op.create_index(
+        "idx_calendar_sync_job_status_lease",
+        "calendar_sync_jobs",
+        ["status", "lease_expires_at"],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_calendar_sync_job_status_lease", table_name="calendar_sync_jobs")
+    op.drop_column("calendar_sync_jobs", "lease_expires_at")
+    op.drop_column("calendar_sync_jobs", "worker_id")
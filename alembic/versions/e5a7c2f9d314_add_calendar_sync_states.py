@@ -0,0 +1,32 @@
+"""Add calendar_sync_states for incremental Google Calendar sync
+
+Revision ID: e5a7c2f9d314
+Revises: b3f1d8a4c6e2
+Create Date: 2026-10-17 00:00:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "e5a7c2f9d314"
+down_revision = "b3f1d8a4c6e2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "calendar_sync_states",
+        sa.Column("doctor_email", sa.String(length=255), nullable=False),
+        sa.Column("sync_token", sa.Text(), nullable=True),
+        sa.Column("last_full_sync_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_synced_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.ForeignKeyConstraint(["doctor_email"], ["doctors.email"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("doctor_email"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("calendar_sync_states")
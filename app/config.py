@@ -17,6 +17,8 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str
+    ASYNC_DB_POOL_SIZE: int = 20  # Connections per process for async routes
+    ASYNC_DB_MAX_OVERFLOW: int = 20
     
     # Security
     SERVICE_API_KEY: str
@@ -33,7 +35,7 @@ class Settings(BaseSettings):
     GOOGLE_CALENDAR_WEBHOOK_SECRET: str  # Secret token for webhook verification
     
     # Local/degraded mode controls
-    DISABLE_CALENDAR_WORKERS: bool = False  # Skip starting calendar sync/watch/reconcile
+    DISABLE_CALENDAR_WORKERS: bool = False  # Skip starting calendar sync/watch/reconcile (e.g. run_worker.py runs them)
     ALLOW_START_WITHOUT_API_KEY: bool = False  # Only for local/dev; never enable in prod
 
     # RAG Service
@@ -56,18 +58,57 @@ class Settings(BaseSettings):
     MAX_AVAILABILITY_RESULTS: int = 200
     MAX_LIST_LIMIT: int = 200
 
+    # Materialized availability (doctor_day_availability); run rebuild_availability.py before enabling
+    AVAILABILITY_MATERIALIZED_ENABLED: bool = False
+
+    # Shared availability cache (Redis at REDIS_URL); falls back to the DB when unavailable
+    AVAILABILITY_CACHE_ENABLED: bool = False
+    AVAILABILITY_CACHE_TTL_SECONDS: int = 300
+    AVAILABILITY_CACHE_LOCK_TIMEOUT_MS: int = 2000  # Recompute lock TTL; how long other callers wait for it
+
     # Doctor export caching
     DOCTOR_EXPORT_CACHE_TTL_SECONDS: int = 60
 
+    # Google Calendar API clients cached per (subject, delegation)
+    GOOGLE_CLIENT_CACHE_SIZE: int = 256
+
+    # Google API token buckets: per delegated user (or the service account) and per project
+    GOOGLE_API_RATE_LIMIT_ENABLED: bool = True
+    GOOGLE_API_RATE_LIMIT_REDIS: bool = False  # Share buckets across processes via REDIS_URL
+    GOOGLE_API_USER_RATE_PER_SECOND: float = 8.0
+    GOOGLE_API_USER_BURST: int = 20
+    GOOGLE_API_PROJECT_RATE_PER_SECOND: float = 50.0
+    GOOGLE_API_PROJECT_BURST: int = 100
+
     # Calendar sync worker
     CALENDAR_SYNC_MAX_RETRIES: int = 5
     CALENDAR_SYNC_RETRY_BASE_SECONDS: int = 15
-    CALENDAR_SYNC_POLL_INTERVAL_SECONDS: int = 5
+    CALENDAR_SYNC_POLL_INTERVAL_SECONDS: int = 5  # Fallback when Postgres LISTEN is unavailable
+    CALENDAR_SYNC_IDLE_TIMEOUT_SECONDS: int = 300  # Max sleep between NOTIFY wake-ups
+    CALENDAR_SYNC_BATCH_SIZE: int = 50  # Max jobs claimed and held in memory per process
+    CALENDAR_SYNC_CONCURRENCY: int = 8  # Worker threads; one doctor's jobs never run concurrently
+    CALENDAR_SYNC_INLINE: bool = False  # Call Google inside the request instead of waking the worker
+    CALENDAR_SYNC_LEASE_SECONDS: int = 300  # A crashed worker's claimed jobs are retried after this
+
+    # Singleton background services (watch renewal, reconcile) run only in the elected leader process
+    LEADER_ELECTION_ENABLED: bool = True
+    LEADER_ELECTION_INTERVAL_SECONDS: int = 10
+
+    # Calendar watch channels
+    CALENDAR_WATCH_RENEW_CONCURRENCY: int = 8  # Renewals in flight at once
+    CALENDAR_WATCH_EXPIRATION_JITTER_HOURS: int = 48  # Watches last 7 days minus up to this, spreading renewals
+    CALENDAR_WATCH_CHANNEL_CACHE_TTL_SECONDS: int = 300  # Webhook channel lookups; 0 disables
+
+    # Webhook-triggered syncs: one per doctor per burst, at most every MIN_SYNC_INTERVAL
+    CALENDAR_WEBHOOK_DEBOUNCE_SECONDS: float = 2.0
+    CALENDAR_WEBHOOK_MIN_SYNC_INTERVAL_SECONDS: float = 10.0
+    CALENDAR_WEBHOOK_SYNC_CONCURRENCY: int = 4
 
     # Calendar reconcile worker (Google Calendar -> DB backfill)
     CALENDAR_RECONCILE_ENABLED: bool = True
     CALENDAR_RECONCILE_INTERVAL_SECONDS: int = 900
-    CALENDAR_RECONCILE_BATCH_SIZE: int = 50
+    CALENDAR_RECONCILE_BATCH_SIZE: int = 50  # Doctors per keyset page
+    CALENDAR_RECONCILE_CONCURRENCY: int = 8  # Doctors synced at once
     CALENDAR_RECONCILE_REQUIRE_ACTIVE_WATCH: bool = True
 
     # Timezone
@@ -1,7 +1,13 @@
 """
 Database connection and session management.
+
+Two engines share DATABASE_URL: the sync engine serves background workers,
+scripts and sync routes; the async engine (psycopg's async driver) serves
+the pure-database read routes, so waiting on Postgres does not block the
+event loop.
 """
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
@@ -20,6 +26,21 @@ engine = create_engine(
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine for the event-loop routes (postgresql+psycopg selects psycopg's async mode)
+async_engine = create_async_engine(
+    settings.DATABASE_URL,
+    pool_pre_ping=True,
+    pool_size=settings.ASYNC_DB_POOL_SIZE,
+    max_overflow=settings.ASYNC_DB_MAX_OVERFLOW,
+    pool_timeout=30,
+    pool_recycle=1800,
+    echo=settings.DEBUG
+)
+
+# expire_on_commit=False: reloading an expired attribute outside run_sync would
+# need implicit async I/O and raise MissingGreenlet
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Base class for models
 Base = declarative_base()
 
@@ -34,3 +55,15 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """
+    Dependency for getting an async database session.
+
+    Routes using it either query through AsyncSession directly or run the
+    shared sync service code with `await db.run_sync(func, ...)`, which gives
+    func a regular Session whose database I/O is awaited on the event loop.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
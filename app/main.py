@@ -8,11 +8,16 @@ from app.routes import doctor, patient, appointment, webhooks, clinic
 from app.security import rate_limiter
 from fastapi import Depends
 from app.logging_config import setup_logging
+from app.services.availability_cache import availability_cache
+from app.services.background_workers import background_workers
+from app.services.calendar_sync_debouncer import calendar_sync_debouncer
 from app.services.calendar_sync_queue import calendar_sync_queue
 from app.services.calendar_reconcile_service import calendar_reconcile_service
 from app.services.calendar_watch_service import calendar_watch_service
+from app.services.google_client_cache import google_client_cache
+from app.services.google_rate_limiter import google_rate_limiter
 from app.middleware.request_id import request_id_middleware
-from app.database import SessionLocal
+from app.database import SessionLocal, async_engine
 from sqlalchemy import text
 import os
 import logging
@@ -85,7 +90,8 @@ async def health():
         "calendar_credentials": "unknown",
         "calendar_sync_worker": "unknown",
         "calendar_watch_worker": "unknown",
-        "calendar_reconcile_worker": "unknown"
+        "calendar_reconcile_worker": "unknown",
+        "availability_cache": availability_cache.status()
     }
 
     try:
@@ -107,17 +113,28 @@ async def health():
     else:
         checks["calendar_credentials"] = "healthy" if credentials_path and os.path.exists(credentials_path) else "missing"
         checks["calendar_sync_worker"] = "healthy" if calendar_sync_queue.is_running() else "stopped"
-        checks["calendar_watch_worker"] = "healthy" if calendar_watch_service.is_running() else "stopped"
-        checks["calendar_reconcile_worker"] = "healthy" if calendar_reconcile_service.is_running() else "stopped"
+        if background_workers.is_leader:
+            checks["calendar_watch_worker"] = "healthy" if calendar_watch_service.is_running() else "stopped"
+            checks["calendar_reconcile_worker"] = "healthy" if calendar_reconcile_service.is_running() else "stopped"
+        else:
+            # Another process holds the leader lock and runs these
+            checks["calendar_watch_worker"] = "standby"
+            checks["calendar_reconcile_worker"] = "standby"
 
-    allowed_statuses = {"healthy", "disabled"}
+    allowed_statuses = {"healthy", "disabled", "standby"}
     overall = "healthy" if all(v in allowed_statuses for v in checks.values()) else "degraded"
 
     return {
         "status": overall,
         "service": settings.APP_NAME,
         "version": settings.APP_VERSION,
-        "checks": checks
+        "checks": checks,
+        "availability_cache": availability_cache.stats(),
+        "calendar_sync_queue": calendar_sync_queue.stats(),
+        "calendar_webhook_syncs": calendar_sync_debouncer.stats(),
+        "calendar_watches": calendar_watch_service.stats(),
+        "google_client_cache": google_client_cache.stats(),
+        "google_rate_limiter": google_rate_limiter.stats()
     }
 
 
@@ -131,18 +148,17 @@ async def startup_event():
             raise RuntimeError("SERVICE_API_KEY or SERVICE_API_KEYS must be configured")
 
     if settings.DISABLE_CALENDAR_WORKERS:
-        logger.warning("Calendar workers disabled via DISABLE_CALENDAR_WORKERS; Google sync/watch/reconcile will NOT run")
+        logger.warning(
+            "Calendar workers disabled via DISABLE_CALENDAR_WORKERS; run run_worker.py for Google sync/watch/reconcile"
+        )
     else:
-        if not settings.GOOGLE_CALENDAR_CREDENTIALS_PATH or not os.path.exists(settings.GOOGLE_CALENDAR_CREDENTIALS_PATH):
-            raise RuntimeError("GOOGLE_CALENDAR_CREDENTIALS_PATH must point to a valid credentials file")
-        calendar_sync_queue.start()
-        calendar_watch_service.start()
-        calendar_reconcile_service.start()
+        background_workers.start()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Stop background services."""
-    calendar_sync_queue.stop()
-    calendar_watch_service.stop()
-    calendar_reconcile_service.stop()
+    calendar_sync_debouncer.stop()
+    if background_workers.started:
+        background_workers.stop()
+    await async_engine.dispose()
@@ -6,9 +6,11 @@ from app.models.appointment import Appointment
 from app.models.doctor_leave import DoctorLeave
 from app.models.calendar_watch import CalendarWatch
 from app.models.calendar_sync_job import CalendarSyncJob
+from app.models.calendar_sync_state import CalendarSyncState
 from app.models.idempotency_key import IdempotencyKey
 from app.models.doctor_account import DoctorAccount
 from app.models.clinic import Clinic
+from app.models.doctor_day_availability import DoctorDayAvailability
 
 __all__ = [
     "Doctor",
@@ -18,7 +20,9 @@ __all__ = [
     "DoctorLeave",
     "CalendarWatch",
     "CalendarSyncJob",
+    "CalendarSyncState",
     "IdempotencyKey",
     "DoctorAccount",
     "Clinic",
+    "DoctorDayAvailability",
 ]
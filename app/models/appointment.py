@@ -44,6 +44,8 @@ class Appointment(Base):
     end_at_utc = Column(DateTime(timezone=True), nullable=False, index=True)
     status = Column(SQLEnum(AppointmentStatus), default=AppointmentStatus.BOOKED, nullable=False, index=True)
     google_calendar_event_id = Column(String(255), nullable=True, unique=True, index=True)
+    # Google event etag (or "updated" timestamp) as of the last import; unchanged events are skipped
+    google_calendar_event_etag = Column(String(255), nullable=True)
     calendar_sync_status = Column(String(20), nullable=False, default="PENDING", index=True)
     calendar_sync_attempts = Column(Integer, nullable=False, default=0)
     calendar_sync_next_attempt_at = Column(DateTime(timezone=True), nullable=True, index=True)
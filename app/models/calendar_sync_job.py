@@ -16,10 +16,13 @@ class CalendarSyncJob(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
     appointment_id = Column(UUID(as_uuid=True), ForeignKey("appointments.id", ondelete="CASCADE"), nullable=False, index=True)
     action = Column(String(20), nullable=False)  # CREATE, UPDATE, DELETE
-    status = Column(String(20), nullable=False, default="PENDING")  # PENDING, IN_PROGRESS, COMPLETED, FAILED
+    status = Column(String(20), nullable=False, default="PENDING")  # PENDING, IN_PROGRESS, COMPLETED, FAILED, COALESCED
     attempts = Column(Integer, nullable=False, default=0)
     next_attempt_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
     last_error = Column(String(500), nullable=True)
+    # Set while IN_PROGRESS; a job whose lease has expired (worker crashed) can be claimed again
+    worker_id = Column(String(100), nullable=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
     updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
 
@@ -28,6 +31,7 @@ class CalendarSyncJob(Base):
     __table_args__ = (
         Index("idx_calendar_sync_job_status_next", "status", "next_attempt_at"),
         Index("idx_calendar_sync_job_appointment_action", "appointment_id", "action"),
+        Index("idx_calendar_sync_job_status_lease", "status", "lease_expires_at"),
     )
 
     def __repr__(self):
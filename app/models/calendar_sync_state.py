@@ -0,0 +1,26 @@
+"""
+CalendarSyncState model - per-doctor Google Calendar incremental sync cursor.
+"""
+from datetime import datetime, timezone
+from sqlalchemy import Column, String, DateTime, ForeignKey, Text
+from app.database import Base
+
+
+class CalendarSyncState(Base):
+    """
+    Where the last Google Calendar -> DB sync for a doctor left off.
+
+    sync_token is Google's nextSyncToken; the next sync lists only events
+    changed since then. It is written in the same transaction as the changes it
+    covers and cleared when Google answers 410 Gone, forcing a full resync.
+    """
+    __tablename__ = "calendar_sync_states"
+
+    doctor_email = Column(String(255), ForeignKey("doctors.email", ondelete="CASCADE"), primary_key=True)
+    sync_token = Column(Text, nullable=True)
+    last_full_sync_at = Column(DateTime(timezone=True), nullable=True)
+    last_synced_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
+
+    def __repr__(self):
+        return f"<CalendarSyncState(doctor_email={self.doctor_email}, last_synced_at={self.last_synced_at})>"
@@ -0,0 +1,29 @@
+"""
+DoctorDayAvailability model - materialized per doctor/date availability.
+"""
+from datetime import datetime, timezone
+from sqlalchemy import Column, String, Date, DateTime, Boolean, Integer, LargeBinary, ForeignKey
+from app.database import Base
+
+
+class DoctorDayAvailability(Base):
+    """
+    Materialized availability for one doctor on one date.
+
+    busy_bitmap is a minute-resolution bitmap (bit N = minute N after midnight,
+    little-endian bytes) of BOOKED/RESCHEDULED appointments. Storing booked
+    minutes rather than free slots keeps rows valid when working hours or slot
+    duration change. Rows are maintained in the same transaction as every
+    appointment/leave write and can be regenerated with rebuild_availability.py.
+    """
+    __tablename__ = "doctor_day_availability"
+
+    doctor_email = Column(String(255), ForeignKey("doctors.email", ondelete="CASCADE"), primary_key=True)
+    date = Column(Date, primary_key=True)
+    busy_bitmap = Column(LargeBinary, nullable=False, default=b"")
+    on_leave = Column(Boolean, nullable=False, default=False)
+    version = Column(Integer, nullable=False, default=1)
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), nullable=False)
+
+    def __repr__(self):
+        return f"<DoctorDayAvailability(doctor_email={self.doctor_email}, date={self.date}, version={self.version})>"
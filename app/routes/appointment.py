@@ -3,12 +3,14 @@ Appointment management API routes.
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Header, Query
 from fastapi.responses import JSONResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from uuid import UUID
 from datetime import date, datetime, timezone, timedelta
 
-from app.database import get_db
+from app.database import get_async_db, get_db
 from app.security import verify_api_key
 from app.models.appointment import Appointment, AppointmentStatus
 from app.models.doctor import Doctor
@@ -16,7 +18,9 @@ from app.schemas.appointment import (
     AppointmentCreate,
     AppointmentReschedule,
     AppointmentResponse,
-    AvailabilityResponse
+    AvailabilityResponse,
+    AvailabilityRangeResponse,
+    EarliestAvailabilityResponse
 )
 from app.services.availability_service import AvailabilityService
 from app.config import settings
@@ -32,9 +36,16 @@ booking_service = BookingService()
 idempotency_service = IdempotencyService()
 _doctor_export_cache = {"timestamp": None, "clinic_id": None, "data": None}
 
+# Availability, booking and availability search reach the Redis availability
+# cache, the Google rate limiter (which may sleep) and, with CALENDAR_SYNC_INLINE,
+# Google Calendar itself, so they are plain def routes that FastAPI runs in its
+# threadpool on a sync Session. The pure-database read routes (earliest,
+# range, export) take an AsyncSession and run the shared service code through
+# db.run_sync, so each database round trip is awaited on the event loop.
+
 
 @router.get("/availability/{doctor_email}", response_model=AvailabilityResponse)
-async def get_availability(
+def get_availability(
     doctor_email: str,
     date: date,
     db: Session = Depends(get_db),
@@ -44,6 +55,10 @@ async def get_availability(
     Get available slots for a doctor on a specific date.
     Database is the single source of truth for availability.
     """
+    return _get_availability(db, doctor_email, date)
+
+
+def _get_availability(db: Session, doctor_email: str, date: date) -> AvailabilityResponse:
     try:
         today = datetime.now(timezone.utc).date()
         max_date = today + timedelta(days=settings.MAX_AVAILABILITY_DAYS)
@@ -73,7 +88,7 @@ async def get_availability(
 
 
 @router.post("/", response_model=AppointmentResponse, status_code=status.HTTP_201_CREATED)
-async def book_appointment(
+def book_appointment(
     appointment_data: AppointmentCreate,
     db: Session = Depends(get_db),
     api_key: str = Depends(verify_api_key),
@@ -89,6 +104,14 @@ async def book_appointment(
     4. Use DB transaction + row-level locking to prevent double booking
     5. After DB commit, create Google Calendar event
     """
+    return _book_appointment(db, appointment_data, idempotency_key)
+
+
+def _book_appointment(
+    db: Session,
+    appointment_data: AppointmentCreate,
+    idempotency_key: Optional[str]
+):
     record = None
     try:
         if idempotency_key:
@@ -161,8 +184,31 @@ async def book_appointment(
         )
 
 
+def _doctor_search_query(
+    db: Session,
+    specialization: Optional[str],
+    language: Optional[str],
+    clinic_id: Optional[UUID]
+):
+    """Build the active-doctor query shared by the availability search endpoints."""
+    if specialization and len(specialization) > 100:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="specialization too long")
+    if language and len(language) > 50:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="language too long")
+
+    query = db.query(Doctor).filter(Doctor.is_active == True)
+
+    if clinic_id:
+        query = query.filter(Doctor.clinic_id == clinic_id)
+    if specialization:
+        query = query.filter(Doctor.specialization.ilike(f"%{specialization}%"))
+    if language:
+        query = query.filter(Doctor.languages.any(language))
+    return query
+
+
 @router.get("/availability-search")
-async def search_availability(
+def search_availability(
     specialization: Optional[str] = None,
     language: Optional[str] = None,
     target_date: Optional[date] = Query(default=None, alias="date"),
@@ -176,6 +222,18 @@ async def search_availability(
     Advanced availability search for chatbot.
     Find doctors by specialization, language, and check availability.
     """
+    return _search_availability(db, specialization, language, target_date, clinic_id, skip, limit)
+
+
+def _search_availability(
+    db: Session,
+    specialization: Optional[str],
+    language: Optional[str],
+    target_date: Optional[date],
+    clinic_id: Optional[UUID],
+    skip: int,
+    limit: int
+) -> dict:
     try:
         if skip < 0 or limit < 1:
             raise HTTPException(
@@ -197,20 +255,8 @@ async def search_availability(
                     detail=f"date must be between today and {max_date.isoformat()}"
                 )
 
-        if specialization and len(specialization) > 100:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="specialization too long")
-        if language and len(language) > 50:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="language too long")
-
         # Build doctor query based on filters
-        query = db.query(Doctor).filter(Doctor.is_active == True)
-
-        if clinic_id:
-            query = query.filter(Doctor.clinic_id == clinic_id)
-        if specialization:
-            query = query.filter(Doctor.specialization.ilike(f"%{specialization}%"))
-        if language:
-            query = query.filter(Doctor.languages.any(language))
+        query = _doctor_search_query(db, specialization, language, clinic_id)
 
         total = query.count()
         doctors = query.offset(skip).limit(limit).all()
@@ -281,7 +327,7 @@ async def search_availability(
 
 
 @router.get("/availability/search")
-async def search_availability_alias(
+def search_availability_alias(
     specialization: Optional[str] = None,
     language: Optional[str] = None,
     target_date: Optional[date] = Query(default=None, alias="date"),
@@ -292,7 +338,7 @@ async def search_availability_alias(
     api_key: str = Depends(verify_api_key)
 ):
     """Backward-compatible alias for availability search."""
-    return await search_availability(
+    return search_availability(
         specialization=specialization,
         language=language,
         target_date=target_date,
@@ -304,8 +350,152 @@ async def search_availability_alias(
     )
 
 
+@router.get("/availability-earliest", response_model=EarliestAvailabilityResponse)
+async def search_earliest_availability(
+    specialization: Optional[str] = None,
+    language: Optional[str] = None,
+    clinic_id: Optional[UUID] = None,
+    horizon_days: int = 14,
+    limit: int = 5,
+    db: AsyncSession = Depends(get_async_db),
+    api_key: str = Depends(verify_api_key)
+):
+    """
+    Find the earliest open slots across all doctors matching the filters.
+    Answers "who can see me soonest" without the caller guessing dates.
+    """
+    return await db.run_sync(
+        _search_earliest_availability, specialization, language, clinic_id, horizon_days, limit
+    )
+
+
+def _search_earliest_availability(
+    db: Session,
+    specialization: Optional[str],
+    language: Optional[str],
+    clinic_id: Optional[UUID],
+    horizon_days: int,
+    limit: int
+) -> EarliestAvailabilityResponse:
+    try:
+        if horizon_days < 1 or horizon_days > settings.MAX_AVAILABILITY_DAYS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"horizon_days must be between 1 and {settings.MAX_AVAILABILITY_DAYS}"
+            )
+        if limit < 1 or limit > settings.MAX_AVAILABILITY_RESULTS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"limit must be between 1 and {settings.MAX_AVAILABILITY_RESULTS}"
+            )
+
+        doctors = _doctor_search_query(db, specialization, language, clinic_id).all()
+
+        now = datetime.now(timezone.utc)
+        start_date = now.date() - timedelta(days=1)  # Doctors west of UTC may still be on "yesterday"
+        end_date = now.date() + timedelta(days=horizon_days - 1)
+        slots = availability_service.find_earliest_slots(
+            db=db,
+            doctors=doctors,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit,
+            now=now
+        )
+
+        return EarliestAvailabilityResponse(
+            slots=slots,
+            search_criteria={
+                "specialization": specialization,
+                "language": language,
+                "clinic_id": str(clinic_id) if clinic_id else None,
+                "horizon_days": horizon_days,
+                "limit": limit
+            }
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error searching earliest availability: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to search earliest availability: {str(e)}"
+        )
+
+
+@router.get("/availability-range", response_model=AvailabilityRangeResponse)
+async def get_availability_range(
+    start_date: date,
+    end_date: date,
+    doctor_emails: List[str] = Query(..., alias="doctor_email"),
+    db: AsyncSession = Depends(get_async_db),
+    api_key: str = Depends(verify_api_key)
+):
+    """
+    Get available slots for one or more doctors across a date range.
+    Pass doctor_email once per doctor; the range may span up to MAX_AVAILABILITY_DAYS.
+    """
+    return await db.run_sync(_get_availability_range, start_date, end_date, doctor_emails)
+
+
+def _get_availability_range(
+    db: Session,
+    start_date: date,
+    end_date: date,
+    doctor_emails: List[str]
+) -> AvailabilityRangeResponse:
+    try:
+        today = datetime.now(timezone.utc).date()
+        max_date = today + timedelta(days=settings.MAX_AVAILABILITY_DAYS)
+        if start_date > end_date:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="start_date must be on or before end_date"
+            )
+        if start_date < today or end_date > max_date:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"dates must be between today and {max_date.isoformat()}"
+            )
+        if (end_date - start_date).days + 1 > settings.MAX_AVAILABILITY_DAYS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"date range must be at most {settings.MAX_AVAILABILITY_DAYS} days"
+            )
+        if len(doctor_emails) > settings.MAX_AVAILABILITY_RESULTS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"at most {settings.MAX_AVAILABILITY_RESULTS} doctors per request"
+            )
+
+        doctors = availability_service.get_available_slots_for_range(
+            db=db,
+            doctor_emails=doctor_emails,
+            start_date=start_date,
+            end_date=end_date
+        )
+        return AvailabilityRangeResponse(
+            start_date=start_date,
+            end_date=end_date,
+            doctors=doctors
+        )
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Error getting availability range: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get availability range: {str(e)}"
+        )
+
+
 @router.get("/{appointment_id}", response_model=AppointmentResponse)
-async def get_appointment(
+def get_appointment(
     appointment_id: UUID,
     db: Session = Depends(get_db),
     api_key: str = Depends(verify_api_key)
@@ -321,7 +511,7 @@ async def get_appointment(
 
 
 @router.get("/doctor/{doctor_email}", response_model=List[AppointmentResponse])
-async def get_doctor_appointments(
+def get_doctor_appointments(
     doctor_email: str,
     start_date: date = None,
     end_date: date = None,
@@ -356,7 +546,7 @@ async def get_doctor_appointments(
 
 
 @router.get("/patient/{patient_id}", response_model=List[AppointmentResponse])
-async def get_patient_appointments(
+def get_patient_appointments(
     patient_id: UUID,
     skip: int = 0,
     limit: int = 100,
@@ -382,7 +572,7 @@ async def get_patient_appointments(
 
 
 @router.put("/{appointment_id}/reschedule", response_model=AppointmentResponse)
-async def reschedule_appointment(
+def reschedule_appointment(
     appointment_id: UUID,
     reschedule_data: AppointmentReschedule,
     db: Session = Depends(get_db),
@@ -467,7 +657,7 @@ async def reschedule_appointment(
 
 
 @router.delete("/{appointment_id}", response_model=AppointmentResponse)
-async def cancel_appointment(
+def cancel_appointment(
     appointment_id: UUID,
     db: Session = Depends(get_db),
     api_key: str = Depends(verify_api_key),
@@ -553,7 +743,7 @@ async def cancel_appointment(
 @router.get("/doctors/export")
 async def export_doctors_data(
     clinic_id: Optional[UUID] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     api_key: str = Depends(verify_api_key)
 ):
     """
@@ -572,12 +762,12 @@ async def export_doctors_data(
         ):
             return _doctor_export_cache["data"]
 
-        query = db.query(Doctor).filter(Doctor.is_active == True)
+        query = select(Doctor).where(Doctor.is_active == True)
 
         if clinic_id:
-            query = query.filter(Doctor.clinic_id == clinic_id)
+            query = query.where(Doctor.clinic_id == clinic_id)
 
-        doctors = query.all()
+        doctors = (await db.execute(query)).scalars().all()
 
         # Convert to chatbot-friendly format
         doctors_data = []
@@ -618,7 +808,7 @@ async def export_doctors_data(
 
 
 @router.post("/webhook/appointment-changed")
-async def appointment_change_webhook(
+def appointment_change_webhook(
     appointment_data: dict,
     db: Session = Depends(get_db),
     api_key: str = Depends(verify_api_key)
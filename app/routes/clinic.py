@@ -20,7 +20,7 @@ router = APIRouter()
 
 
 @router.post("/", response_model=ClinicResponse, status_code=status.HTTP_201_CREATED)
-async def create_clinic(
+def create_clinic(
     clinic_data: ClinicCreate,
     db: Session = Depends(get_db),
     api_key: str = Depends(verify_api_key),
@@ -43,7 +43,7 @@ async def create_clinic(
 
 
 @router.get("/", response_model=ClinicListResponse)
-async def list_clinics(
+def list_clinics(
     is_active: bool | None = None,
     skip: int = 0,
     limit: int = 100,
@@ -76,7 +76,7 @@ async def list_clinics(
 
 
 @router.get("/{clinic_id}", response_model=ClinicResponse)
-async def get_clinic(
+def get_clinic(
     clinic_id: UUID,
     db: Session = Depends(get_db),
     api_key: str = Depends(verify_api_key),
@@ -91,7 +91,7 @@ async def get_clinic(
 
 
 @router.put("/{clinic_id}", response_model=ClinicResponse)
-async def update_clinic(
+def update_clinic(
     clinic_id: UUID,
     clinic_data: ClinicUpdate,
     db: Session = Depends(get_db),
@@ -121,7 +121,7 @@ async def update_clinic(
 
 
 @router.delete("/{clinic_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_clinic(
+def delete_clinic(
     clinic_id: UUID,
     force: bool = False,
     db: Session = Depends(get_db),
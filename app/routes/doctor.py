@@ -17,6 +17,9 @@ from app.schemas.doctor import (
 )
 from app.services.rag_sync_service import RAGSyncService
 from app.services.calendar_watch_service import calendar_watch_service
+from app.services.availability_cache import availability_cache
+from app.services.availability_materializer import availability_materializer
+from app.services.schedule_template_cache import schedule_template_cache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -26,7 +29,7 @@ rag_sync_service = RAGSyncService()
 
 
 @router.post("/", response_model=DoctorResponse, status_code=status.HTTP_201_CREATED)
-async def create_doctor(
+def create_doctor(
     doctor_data: DoctorCreate,
     db: Session = Depends(get_db),
     api_key: str = Depends(verify_api_key)
@@ -82,7 +85,7 @@ async def create_doctor(
 
 
 @router.get("/{doctor_email}", response_model=DoctorResponse)
-async def get_doctor(
+def get_doctor(
     doctor_email: str,
     db: Session = Depends(get_db),
     api_key: str = Depends(verify_api_key)
@@ -98,7 +101,7 @@ async def get_doctor(
 
 
 @router.get("/", response_model=DoctorListResponse)
-async def list_doctors(
+def list_doctors(
     clinic_id: UUID = None,
     is_active: bool = None,
     skip: int = 0,
@@ -132,7 +135,7 @@ async def list_doctors(
 
 
 @router.put("/{doctor_email}", response_model=DoctorResponse)
-async def update_doctor(
+def update_doctor(
     doctor_email: str,
     doctor_data: DoctorUpdate,
     db: Session = Depends(get_db),
@@ -158,6 +161,8 @@ async def update_doctor(
         
         db.commit()
         db.refresh(doctor)
+        schedule_template_cache.invalidate(doctor_email)
+        availability_cache.invalidate_doctor(doctor_email)
         
         # Trigger RAG sync after DB commit
         try:
@@ -177,7 +182,7 @@ async def update_doctor(
 
 
 @router.post("/{doctor_email}/leaves", status_code=status.HTTP_201_CREATED)
-async def add_doctor_leave(
+def add_doctor_leave(
     doctor_email: str,
     leave_date: str,  # ISO date string
     reason: str = None,
@@ -216,8 +221,10 @@ async def add_doctor_leave(
         )
         
         db.add(doctor_leave)
+        availability_materializer.refresh_day(db, doctor_email, date_obj)
         db.commit()
         db.refresh(doctor_leave)
+        availability_cache.invalidate(doctor_email, date_obj)
         
         return {"message": "Leave added successfully", "leave_id": str(doctor_leave.id)}
         
@@ -238,7 +245,7 @@ async def add_doctor_leave(
 
 
 @router.delete("/{doctor_email}/leaves/{leave_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_doctor_leave(
+def delete_doctor_leave(
     doctor_email: str,
     leave_id: UUID,
     db: Session = Depends(get_db),
@@ -257,13 +264,15 @@ async def delete_doctor_leave(
         )
     
     db.delete(doctor_leave)
+    availability_materializer.refresh_day(db, doctor_email, doctor_leave.date)
     db.commit()
+    availability_cache.invalidate(doctor_email, doctor_leave.date)
     
     return None
 
 
 @router.delete("/{doctor_email}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_doctor(
+def delete_doctor(
     doctor_email: str,
     db: Session = Depends(get_db),
     api_key: str = Depends(verify_api_key)
@@ -279,6 +288,8 @@ async def delete_doctor(
     try:
         db.delete(doctor)
         db.commit()
+        schedule_template_cache.invalidate(doctor_email)
+        availability_cache.invalidate_doctor(doctor_email)
         return None
     except Exception as e:
         db.rollback()
@@ -26,7 +26,7 @@ router = APIRouter()
 
 
 @router.post("/", response_model=PatientResponse, status_code=status.HTTP_201_CREATED)
-async def create_patient(
+def create_patient(
     patient_data: PatientCreate,
     db: Session = Depends(get_db),
     api_key: str = Depends(verify_api_key)
@@ -63,7 +63,7 @@ async def create_patient(
 
 
 @router.get("/{patient_id}", response_model=PatientResponse)
-async def get_patient(
+def get_patient(
     patient_id: UUID,
     db: Session = Depends(get_db),
     api_key: str = Depends(verify_api_key)
@@ -79,7 +79,7 @@ async def get_patient(
 
 
 @router.get("/mobile/{mobile_number}", response_model=PatientResponse)
-async def get_patient_by_mobile(
+def get_patient_by_mobile(
     mobile_number: str,
     db: Session = Depends(get_db),
     api_key: str = Depends(verify_api_key)
@@ -114,7 +114,7 @@ async def get_patient_by_mobile(
 
 
 @router.put("/{patient_id}", response_model=PatientResponse)
-async def update_patient(
+def update_patient(
     patient_id: UUID,
     patient_data: PatientUpdate,
     db: Session = Depends(get_db),
@@ -148,7 +148,7 @@ async def update_patient(
 
 
 @router.post("/{patient_id}/history", response_model=PatientHistoryResponse, status_code=status.HTTP_201_CREATED)
-async def add_patient_history(
+def add_patient_history(
     patient_id: UUID,
     history_data: PatientHistoryCreate,
     db: Session = Depends(get_db),
@@ -184,7 +184,7 @@ async def add_patient_history(
 
 
 @router.get("/{patient_id}/history", response_model=List[PatientHistoryResponse])
-async def get_patient_history(
+def get_patient_history(
     patient_id: UUID,
     db: Session = Depends(get_db),
     api_key: str = Depends(verify_api_key)
@@ -7,7 +7,7 @@ from typing import Optional
 import logging
 
 from app.database import get_db
-from app.services.calendar_sync_service import CalendarSyncService
+from app.services.calendar_sync_debouncer import calendar_sync_debouncer
 from app.services.calendar_watch_service import calendar_watch_service
 from app.config import settings
 import secrets
@@ -15,7 +15,6 @@ import secrets
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
-calendar_sync_service = CalendarSyncService()
 
 
 @router.post("/google-calendar")
@@ -35,11 +34,13 @@ async def handle_google_calendar_notification(
     
     Resource States:
     - sync: Initial notification when watch is established
-    - exists: Periodic confirmation that channel is valid
+    - exists: The calendar changed
     - not_exists: Channel expired or was cancelled
-    - (no state header): Actual calendar change event
     
-    This endpoint enables real-time synchronization from Google Calendar to Database.
+    The request is verified and acknowledged immediately; the Google Calendar
+    -> Database sync runs in the background, debounced per doctor, so bursts
+    of notifications cause one sync. Redelivered messages (same or older
+    X-Goog-Message-Number for the channel) are dropped.
     """
     logger.info(
         f"Received Google Calendar notification: "
@@ -49,8 +50,9 @@ async def handle_google_calendar_notification(
         f"msg_num={x_goog_message_number}"
     )
     
-    # 1. Verify webhook authenticity
-    if not verify_google_webhook(x_goog_channel_id, x_goog_channel_token, db):
+    # 1. Verify webhook authenticity (channel lookups are cached per process)
+    channel_info = calendar_watch_service.get_channel_info(x_goog_channel_id, db) if x_goog_channel_id else None
+    if not verify_google_webhook(x_goog_channel_id, x_goog_channel_token, channel_info):
         logger.warning(f"Invalid webhook token: {x_goog_channel_token}")
         raise HTTPException(status_code=401, detail="Invalid webhook token")
     
@@ -60,52 +62,36 @@ async def handle_google_calendar_notification(
         logger.info("Initial sync notification received")
         return {"status": "sync_acknowledged"}
     
-    elif x_goog_resource_state == "exists":
-        # Periodic check that channel still exists
-        logger.info("Channel existence check")
-        return {"status": "exists_acknowledged"}
-    
     elif x_goog_resource_state == "not_exists":
         # Channel expired or was cancelled
         logger.warning(f"Channel no longer exists: {x_goog_channel_id}")
         # TODO: Implement automatic renewal
         return {"status": "channel_expired"}
     
-    # 3. Process actual calendar changes
-    try:
-        # Get doctor email from channel_id (stored in DB)
-        channel_info = calendar_watch_service.get_channel_info(x_goog_channel_id, db)
-        
-        if not channel_info:
-            logger.error(f"Unknown channel ID: {x_goog_channel_id}")
-            raise HTTPException(status_code=404, detail="Channel not found")
-        
-        doctor_email = channel_info['doctor_email']
-        
-        # 4. Sync calendar changes to database
-        result = await calendar_sync_service.sync_calendar_to_db(
-            doctor_email=doctor_email,
-            db=db
-        )
-        
-        logger.info(f"Calendar sync completed for {doctor_email}: {result}")
-        return {
-            "status": "synced",
-            "doctor_email": doctor_email,
-            "stats": result
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error processing calendar notification: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to process notification: {str(e)}"
-        )
+    # 3. Schedule a sync for the calendar change
+    if calendar_sync_debouncer.is_duplicate(x_goog_channel_id, x_goog_message_number):
+        logger.info(f"Duplicate notification {x_goog_message_number} on channel {x_goog_channel_id}")
+        return {"status": "duplicate"}
+
+    # Doctor email comes from the channel looked up above
+    if not channel_info:
+        logger.error(f"Unknown channel ID: {x_goog_channel_id}")
+        raise HTTPException(status_code=404, detail="Channel not found")
+    
+    doctor_email = channel_info['doctor_email']
+    calendar_sync_debouncer.notify(doctor_email)
+    
+    return {
+        "status": "accepted",
+        "doctor_email": doctor_email
+    }
 
 
-def verify_google_webhook(channel_id: Optional[str], channel_token: Optional[str], db: Session) -> bool:
+def verify_google_webhook(
+    channel_id: Optional[str],
+    channel_token: Optional[str],
+    channel_info: Optional[dict]
+) -> bool:
     """
     Verify that webhook is from Google.
     Compares the token sent by Google with our stored secret.
@@ -113,7 +99,7 @@ def verify_google_webhook(channel_id: Optional[str], channel_token: Optional[str
     Args:
         channel_id: Channel ID from X-Goog-Channel-Id header
         channel_token: Token from X-Goog-Channel-Token header
-        db: Database session
+        channel_info: The channel's stored info (get_channel_info), if any
         
     Returns:
         True if token is valid, False otherwise
@@ -121,7 +107,6 @@ def verify_google_webhook(channel_id: Optional[str], channel_token: Optional[str
     if not channel_token or not channel_id:
         return False
 
-    channel_info = calendar_watch_service.get_channel_info(channel_id, db)
     if channel_info and channel_info.get("token"):
         return secrets.compare_digest(channel_token, channel_info["token"])
 
@@ -100,3 +100,41 @@ class AvailabilityResponse(BaseModel):
     date: date
     available_slots: list[AvailabilitySlot]
     total_slots: int
+
+
+class DayAvailability(BaseModel):
+    """Available slots for a single day within a range."""
+    date: date
+    available_slots: list[AvailabilitySlot]
+    total_slots: int
+
+
+class DoctorAvailabilityRange(BaseModel):
+    """Per-day availability for one doctor across a date range."""
+    doctor_id: str  # Doctor email
+    days: list[DayAvailability]
+
+
+class AvailabilityRangeResponse(BaseModel):
+    """Schema for multi-day, multi-doctor availability response."""
+    start_date: date
+    end_date: date
+    doctors: list[DoctorAvailabilityRange]
+
+
+class EarliestSlot(BaseModel):
+    """A single open slot returned by earliest-availability search."""
+    doctor_id: str  # Doctor email
+    doctor_name: str
+    specialization: str
+    date: date
+    start_time: time
+    end_time: time
+    start_at_utc: datetime
+    timezone: str
+
+
+class EarliestAvailabilityResponse(BaseModel):
+    """Schema for earliest-availability search response."""
+    slots: list[EarliestSlot]
+    search_criteria: dict
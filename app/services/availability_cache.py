@@ -0,0 +1,250 @@
+"""
+Availability Cache - shared Redis cache of AvailabilityResponse per doctor/date.
+
+All uvicorn workers share one cache so a hot doctor-day is computed once.
+Entries carry the generation counters they were computed under; invalidation
+bumps the counter (per doctor-day, or per doctor for schedule changes) so a
+response computed concurrently with a write is never served afterwards.
+Misses are recomputed single-flight behind a short Redis lock: the holder
+stores its result and other callers wait for it, up to the lock timeout. The
+client is synchronous and waiting blocks, so callers run in threadpool routes
+or worker threads; a call made on an event-loop thread bypasses the cache
+rather than stall the loop. If REDIS_URL is unset, the redis package is
+missing, or Redis errors, callers fall back to the database transparently.
+Errors raised by compute() itself propagate unchanged.
+"""
+import asyncio
+from datetime import date
+from typing import Callable, Dict, Iterable, Optional, Tuple
+import json
+import logging
+import secrets
+import threading
+import time
+
+from app.config import settings
+from app.schemas.appointment import AvailabilityResponse
+
+try:
+    import redis
+except ImportError:  # Optional dependency
+    redis = None
+
+# Failures of the cache itself; anything else comes from compute() and propagates
+_REDIS_ERRORS = (redis.RedisError, OSError) if redis is not None else (OSError,)
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "availability"
+_LOCK_POLL_SECONDS = 0.02
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class AvailabilityCache:
+    """Redis-backed AvailabilityResponse cache with generation-based invalidation."""
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = settings.REDIS_URL,
+        ttl_seconds: int = settings.AVAILABILITY_CACHE_TTL_SECONDS,
+        lock_timeout_ms: int = settings.AVAILABILITY_CACHE_LOCK_TIMEOUT_MS,
+        retry_after_seconds: int = 30
+    ):
+        self._redis_url = redis_url
+        self._ttl = ttl_seconds
+        self._lock_timeout_ms = lock_timeout_ms
+        self._retry_after = retry_after_seconds
+        self._client = None
+        self._next_connect_at = 0.0
+        self._connect_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "errors": 0, "invalidations": 0, "lock_waits": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(settings.AVAILABILITY_CACHE_ENABLED and self._redis_url and redis is not None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def status(self) -> str:
+        if not self.enabled:
+            return "disabled"
+        return "healthy" if self._get_client() else "unavailable"
+
+    def get_or_compute(
+        self,
+        doctor_email: str,
+        target_date: date,
+        compute: Callable[[], AvailabilityResponse]
+    ) -> AvailabilityResponse:
+        """
+        Return the cached response for a doctor-day, computing it on a miss.
+
+        Only one caller across all processes recomputes a missing entry; others
+        wait up to the lock timeout for it to appear, then compute themselves.
+        """
+        if _on_event_loop():
+            return compute()
+        client = self._get_client()
+        if client is None:
+            return compute()
+
+        value_key, day_gen_key, doctor_gen_key, lock_key = self._keys(doctor_email, target_date)
+        token = None
+        try:
+            cached, generation = self._read(client, value_key, day_gen_key, doctor_gen_key)
+            if cached is not None:
+                self._count("hits")
+                return cached
+            self._count("misses")
+
+            token = secrets.token_hex(8)
+            if not client.set(lock_key, token, nx=True, px=self._lock_timeout_ms):
+                token = None
+                self._count("lock_waits")
+                cached = self._wait_for_holder(client, value_key, day_gen_key, doctor_gen_key, lock_key)
+                if cached is not None:
+                    return cached
+        except _REDIS_ERRORS as e:
+            self._on_error(e)
+            return compute()
+
+        try:
+            response = compute()
+            if token is not None:
+                self._store(client, value_key, generation, response)
+            return response
+        finally:
+            if token is not None:
+                self._release_lock(client, lock_key, token)
+
+    def invalidate(self, doctor_email: str, target_date: date) -> None:
+        """Invalidate one doctor-day. Call after the writing transaction commits."""
+        self.invalidate_days([(doctor_email, target_date)])
+
+    def invalidate_days(self, keys: Iterable[Tuple[str, date]]) -> None:
+        """Invalidate several doctor-days. Call after the writing transaction commits."""
+        keys = set(keys)
+        client = self._get_client()
+        if client is None or not keys:
+            return
+        try:
+            pipe = client.pipeline(transaction=False)
+            for doctor_email, target_date in keys:
+                value_key, day_gen_key, _, _ = self._keys(doctor_email, target_date)
+                pipe.incr(day_gen_key)
+                pipe.expire(day_gen_key, self._ttl * 2)
+                pipe.delete(value_key)
+            pipe.execute()
+            self._count("invalidations", len(keys))
+        except _REDIS_ERRORS as e:
+            self._on_error(e)
+
+    def invalidate_doctor(self, doctor_email: str) -> None:
+        """Invalidate every cached day for a doctor (schedule or profile change)."""
+        client = self._get_client()
+        if client is None:
+            return
+        try:
+            client.incr(f"{_KEY_PREFIX}:gen:{doctor_email}")
+            self._count("invalidations")
+        except _REDIS_ERRORS as e:
+            self._on_error(e)
+
+    def _wait_for_holder(self, client, value_key: str, day_gen_key: str, doctor_gen_key: str, lock_key: str):
+        """Poll for the lock holder's result; None once it gives up or the lock times out."""
+        deadline = time.monotonic() + self._lock_timeout_ms / 1000
+        while time.monotonic() < deadline:
+            time.sleep(_LOCK_POLL_SECONDS)
+            locked = client.exists(lock_key)  # Before the read: the holder stores, then releases
+            cached, _ = self._read(client, value_key, day_gen_key, doctor_gen_key)
+            if cached is not None:
+                return cached
+            if not locked:
+                return None  # Holder failed or its result was already invalidated
+        return None
+
+    def _store(self, client, value_key: str, generation: str, response: AvailabilityResponse) -> None:
+        try:
+            client.set(
+                value_key,
+                json.dumps({"gen": generation, "data": response.model_dump(mode="json")}),
+                ex=self._ttl
+            )
+        except _REDIS_ERRORS as e:
+            self._on_error(e)
+
+    def _release_lock(self, client, lock_key: str, token: str) -> None:
+        try:
+            client.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+        except _REDIS_ERRORS as e:
+            self._on_error(e)
+
+    def _read(self, client, value_key: str, day_gen_key: str, doctor_gen_key: str):
+        raw, day_gen, doctor_gen = client.mget(value_key, day_gen_key, doctor_gen_key)
+        generation = f"{doctor_gen or 0}:{day_gen or 0}"
+        if raw:
+            payload = json.loads(raw)
+            if payload.get("gen") == generation:
+                return AvailabilityResponse.model_validate(payload["data"]), generation
+        return None, generation
+
+    def _keys(self, doctor_email: str, target_date: date) -> Tuple[str, str, str, str]:
+        day = target_date.isoformat()
+        return (
+            f"{_KEY_PREFIX}:{doctor_email}:{day}",
+            f"{_KEY_PREFIX}:gen:{doctor_email}:{day}",
+            f"{_KEY_PREFIX}:gen:{doctor_email}",
+            f"{_KEY_PREFIX}:lock:{doctor_email}:{day}",
+        )
+
+    def _get_client(self):
+        if not self.enabled:
+            return None
+        if self._client is not None:
+            return self._client
+        if time.monotonic() < self._next_connect_at:
+            return None
+        with self._connect_lock:
+            if self._client is None and time.monotonic() >= self._next_connect_at:
+                try:
+                    client = redis.Redis.from_url(
+                        self._redis_url,
+                        decode_responses=True,
+                        socket_timeout=0.5,
+                        socket_connect_timeout=0.5
+                    )
+                    client.ping()
+                    self._client = client
+                except Exception as e:
+                    logger.warning(f"Redis unavailable, availability cache disabled: {e}")
+                    self._next_connect_at = time.monotonic() + self._retry_after
+        return self._client
+
+    def _on_error(self, error: Exception) -> None:
+        self._count("errors")
+        logger.warning(f"Availability cache error, falling back to database: {error}")
+        self._client = None
+        self._next_connect_at = time.monotonic() + self._retry_after
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self._stats[name] += amount
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+availability_cache = AvailabilityCache()
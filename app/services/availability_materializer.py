@@ -0,0 +1,199 @@
+"""
+Availability Materializer - maintains the doctor_day_availability table.
+
+When AVAILABILITY_MATERIALIZED_ENABLED is set, every write that changes a
+doctor-day (booking, reschedule, cancel, leave changes, calendar import) calls
+refresh_day inside its own transaction, and AvailabilityService reads one row
+per doctor-day instead of querying appointments and leaves.
+"""
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import logging
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.appointment import Appointment, AppointmentStatus
+from app.models.doctor import Doctor
+from app.models.doctor_day_availability import DoctorDayAvailability
+from app.models.doctor_leave import DoctorLeave
+from app.services import slot_engine
+
+logger = logging.getLogger(__name__)
+
+BITMAP_BYTES = (slot_engine.MINUTES_PER_DAY + 7) // 8
+
+
+def encode_bitmap(busy: int) -> bytes:
+    return busy.to_bytes(BITMAP_BYTES, "little") if busy else b""
+
+
+def decode_bitmap(raw: Optional[bytes]) -> int:
+    return int.from_bytes(raw, "little") if raw else 0
+
+
+class AvailabilityMaterializer:
+    """Keeps doctor_day_availability rows in step with appointments and leaves."""
+
+    @property
+    def enabled(self) -> bool:
+        return settings.AVAILABILITY_MATERIALIZED_ENABLED
+
+    def refresh_day(self, db: Session, doctor_email: str, day: date) -> None:
+        """Recompute one doctor-day row within the caller's transaction."""
+        self.refresh_days(db, [(doctor_email, day)])
+
+    def refresh_days(self, db: Session, keys: Iterable[Tuple[str, date]]) -> None:
+        """
+        Recompute doctor-day rows within the caller's transaction.
+
+        The row is upserted first so its lock is held before the source rows are
+        read; a concurrent writer for the same doctor-day waits on that lock and
+        then (READ COMMITTED) recomputes from the committed state, so updates
+        are never lost. Keys are processed in sorted order to avoid deadlocks.
+        """
+        if not self.enabled:
+            return
+        keys = sorted(set(keys))
+        if not keys:
+            return
+
+        db.flush()
+        now = datetime.now(timezone.utc)
+        for doctor_email, day in keys:
+            stmt = insert(DoctorDayAvailability).values(
+                doctor_email=doctor_email,
+                date=day,
+                busy_bitmap=b"",
+                on_leave=False,
+                version=1,
+                updated_at=now
+            )
+            db.execute(stmt.on_conflict_do_update(
+                index_elements=[DoctorDayAvailability.doctor_email, DoctorDayAvailability.date],
+                set_={
+                    "version": DoctorDayAvailability.version + 1,
+                    "updated_at": now
+                }
+            ))
+
+            booked_ranges = db.query(Appointment.start_time, Appointment.end_time).filter(
+                Appointment.doctor_email == doctor_email,
+                Appointment.date == day,
+                Appointment.status.in_([AppointmentStatus.BOOKED, AppointmentStatus.RESCHEDULED])
+            ).all()
+            on_leave = db.query(DoctorLeave.id).filter(
+                DoctorLeave.doctor_email == doctor_email,
+                DoctorLeave.date == day
+            ).first() is not None
+
+            db.query(DoctorDayAvailability).filter(
+                DoctorDayAvailability.doctor_email == doctor_email,
+                DoctorDayAvailability.date == day
+            ).update(
+                {
+                    DoctorDayAvailability.busy_bitmap: encode_bitmap(slot_engine.busy_mask(booked_ranges)),
+                    DoctorDayAvailability.on_leave: on_leave
+                },
+                synchronize_session=False
+            )
+
+    def load_day(self, db: Session, doctor_email: str, day: date) -> Tuple[bool, int]:
+        """Return (on_leave, busy_bitmap) for a doctor-day with one indexed lookup."""
+        row = db.query(DoctorDayAvailability.on_leave, DoctorDayAvailability.busy_bitmap).filter(
+            DoctorDayAvailability.doctor_email == doctor_email,
+            DoctorDayAvailability.date == day
+        ).first()
+        if not row:
+            return False, 0
+        return row.on_leave, decode_bitmap(row.busy_bitmap)
+
+    def load_window(
+        self,
+        db: Session,
+        doctor_emails: List[str],
+        start_date: date,
+        end_date: date
+    ) -> Tuple[Set[Tuple[str, date]], Dict[Tuple[str, date], int]]:
+        """Return leave days and busy bitmaps for doctors over a date window (one query)."""
+        rows = db.query(
+            DoctorDayAvailability.doctor_email,
+            DoctorDayAvailability.date,
+            DoctorDayAvailability.on_leave,
+            DoctorDayAvailability.busy_bitmap
+        ).filter(
+            DoctorDayAvailability.doctor_email.in_(doctor_emails),
+            DoctorDayAvailability.date >= start_date,
+            DoctorDayAvailability.date <= end_date
+        ).all()
+
+        leave_days: Set[Tuple[str, date]] = set()
+        busy_by_doctor_day: Dict[Tuple[str, date], int] = {}
+        for doctor_email, day, on_leave, busy_bitmap in rows:
+            if on_leave:
+                leave_days.add((doctor_email, day))
+            busy = decode_bitmap(busy_bitmap)
+            if busy:
+                busy_by_doctor_day[(doctor_email, day)] = busy
+        return leave_days, busy_by_doctor_day
+
+    def rebuild(
+        self,
+        db: Session,
+        start_date: date,
+        end_date: date,
+        doctor_emails: Optional[List[str]] = None
+    ) -> int:
+        """
+        Regenerate rows from appointments and doctor_leaves for a date range.
+        Existing rows in the range are replaced. Commits per doctor.
+
+        Returns:
+            Number of rows written
+        """
+        if doctor_emails is None:
+            doctor_emails = [row[0] for row in db.query(Doctor.email).order_by(Doctor.email).all()]
+
+        written = 0
+        for doctor_email in doctor_emails:
+            db.query(DoctorDayAvailability).filter(
+                DoctorDayAvailability.doctor_email == doctor_email,
+                DoctorDayAvailability.date >= start_date,
+                DoctorDayAvailability.date <= end_date
+            ).delete(synchronize_session=False)
+
+            booked = db.query(Appointment.date, Appointment.start_time, Appointment.end_time).filter(
+                Appointment.doctor_email == doctor_email,
+                Appointment.date >= start_date,
+                Appointment.date <= end_date,
+                Appointment.status.in_([AppointmentStatus.BOOKED, AppointmentStatus.RESCHEDULED])
+            ).all()
+            leave_days = {
+                row[0] for row in db.query(DoctorLeave.date).filter(
+                    DoctorLeave.doctor_email == doctor_email,
+                    DoctorLeave.date >= start_date,
+                    DoctorLeave.date <= end_date
+                ).all()
+            }
+
+            ranges_by_day: Dict[date, list] = {}
+            for apt_date, apt_start, apt_end in booked:
+                ranges_by_day.setdefault(apt_date, []).append((apt_start, apt_end))
+
+            for day in sorted(set(ranges_by_day) | leave_days):
+                db.add(DoctorDayAvailability(
+                    doctor_email=doctor_email,
+                    date=day,
+                    busy_bitmap=encode_bitmap(slot_engine.busy_mask(ranges_by_day.get(day, []))),
+                    on_leave=day in leave_days,
+                    version=1
+                ))
+                written += 1
+            db.commit()
+            logger.info(f"Rebuilt availability for {doctor_email}: {len(set(ranges_by_day) | leave_days)} day(s)")
+
+        return written
+
+
+availability_materializer = AvailabilityMaterializer()
@@ -2,18 +2,88 @@
 Availability Service - calculates available slots from database.
 Database is the single source of truth for availability.
 """
-from datetime import date, time, datetime, timedelta
-from typing import List, Optional, Dict
+import heapq
+from datetime import date, time, datetime, timedelta, timezone
+from itertools import islice
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
 from uuid import UUID
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import Time, exists, literal, literal_column
+from app.config import settings
 from app.models.doctor import Doctor
 from app.models.appointment import Appointment, AppointmentStatus
 from app.models.doctor_leave import DoctorLeave
-from app.schemas.appointment import AvailabilitySlot, AvailabilityResponse
+from app.schemas.appointment import (
+    AvailabilitySlot,
+    AvailabilityResponse,
+    DayAvailability,
+    DoctorAvailabilityRange,
+    EarliestSlot,
+)
+from app.services import slot_engine
+from app.services.availability_cache import availability_cache
+from app.services.availability_materializer import availability_materializer
+from app.services.schedule_template_cache import ScheduleTemplate, schedule_template_cache
+from app.utils.datetime_utils import to_local, to_utc
 from collections import defaultdict
 
 
+class SlotCheck(NamedTuple):
+    """Result of AvailabilityService.check_slot."""
+    doctor: Optional[Doctor]
+    available: bool
+
+
+class SlotConflictIndex:
+    """
+    In-memory slot checks for one doctor over a set of dates.
+
+    Answers the same question as AvailabilityService.check_slot from data
+    loaded once by AvailabilityService.load_conflict_index. Slots claimed
+    through claim() count as busy for later checks; appointments moved or
+    cancelled by the caller keep their original interval, matching what the
+    database still holds until the caller's changes are flushed.
+    """
+
+    def __init__(
+        self,
+        doctor: Doctor,
+        template: ScheduleTemplate,
+        leave_dates: Set[date],
+        intervals: Dict[date, List[Tuple[time, time, Optional[UUID]]]]
+    ):
+        self.doctor = doctor
+        self._template = template
+        self._leave_dates = leave_dates
+        self._intervals = intervals
+
+    def is_slot_available(
+        self,
+        slot_date: date,
+        slot_start_time: time,
+        slot_end_time: time,
+        exclude_appointment_id: Optional[UUID] = None
+    ) -> bool:
+        if not self.doctor.is_active or slot_date in self._leave_dates:
+            return False
+        for start, end, appointment_id in self._intervals.get(slot_date, ()):
+            if start < slot_end_time and end > slot_start_time and (
+                exclude_appointment_id is None or appointment_id != exclude_appointment_id
+            ):
+                return False
+        return AvailabilityService._fits_template(self._template, slot_date, slot_start_time, slot_end_time)
+
+    def claim(
+        self,
+        slot_date: date,
+        slot_start_time: time,
+        slot_end_time: time,
+        appointment_id: Optional[UUID] = None
+    ) -> None:
+        """Mark a slot busy for the remaining checks."""
+        self._intervals.setdefault(slot_date, []).append((slot_start_time, slot_end_time, appointment_id))
+
+
 class AvailabilityService:
     """Service for calculating doctor availability."""
     
@@ -44,6 +114,20 @@ class AvailabilityService:
         Raises:
             ValueError: If doctor not found or inactive
         """
+        # Served from the shared Redis cache when configured; writers invalidate after commit
+        return availability_cache.get_or_compute(
+            doctor_email,
+            target_date,
+            lambda: AvailabilityService._compute_available_slots(db, doctor_email, target_date)
+        )
+
+    @staticmethod
+    def _compute_available_slots(
+        db: Session,
+        doctor_email: str,
+        target_date: date
+    ) -> AvailabilityResponse:
+        """Compute get_available_slots from the database, bypassing the cache."""
         # Get doctor from DB
         doctor = db.query(Doctor).filter(
             Doctor.email == doctor_email,
@@ -54,8 +138,8 @@ class AvailabilityService:
             raise ValueError(f"Doctor with email '{doctor_email}' not found or inactive")
 
         # Check if doctor works on this day
-        day_name = target_date.strftime("%A").lower()
-        if day_name not in [day.lower() for day in doctor.working_days]:
+        template = schedule_template_cache.get(doctor)
+        if not template.works_on(target_date):
             return AvailabilityResponse(
                 doctor_id=doctor_email,  # Changed to email
                 date=target_date,
@@ -63,55 +147,36 @@ class AvailabilityService:
                 total_slots=0
             )
 
-        # Check if doctor is on leave
-        leave = db.query(DoctorLeave).filter(
-            DoctorLeave.doctor_email == doctor_email,  # Changed to email
-            DoctorLeave.date == target_date
-        ).first()
+        if availability_materializer.enabled:
+            # Leave flag and booked minutes come from one materialized row
+            on_leave, busy = availability_materializer.load_day(db, doctor_email, target_date)
+        else:
+            # Check if doctor is on leave
+            leave = db.query(DoctorLeave).filter(
+                DoctorLeave.doctor_email == doctor_email,  # Changed to email
+                DoctorLeave.date == target_date
+            ).first()
+            on_leave = leave is not None
+            busy = 0
+            if not on_leave:
+                # Get booked appointments for this date
+                booked_ranges = db.query(Appointment.start_time, Appointment.end_time).filter(
+                    Appointment.doctor_email == doctor_email,  # Changed to email
+                    Appointment.date == target_date,
+                    Appointment.status.in_([AppointmentStatus.BOOKED, AppointmentStatus.RESCHEDULED])
+                ).all()
+                busy = slot_engine.busy_mask(booked_ranges)
 
-        if leave:
+        if on_leave:
             return AvailabilityResponse(
                 doctor_id=doctor_email,  # Changed to email
                 date=target_date,
                 available_slots=[],
                 total_slots=0
             )
-        
-        # Get working hours
-        working_start = datetime.strptime(doctor.working_hours["start"], "%H:%M").time()
-        working_end = datetime.strptime(doctor.working_hours["end"], "%H:%M").time()
-        
-        # Generate all possible slots
-        all_slots = AvailabilityService._generate_slots(
-            working_start,
-            working_end,
-            doctor.slot_duration_minutes
-        )
-        
-        # Get booked appointments for this date
-        booked_appointments = db.query(Appointment).filter(
-            Appointment.doctor_email == doctor_email,  # Changed to email
-            Appointment.date == target_date,
-            Appointment.status.in_([AppointmentStatus.BOOKED, AppointmentStatus.RESCHEDULED])
-        ).all()
-        
-        # Create set of booked time ranges for quick lookup
-        booked_ranges = set()
-        for apt in booked_appointments:
-            booked_ranges.add((apt.start_time, apt.end_time))
-        
-        # Filter out booked slots
-        available_slots = []
-        for slot in all_slots:
-            is_booked = False
-            for booked_start, booked_end in booked_ranges:
-                # Check if slot overlaps with booked appointment
-                if not (slot.end_time <= booked_start or slot.start_time >= booked_end):
-                    is_booked = True
-                    break
-            
-            if not is_booked:
-                available_slots.append(slot)
+
+        # Mask booked minutes out of the precompiled slot grid
+        available_slots = AvailabilityService._template_slots(template, busy)
         
         return AvailabilityResponse(
             doctor_id=doctor_email,  # Changed to email
@@ -135,29 +200,17 @@ class AvailabilityService:
 
         doctor_emails = [doctor.email for doctor in doctors]
 
-        booked_appointments = db.query(Appointment).filter(
-            Appointment.doctor_email.in_(doctor_emails),
-            Appointment.date == target_date,
-            Appointment.status.in_([AppointmentStatus.BOOKED, AppointmentStatus.RESCHEDULED])
-        ).all()
-
-        booked_by_doctor = defaultdict(list)
-        for apt in booked_appointments:
-            booked_by_doctor[apt.doctor_email].append((apt.start_time, apt.end_time))
-
-        leaves = db.query(DoctorLeave).filter(
-            DoctorLeave.doctor_email.in_(doctor_emails),
-            DoctorLeave.date == target_date
-        ).all()
-        leave_set = {leave.doctor_email for leave in leaves}
+        leave_days, busy_by_doctor_day = AvailabilityService._load_window(
+            db, doctor_emails, target_date, target_date
+        )
 
         results: Dict[str, AvailabilityResponse] = {}
         for doctor in doctors:
             if not doctor.is_active:
                 continue
 
-            day_name = target_date.strftime("%A").lower()
-            if day_name not in [day.lower() for day in doctor.working_days]:
+            template = schedule_template_cache.get(doctor)
+            if not template.works_on(target_date):
                 results[doctor.email] = AvailabilityResponse(
                     doctor_id=doctor.email,
                     date=target_date,
@@ -166,7 +219,7 @@ class AvailabilityService:
                 )
                 continue
 
-            if doctor.email in leave_set:
+            if (doctor.email, target_date) in leave_days:
                 results[doctor.email] = AvailabilityResponse(
                     doctor_id=doctor.email,
                     date=target_date,
@@ -175,26 +228,11 @@ class AvailabilityService:
                 )
                 continue
 
-            working_start = datetime.strptime(doctor.working_hours["start"], "%H:%M").time()
-            working_end = datetime.strptime(doctor.working_hours["end"], "%H:%M").time()
-
-            all_slots = AvailabilityService._generate_slots(
-                working_start,
-                working_end,
-                doctor.slot_duration_minutes
+            available_slots = AvailabilityService._template_slots(
+                template,
+                busy_by_doctor_day.get((doctor.email, target_date), 0)
             )
 
-            booked_ranges = booked_by_doctor.get(doctor.email, [])
-            available_slots = []
-            for slot in all_slots:
-                is_booked = False
-                for booked_start, booked_end in booked_ranges:
-                    if not (slot.end_time <= booked_start or slot.start_time >= booked_end):
-                        is_booked = True
-                        break
-                if not is_booked:
-                    available_slots.append(slot)
-
             results[doctor.email] = AvailabilityResponse(
                 doctor_id=doctor.email,
                 date=target_date,
@@ -204,6 +242,198 @@ class AvailabilityService:
 
         return results
     
+    @staticmethod
+    def get_available_slots_for_range(
+        db: Session,
+        doctor_emails: List[str],
+        start_date: date,
+        end_date: date
+    ) -> List[DoctorAvailabilityRange]:
+        """
+        Calculate available slots for several doctors across a date range.
+
+        Loads doctors, leaves and booked appointments for the whole window with
+        one query each, then computes every doctor-day in a single pass.
+
+        Args:
+            db: Database session
+            doctor_emails: Emails of the doctors (unique identifiers)
+            start_date: First date of the range (inclusive)
+            end_date: Last date of the range (inclusive)
+
+        Returns:
+            List of DoctorAvailabilityRange in the order of doctor_emails
+
+        Raises:
+            ValueError: If any doctor is not found or inactive
+        """
+        doctor_emails = list(dict.fromkeys(doctor_emails))
+        doctors = db.query(Doctor).filter(
+            Doctor.email.in_(doctor_emails),
+            Doctor.is_active == True
+        ).all()
+        doctors_by_email = {doctor.email: doctor for doctor in doctors}
+        missing = [email for email in doctor_emails if email not in doctors_by_email]
+        if missing:
+            raise ValueError(f"Doctor(s) not found or inactive: {', '.join(missing)}")
+
+        leave_days, busy_by_doctor_day = AvailabilityService._load_window(
+            db, doctor_emails, start_date, end_date
+        )
+
+        day_count = (end_date - start_date).days + 1
+        dates = [start_date + timedelta(days=offset) for offset in range(day_count)]
+
+        results: List[DoctorAvailabilityRange] = []
+        for email in doctor_emails:
+            doctor = doctors_by_email[email]
+            template = schedule_template_cache.get(doctor)
+
+            days: List[DayAvailability] = []
+            for day in dates:
+                available_slots: List[AvailabilitySlot] = []
+                if template.works_on(day) and (email, day) not in leave_days:
+                    available_slots = AvailabilityService._template_slots(
+                        template,
+                        busy_by_doctor_day.get((email, day), 0)
+                    )
+                days.append(DayAvailability(
+                    date=day,
+                    available_slots=available_slots,
+                    total_slots=len(available_slots)
+                ))
+
+            results.append(DoctorAvailabilityRange(doctor_id=email, days=days))
+
+        return results
+
+    @staticmethod
+    def find_earliest_slots(
+        db: Session,
+        doctors: List[Doctor],
+        start_date: date,
+        end_date: date,
+        limit: int,
+        now: Optional[datetime] = None
+    ) -> List[EarliestSlot]:
+        """
+        Find the earliest open slots across several doctors.
+
+        Each doctor contributes a lazy iterator over its free slots in time
+        order; the iterators are k-way merged on UTC start time and consumption
+        stops as soon as `limit` slots have been produced, so later days are
+        never materialized. Slots that already started (in the doctor's
+        timezone) are skipped.
+
+        Args:
+            db: Database session
+            doctors: Candidate doctors (already filtered)
+            start_date: First date to search (inclusive)
+            end_date: Last date to search (inclusive)
+            limit: Maximum number of slots to return
+            now: Current UTC time (defaults to datetime.now(timezone.utc))
+
+        Returns:
+            List of EarliestSlot ordered by start time
+        """
+        doctors = [doctor for doctor in doctors if doctor.is_active]
+        if not doctors or limit <= 0 or start_date > end_date:
+            return []
+
+        now = now or datetime.now(timezone.utc)
+        leave_days, busy_by_doctor_day = AvailabilityService._load_window(
+            db, [doctor.email for doctor in doctors], start_date, end_date
+        )
+
+        def iter_doctor_slots(doctor: Doctor) -> Iterator[Tuple[datetime, str, date, int]]:
+            tz_name = doctor.timezone or settings.DEFAULT_TIMEZONE
+            local_now = to_local(now, tz_name)
+            template = schedule_template_cache.get(doctor)
+
+            day = max(start_date, local_now.date())
+            while day <= end_date:
+                if template.works_on(day) and (doctor.email, day) not in leave_days:
+                    busy = busy_by_doctor_day.get((doctor.email, day), 0)
+                    if day == local_now.date():
+                        busy |= slot_engine.range_mask(0, slot_engine.minute_of_day(local_now.time()) + 1)
+                    for start in slot_engine.free_slot_starts(template.grid, template.slot_duration_minutes, busy):
+                        start_at_utc = to_utc(day, slot_engine.minute_to_time(start), tz_name)
+                        yield start_at_utc, doctor.email, day, start
+                day += timedelta(days=1)
+
+        doctors_by_email = {doctor.email: doctor for doctor in doctors}
+        merged = heapq.merge(*(iter_doctor_slots(doctor) for doctor in doctors))
+
+        results: List[EarliestSlot] = []
+        for start_at_utc, email, day, start in islice(merged, limit):
+            doctor = doctors_by_email[email]
+            results.append(EarliestSlot(
+                doctor_id=email,
+                doctor_name=doctor.name,
+                specialization=doctor.specialization,
+                date=day,
+                start_time=slot_engine.minute_to_time(start),
+                end_time=slot_engine.minute_to_time(start + doctor.slot_duration_minutes),
+                start_at_utc=start_at_utc,
+                timezone=doctor.timezone or settings.DEFAULT_TIMEZONE
+            ))
+        return results
+
+    @staticmethod
+    def _template_slots(
+        template: ScheduleTemplate,
+        busy: int
+    ) -> List[AvailabilitySlot]:
+        """Mask a busy-minute bitmap out of a template's slot grid."""
+        duration = template.slot_duration_minutes
+        starts = slot_engine.free_slot_starts(template.grid, duration, busy)
+        return slot_engine.to_availability_slots(starts, duration)
+
+    @staticmethod
+    def _load_window(
+        db: Session,
+        doctor_emails: List[str],
+        start_date: date,
+        end_date: date
+    ) -> Tuple[Set[Tuple[str, date]], Dict[Tuple[str, date], int]]:
+        """
+        Load leave days and busy-minute bitmaps for doctors over a date window.
+        One query against doctor_day_availability when materialized, otherwise
+        one query each against doctor_leaves and appointments.
+        """
+        if availability_materializer.enabled:
+            return availability_materializer.load_window(db, doctor_emails, start_date, end_date)
+
+        leave_days = set(
+            db.query(DoctorLeave.doctor_email, DoctorLeave.date).filter(
+                DoctorLeave.doctor_email.in_(doctor_emails),
+                DoctorLeave.date >= start_date,
+                DoctorLeave.date <= end_date
+            ).all()
+        )
+
+        booked_appointments = db.query(
+            Appointment.doctor_email,
+            Appointment.date,
+            Appointment.start_time,
+            Appointment.end_time
+        ).filter(
+            Appointment.doctor_email.in_(doctor_emails),
+            Appointment.date >= start_date,
+            Appointment.date <= end_date,
+            Appointment.status.in_([AppointmentStatus.BOOKED, AppointmentStatus.RESCHEDULED])
+        ).all()
+
+        booked_by_doctor_day = defaultdict(list)
+        for apt_doctor_email, apt_date, apt_start, apt_end in booked_appointments:
+            booked_by_doctor_day[(apt_doctor_email, apt_date)].append((apt_start, apt_end))
+
+        busy_by_doctor_day = {
+            key: slot_engine.busy_mask(ranges)
+            for key, ranges in booked_by_doctor_day.items()
+        }
+        return leave_days, busy_by_doctor_day
+
     @staticmethod
     def _generate_slots(
         start_time: time,
@@ -221,105 +451,173 @@ class AvailabilityService:
         Returns:
             List of AvailabilitySlot objects
         """
-        slots = []
-        
-        # Convert times to datetime for easier calculation
-        start_datetime = datetime.combine(date.today(), start_time)
-        end_datetime = datetime.combine(date.today(), end_time)
-        
-        current = start_datetime
-        slot_duration = timedelta(minutes=slot_duration_minutes)
-        
-        while current + slot_duration <= end_datetime:
-            slot_start = current.time()
-            slot_end = (current + slot_duration).time()
-            
-            slots.append(AvailabilitySlot(
-                start_time=slot_start,
-                end_time=slot_end
-            ))
-            
-            current += slot_duration
-        
-        return slots
+        grid = slot_engine.build_slot_grid(
+            slot_engine.minute_of_day(start_time),
+            slot_engine.minute_of_day(end_time),
+            slot_duration_minutes
+        )
+        return slot_engine.to_availability_slots(grid, slot_duration_minutes)
     
     @staticmethod
-    def is_slot_available(
+    def check_slot(
         db: Session,
-        doctor_email: str,  # Changed to email
+        doctor_email: str,
         slot_date: date,
         slot_start_time: time,
-        slot_end_time: time,
+        slot_end_time: Optional[time] = None,
         exclude_appointment_id: Optional[UUID] = None
-    ) -> bool:
+    ) -> SlotCheck:
         """
-        Check if a specific slot is available.
-        Used for booking validation.
+        Load everything needed to validate a slot in a single SQL statement.
+
+        The doctor row is selected together with correlated EXISTS checks for a
+        leave on slot_date and an overlapping active appointment. When
+        slot_end_time is omitted the doctor's slot duration is used, so callers
+        do not need to load the doctor first. Working day, hours and duration
+        are then checked in memory against the cached schedule template.
+
+        The result is advisory: concurrent writers are stopped by the
+        exclude_overlapping_appointments constraint at insert/update time.
 
         Args:
             db: Database session
             doctor_email: Email of the doctor (unique identifier)
             slot_date: Date of the slot
             slot_start_time: Start time of the slot
-            slot_end_time: End time of the slot
+            slot_end_time: End time of the slot (defaults to start + slot duration)
+            exclude_appointment_id: Appointment to ignore in the overlap check
 
         Returns:
-            True if slot is available, False otherwise
+            SlotCheck with the doctor (None if missing) and the slot verdict
         """
-        # Check if doctor exists and is active
-        doctor = db.query(Doctor).filter(
-            Doctor.email == doctor_email,  # Changed to email
-            Doctor.is_active == True
-        ).first()
+        if slot_end_time is not None:
+            end_expr = literal(slot_end_time, Time)
+        else:
+            end_expr = literal(slot_start_time, Time).op("+")(
+                Doctor.slot_duration_minutes * literal_column("interval '1 minute'")
+            )
 
-        if not doctor:
-            return False
-        
-        # Check if doctor works on this day
-        day_name = slot_date.strftime("%A").lower()
-        if day_name not in [day.lower() for day in doctor.working_days]:
-            return False
-        
-        # Check if doctor is on leave
-        leave = db.query(DoctorLeave).filter(
-            DoctorLeave.doctor_email == doctor_email,  # Changed to email
+        on_leave = exists().where(
+            DoctorLeave.doctor_email == Doctor.email,
             DoctorLeave.date == slot_date
-        ).first()
-        
-        if leave:
+        )
+        overlap_criteria = [
+            Appointment.doctor_email == Doctor.email,
+            Appointment.date == slot_date,
+            Appointment.status.in_([AppointmentStatus.BOOKED, AppointmentStatus.RESCHEDULED]),
+            Appointment.start_time < end_expr,
+            Appointment.end_time > slot_start_time
+        ]
+        if exclude_appointment_id:
+            overlap_criteria.append(Appointment.id != exclude_appointment_id)
+        overlapping = exists().where(*overlap_criteria)
+
+        row = db.query(
+            Doctor,
+            on_leave.label("on_leave"),
+            overlapping.label("overlapping")
+        ).filter(Doctor.email == doctor_email).first()
+
+        if row is None:
+            return SlotCheck(doctor=None, available=False)
+
+        doctor = row[0]
+        if not doctor.is_active or row.on_leave or row.overlapping:
+            return SlotCheck(doctor=doctor, available=False)
+
+        template = schedule_template_cache.get(doctor)
+        if slot_end_time is None:
+            end_datetime = datetime.combine(slot_date, slot_start_time) + timedelta(
+                minutes=template.slot_duration_minutes
+            )
+            slot_end_time = end_datetime.time()
+
+        return SlotCheck(
+            doctor=doctor,
+            available=AvailabilityService._fits_template(template, slot_date, slot_start_time, slot_end_time)
+        )
+
+    @staticmethod
+    def _fits_template(
+        template: ScheduleTemplate,
+        slot_date: date,
+        slot_start_time: time,
+        slot_end_time: time
+    ) -> bool:
+        """Check working day, working hours and slot duration against a template."""
+        if not template.works_on(slot_date):
             return False
-        
-        # Check if slot is within working hours
-        working_start = datetime.strptime(doctor.working_hours["start"], "%H:%M").time()
-        working_end = datetime.strptime(doctor.working_hours["end"], "%H:%M").time()
-        
-        if slot_start_time < working_start or slot_end_time > working_end:
+
+        if slot_start_time < template.working_start or slot_end_time > template.working_end:
             return False
-        
-        # Check if slot duration matches
+
         slot_duration = (
             datetime.combine(date.today(), slot_end_time) -
             datetime.combine(date.today(), slot_start_time)
         ).total_seconds() / 60
-        
-        if slot_duration != doctor.slot_duration_minutes:
-            return False
-        
-        # Check for overlapping appointments
-        overlapping_query = db.query(Appointment).filter(
-            Appointment.doctor_email == doctor_email,  # Changed to email
-            Appointment.date == slot_date,
-            Appointment.status.in_([AppointmentStatus.BOOKED, AppointmentStatus.RESCHEDULED]),
-            or_(
-                and_(
-                    Appointment.start_time < slot_end_time,
-                    Appointment.end_time > slot_start_time
-                )
-            )
-        )
-        if exclude_appointment_id:
-            overlapping_query = overlapping_query.filter(Appointment.id != exclude_appointment_id)
+        return slot_duration == template.slot_duration_minutes
 
-        overlapping = overlapping_query.first()
-        
-        return overlapping is None
+    @staticmethod
+    def load_conflict_index(
+        db: Session,
+        doctor: Doctor,
+        dates: Set[date]
+    ) -> SlotConflictIndex:
+        """
+        Load a doctor's leaves and active appointments on dates for in-memory
+        slot checks: two queries however many slots are checked afterwards.
+        """
+        leave_dates: Set[date] = set()
+        intervals: Dict[date, List[Tuple[time, time, Optional[UUID]]]] = defaultdict(list)
+        if dates:
+            leave_dates = {
+                leave_date for (leave_date,) in db.query(DoctorLeave.date).filter(
+                    DoctorLeave.doctor_email == doctor.email,
+                    DoctorLeave.date.in_(dates)
+                ).all()
+            }
+            appointments = db.query(
+                Appointment.id,
+                Appointment.date,
+                Appointment.start_time,
+                Appointment.end_time
+            ).filter(
+                Appointment.doctor_email == doctor.email,
+                Appointment.date.in_(dates),
+                Appointment.status.in_([AppointmentStatus.BOOKED, AppointmentStatus.RESCHEDULED])
+            ).all()
+            for appointment_id, apt_date, apt_start, apt_end in appointments:
+                intervals[apt_date].append((apt_start, apt_end, appointment_id))
+        return SlotConflictIndex(doctor, schedule_template_cache.get(doctor), leave_dates, dict(intervals))
+
+    @staticmethod
+    def is_slot_available(
+        db: Session,
+        doctor_email: str,  # Changed to email
+        slot_date: date,
+        slot_start_time: time,
+        slot_end_time: time,
+        exclude_appointment_id: Optional[UUID] = None
+    ) -> bool:
+        """
+        Check if a specific slot is available.
+        Used for booking validation.
+
+        Args:
+            db: Database session
+            doctor_email: Email of the doctor (unique identifier)
+            slot_date: Date of the slot
+            slot_start_time: Start time of the slot
+            slot_end_time: End time of the slot
+
+        Returns:
+            True if slot is available, False otherwise
+        """
+        return AvailabilityService.check_slot(
+            db=db,
+            doctor_email=doctor_email,
+            slot_date=slot_date,
+            slot_start_time=slot_start_time,
+            slot_end_time=slot_end_time,
+            exclude_appointment_id=exclude_appointment_id
+        ).available
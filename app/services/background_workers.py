@@ -0,0 +1,75 @@
+"""
+Background Workers - starts the calendar workers for this process.
+
+The sync queue runs in every process that starts workers; its jobs are leased,
+so processes share the backlog. Watch renewal and reconcile must run once per
+deployment, so they only run in the process elected leader. Used by the API
+startup hook and by run_worker.py (standalone worker process).
+"""
+import logging
+import os
+
+from app.config import settings
+from app.services.calendar_reconcile_service import calendar_reconcile_service
+from app.services.calendar_sync_queue import calendar_sync_queue
+from app.services.calendar_watch_service import calendar_watch_service
+from app.services.leader_election import LeaderElector
+
+logger = logging.getLogger(__name__)
+
+SINGLETON_SERVICES_LOCK = "calendar-singleton-services"
+
+
+class BackgroundWorkers:
+    """Calendar sync queue plus leader-elected singleton services."""
+
+    def __init__(self):
+        self._elector = LeaderElector(
+            SINGLETON_SERVICES_LOCK,
+            on_elected=self._start_singletons,
+            on_revoked=self._stop_singletons
+        )
+        self._started = False
+
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    @property
+    def is_leader(self) -> bool:
+        return not settings.LEADER_ELECTION_ENABLED or self._elector.is_leader
+
+    def start(self) -> None:
+        """
+        Start the workers.
+
+        Raises:
+            RuntimeError: If Google Calendar credentials are not configured
+        """
+        if not settings.GOOGLE_CALENDAR_CREDENTIALS_PATH or not os.path.exists(settings.GOOGLE_CALENDAR_CREDENTIALS_PATH):
+            raise RuntimeError("GOOGLE_CALENDAR_CREDENTIALS_PATH must point to a valid credentials file")
+        calendar_sync_queue.start()
+        if settings.LEADER_ELECTION_ENABLED:
+            self._elector.start()
+        else:
+            self._start_singletons()
+        self._started = True
+
+    def stop(self) -> None:
+        calendar_sync_queue.stop()
+        if settings.LEADER_ELECTION_ENABLED:
+            self._elector.stop()
+        else:
+            self._stop_singletons()
+        self._started = False
+
+    def _start_singletons(self) -> None:
+        calendar_watch_service.start()
+        calendar_reconcile_service.start()
+
+    def _stop_singletons(self) -> None:
+        calendar_watch_service.stop()
+        calendar_reconcile_service.stop()
+
+
+background_workers = BackgroundWorkers()
@@ -15,17 +15,26 @@ from app.models.doctor import Doctor
 from app.models.patient import Patient
 from app.models.patient_history import PatientHistory
 from app.models.appointment import Appointment, AppointmentStatus, AppointmentSource
-from app.models.calendar_sync_job import CalendarSyncJob
 from app.schemas.appointment import AppointmentCreate, AppointmentReschedule
 from app.services.availability_service import AvailabilityService
+from app.services.availability_cache import availability_cache
+from app.services.availability_materializer import availability_materializer
 from app.services.calendar_sync_queue import calendar_sync_queue
-from app.services.google_calendar_service import GoogleCalendarService
 from app.services.rag_sync_service import RAGSyncService
+from app.utils.advisory_locks import lock_doctor_day, lock_doctor_days
 from app.utils.datetime_utils import to_utc
 
 logger = logging.getLogger(__name__)
 
 
+def _is_overlap_violation(error: IntegrityError) -> bool:
+    """True when an IntegrityError comes from the exclude_overlapping_appointments constraint."""
+    diag = getattr(error.orig, "diag", None)
+    if getattr(diag, "constraint_name", None) == "exclude_overlapping_appointments":
+        return True
+    return "exclude_overlapping_appointments" in str(error.orig)
+
+
 class BookingService:
     """Service for managing appointments."""
     
@@ -45,8 +54,8 @@ class BookingService:
         1. Validate slot availability from DB
         2. Create or get patient (based on mobile number)
         3. Save patient history if provided
-        4. Create appointment in DB with row-level locking
-        5. After DB commit, create Google Calendar event
+        4. Create appointment in DB under the doctor-day advisory lock
+        5. After DB commit, queue Google Calendar event creation
         
         Args:
             db: Database session
@@ -58,8 +67,17 @@ class BookingService:
         Raises:
             ValueError: If slot not available or validation fails
         """
-        # Get doctor first to calculate slot end time
-        doctor = db.query(Doctor).filter(Doctor.email == booking_data.doctor_email).first()  # Changed to email
+        # Serialize writers for this doctor-day so contention resolves before validation
+        lock_doctor_day(db, booking_data.doctor_email, booking_data.date)
+
+        # Load doctor, leave and overlap state in one round trip
+        slot_check = self.availability_service.check_slot(
+            db=db,
+            doctor_email=booking_data.doctor_email,  # Changed to email
+            slot_date=booking_data.date,
+            slot_start_time=booking_data.start_time
+        )
+        doctor = slot_check.doctor
         if not doctor:
             raise ValueError(f"Doctor with email '{booking_data.doctor_email}' not found")
 
@@ -93,13 +111,7 @@ class BookingService:
         end_at_utc = to_utc(booking_data.date, slot_end_time, appointment_tz)
 
         # Validate slot availability
-        if not self.availability_service.is_slot_available(
-            db=db,
-            doctor_email=booking_data.doctor_email,  # Changed to email
-            slot_date=booking_data.date,
-            slot_start_time=booking_data.start_time,
-            slot_end_time=slot_end_time
-        ):
+        if not slot_check.available:
             raise ValueError("Slot is not available")
         
         # Get or create patient based on mobile number
@@ -144,21 +156,8 @@ class BookingService:
             )
             db.add(patient_history)
         
-        # Create appointment with row-level locking
-        # Use SELECT FOR UPDATE to prevent double booking
+        # Create appointment; exclude_overlapping_appointments rejects a concurrent double booking
         try:
-            # Check again with lock to prevent race conditions
-            existing_appointment = db.query(Appointment).filter(
-                Appointment.doctor_email == doctor.email,  # Changed to use doctor.email
-                Appointment.date == booking_data.date,
-                Appointment.status.in_([AppointmentStatus.BOOKED, AppointmentStatus.RESCHEDULED]),
-                Appointment.start_time < slot_end_time,
-                Appointment.end_time > booking_data.start_time
-            ).with_for_update().first()
-
-            if existing_appointment:
-                raise ValueError("Slot has been booked by another request")
-
             # Create appointment
             appointment = Appointment(
                 doctor_email=booking_data.doctor_email,  # Changed to email
@@ -175,19 +174,28 @@ class BookingService:
             )
             
             db.add(appointment)
+            db.flush()  # Assign appointment ID; overlap violations surface here
+
+            # Outbox: the sync job commits atomically with the appointment
+            apt_id_str = str(appointment.id)
+            calendar_sync_queue.enqueue_create(apt_id_str, db)
+            availability_materializer.refresh_day(db, appointment.doctor_email, appointment.date)
             db.commit()
             db.refresh(appointment)
+            availability_cache.invalidate(appointment.doctor_email, appointment.date)
             
-            # Queue calendar sync and run immediately so calendar updates before response
-            apt_id_str = str(appointment.id)
-            calendar_sync_queue.enqueue_create(apt_id_str)
-            calendar_sync_queue.trigger_immediate_sync(apt_id_str, "CREATE")
+            # Wake the worker; it creates the event without blocking this request
+            if calendar_sync_queue.dispatch(apt_id_str, "CREATE"):
+                db.refresh(appointment)
 
             logger.info(f"Successfully booked appointment {appointment.id}")
             return appointment
             
         except IntegrityError as e:
             db.rollback()
+            if _is_overlap_violation(e):
+                logger.info(f"Slot for {booking_data.doctor_email} was booked by a concurrent request")
+                raise ValueError("Slot has been booked by another request")
             logger.error(f"Database integrity error during booking: {str(e)}")
             raise ValueError("Failed to book appointment due to database constraint violation")
         except Exception as e:
@@ -210,7 +218,7 @@ class BookingService:
         3. DB transaction:
            - Cancel old appointment
            - Create new appointment
-        4. Update Google Calendar event
+        4. Queue Google Calendar event update
         
         Args:
             db: Database session
@@ -232,39 +240,29 @@ class BookingService:
         if not appointment:
             raise ValueError(f"Appointment {appointment_id} not found or already cancelled")
         
-        # Validate new slot availability with lock to avoid race conditions
-        if not self.availability_service.is_slot_available(
+        # Serialize writers for the old and new doctor-days before validating
+        lock_doctor_days(
+            db,
+            [(appointment.doctor_email, appointment.date), (appointment.doctor_email, reschedule_data.new_date)]
+        )
+
+        # Validate new slot and load the doctor in one round trip
+        slot_check = self.availability_service.check_slot(
             db=db,
             doctor_email=appointment.doctor_email,
             slot_date=reschedule_data.new_date,
             slot_start_time=reschedule_data.new_start_time,
             slot_end_time=reschedule_data.new_end_time,
             exclude_appointment_id=appointment.id
-        ):
-            raise ValueError("New slot is not available")
-
-        overlapping = db.query(Appointment).filter(
-            Appointment.doctor_email == appointment.doctor_email,
-            Appointment.date == reschedule_data.new_date,
-            Appointment.status.in_([AppointmentStatus.BOOKED, AppointmentStatus.RESCHEDULED]),
-            Appointment.start_time < reschedule_data.new_end_time,
-            Appointment.end_time > reschedule_data.new_start_time,
-            Appointment.id != appointment.id
-        ).with_for_update().first()
-        if overlapping:
-            raise ValueError("New slot is not available")
-
-        # Get doctor
-        doctor = db.query(Doctor).filter(Doctor.email == appointment.doctor_email).first()  # Changed to email
+        )
+        doctor = slot_check.doctor
         if not doctor:
             raise ValueError(f"Doctor with email '{appointment.doctor_email}' not found")
-        
-        # Get patient
-        patient = db.query(Patient).filter(Patient.id == appointment.patient_id).first()
-        if not patient:
-            raise ValueError(f"Patient {appointment.patient_id} not found")
+        if not slot_check.available:
+            raise ValueError("New slot is not available")
         
         old_event_id = appointment.google_calendar_event_id
+        old_date = appointment.date
         appointment_tz = doctor.timezone or settings.DEFAULT_TIMEZONE
         start_at_utc = to_utc(reschedule_data.new_date, reschedule_data.new_start_time, appointment_tz)
         end_at_utc = to_utc(reschedule_data.new_date, reschedule_data.new_end_time, appointment_tz)
@@ -279,69 +277,38 @@ class BookingService:
             appointment.start_at_utc = start_at_utc
             appointment.end_at_utc = end_at_utc
             appointment.calendar_sync_status = "PENDING"
-            
-            db.commit()
-            db.refresh(appointment)
-            
-            # Queue calendar sync (for worker retry) then sync immediately in same session
+            availability_materializer.refresh_days(
+                db,
+                [(appointment.doctor_email, old_date), (appointment.doctor_email, appointment.date)]
+            )
+
+            # Outbox: the sync job commits atomically with the reschedule
             apt_id_str = str(appointment.id)
             action = "UPDATE" if old_event_id else "CREATE"
             if old_event_id:
-                calendar_sync_queue.enqueue_update(apt_id_str)
-            else:
-                calendar_sync_queue.enqueue_create(apt_id_str)
-
-            cal = GoogleCalendarService()
-            if old_event_id:
-                result = cal.update_event(
-                    doctor_email=appointment.doctor_email,
-                    event_id=old_event_id,
-                    patient_name=patient.name,
-                    appointment_date=appointment.date,
-                    start_time=appointment.start_time,
-                    end_time=appointment.end_time,
-                    description=f"Appointment with {patient.name}",
-                    timezone_name=appointment.timezone,
-                )
-                ok = bool(result)
-                # If update_event returned a new event ID (old event was deleted), update DB
-                if isinstance(result, str):
-                    appointment.google_calendar_event_id = result
+                calendar_sync_queue.enqueue_update(apt_id_str, db)
             else:
-                event_id = cal.create_event(
-                    doctor_email=appointment.doctor_email,
-                    patient_name=patient.name,
-                    appointment_date=appointment.date,
-                    start_time=appointment.start_time,
-                    end_time=appointment.end_time,
-                    description=f"Appointment with {patient.name}",
-                    timezone_name=appointment.timezone,
-                )
-                ok = bool(event_id)
-                if ok:
-                    appointment.google_calendar_event_id = event_id
-
-            if ok:
-                appointment.calendar_sync_status = "SYNCED"
-                appointment.calendar_sync_last_error = None
-                appointment.calendar_sync_next_attempt_at = None
-                job = db.query(CalendarSyncJob).filter(
-                    CalendarSyncJob.appointment_id == appointment.id,
-                    CalendarSyncJob.action == action,
-                    CalendarSyncJob.status.in_(["PENDING", "IN_PROGRESS"]),
-                ).first()
-                if job:
-                    job.status = "COMPLETED"
-                db.commit()
-                db.refresh(appointment)
-            else:
-                appointment.calendar_sync_last_error = cal.last_error or "Calendar sync failed"
-                db.commit()
+                calendar_sync_queue.enqueue_create(apt_id_str, db)
+            
+            db.commit()
+            db.refresh(appointment)
+            availability_cache.invalidate_days(
+                [(appointment.doctor_email, old_date), (appointment.doctor_email, appointment.date)]
+            )
+            
+            # Wake the worker; it updates the event without blocking this request
+            if calendar_sync_queue.dispatch(apt_id_str, action):
                 db.refresh(appointment)
 
             logger.info(f"Successfully rescheduled appointment {appointment_id}")
             return appointment
             
+        except IntegrityError as e:
+            db.rollback()
+            if _is_overlap_violation(e):
+                raise ValueError("New slot is not available")
+            logger.error(f"Database integrity error during reschedule: {str(e)}")
+            raise ValueError("Failed to reschedule appointment due to database constraint violation")
         except Exception as e:
             db.rollback()
             logger.error(f"Error rescheduling appointment: {str(e)}")
@@ -357,7 +324,7 @@ class BookingService:
         
         Process:
         1. Mark appointment as cancelled in DB
-        2. Delete Google Calendar event
+        2. Queue Google Calendar event deletion
         
         Args:
             db: Database session
@@ -382,42 +349,25 @@ class BookingService:
         if not doctor:
             raise ValueError(f"Doctor with email '{appointment.doctor_email}' not found")
         
-        event_id = appointment.google_calendar_event_id
-        
         try:
             # Mark as cancelled in DB (idempotent if already cancelled)
-            if appointment.status != AppointmentStatus.CANCELLED:
+            newly_cancelled = appointment.status != AppointmentStatus.CANCELLED
+            needs_sync = newly_cancelled or appointment.calendar_sync_status != "SYNCED"
+            apt_id_str = str(appointment.id)
+            if newly_cancelled:
                 appointment.status = AppointmentStatus.CANCELLED
                 appointment.calendar_sync_status = "PENDING"
+                availability_materializer.refresh_day(db, appointment.doctor_email, appointment.date)
+            if needs_sync:
+                # Outbox: enqueued even without an event ID so an in-flight CREATE is cleaned up
+                calendar_sync_queue.enqueue_delete(apt_id_str, db)
                 db.commit()
                 db.refresh(appointment)
-            
-            # Queue calendar sync (for worker retry) then sync immediately in same session
-            if event_id:
-                calendar_sync_queue.enqueue_delete(str(appointment.id))
-                cal = GoogleCalendarService()
-                ok = cal.delete_event(doctor_email=appointment.doctor_email, event_id=event_id)
-                if ok:
-                    appointment.calendar_sync_status = "SYNCED"
-                    appointment.calendar_sync_last_error = None
-                    appointment.calendar_sync_next_attempt_at = None
-                    job = db.query(CalendarSyncJob).filter(
-                        CalendarSyncJob.appointment_id == appointment.id,
-                        CalendarSyncJob.action == "DELETE",
-                        CalendarSyncJob.status.in_(["PENDING", "IN_PROGRESS"]),
-                    ).first()
-                    if job:
-                        job.status = "COMPLETED"
-                    db.commit()
-                    db.refresh(appointment)
-                else:
-                    appointment.calendar_sync_last_error = cal.last_error or "Calendar delete failed"
-                    db.commit()
-                    db.refresh(appointment)
-            else:
-                # No calendar event to delete
-                appointment.calendar_sync_status = "SYNCED"
-                db.commit()
+            if newly_cancelled:
+                availability_cache.invalidate(appointment.doctor_email, appointment.date)
+
+            # Wake the worker; it deletes the event without blocking this request
+            if needs_sync and calendar_sync_queue.dispatch(apt_id_str, "DELETE"):
                 db.refresh(appointment)
 
             logger.info(f"Successfully cancelled appointment {appointment_id}")
@@ -1,23 +1,43 @@
 """
 Calendar Reconcile Service - periodic Google Calendar -> DB backfill sync.
+
+Each sweep syncs every doctor whose last successful sync (webhook or
+reconcile) is older than the reconcile interval, stalest first. The threshold
+is moved forward by the previous sweep's duration (at least a tenth of the
+interval), so doctors synced by the previous sweep are due again in the next
+one. Doctors are paged by keyset on (last_synced_at, email) and synced
+concurrently, up to CALENDAR_RECONCILE_CONCURRENCY at a time. Each doctor's
+sync runs in its own thread, since its database work (advisory lock waits
+included) blocks; a doctor already being synced by a webhook is skipped
+rather than waited for.
 """
 from __future__ import annotations
 
 import asyncio
 import logging
 import threading
-from typing import Iterable, List, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy import exists, func, literal, tuple_
 
 from app.config import settings
 from app.database import SessionLocal
+from app.models.calendar_sync_state import CalendarSyncState
 from app.models.calendar_watch import CalendarWatch
 from app.models.doctor import Doctor
 from app.services.calendar_sync_service import CalendarSyncService
 
 logger = logging.getLogger(__name__)
 
+# Sort key for doctors that have never synced: before every real timestamp
+NEVER_SYNCED = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Doctors synced this recently are never resynced by a sweep
+MIN_RESYNC_SECONDS = 30
+
 
 class CalendarReconcileService:
     """Background service to backfill calendar changes when webhooks fail."""
@@ -25,8 +45,8 @@ class CalendarReconcileService:
     def __init__(self) -> None:
         self._worker: threading.Thread | None = None
         self._stop_event = threading.Event()
-        self._offset = 0
         self._sync_service = CalendarSyncService()
+        self._last_sweep_seconds = 0.0
 
     def start(self) -> None:
         if not settings.CALENDAR_RECONCILE_ENABLED:
@@ -49,72 +69,126 @@ class CalendarReconcileService:
 
     def _run(self) -> None:
         interval = max(30, settings.CALENDAR_RECONCILE_INTERVAL_SECONDS)
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        # Each doctor's sync runs in asyncio.to_thread; size the pool to the sync concurrency
+        loop.set_default_executor(ThreadPoolExecutor(
+            max_workers=max(1, settings.CALENDAR_RECONCILE_CONCURRENCY),
+            thread_name_prefix="calendar-reconcile"
+        ))
+        try:
+            while not self._stop_event.is_set():
+                started = time.monotonic()
+                try:
+                    loop.run_until_complete(self._sweep(interval))
+                except Exception as e:
+                    logger.error(f"Calendar reconcile worker error: {e}")
+                elapsed = time.monotonic() - started
+                if elapsed > interval:
+                    logger.warning(
+                        f"Calendar reconcile sweep took {elapsed:.0f}s, longer than the {interval}s interval"
+                    )
+                # Leave a short pause even after a long sweep so doctors that just failed are not hammered
+                self._stop_event.wait(max(interval - elapsed, 30))
+        finally:
+            loop.close()
+
+    async def _sweep(self, interval: int, now: Optional[datetime] = None) -> None:
+        """Sync every doctor not synced within the last interval, stalest first."""
+        stale_before = self._stale_before(now or datetime.now(timezone.utc), interval)
+        semaphore = asyncio.Semaphore(max(1, settings.CALENDAR_RECONCILE_CONCURRENCY))
+        started = time.monotonic()
+        cursor: Optional[Tuple[datetime, str]] = None
+        attempted = succeeded = 0
         while not self._stop_event.is_set():
-            try:
-                self._reconcile_batch()
-            except Exception as e:
-                logger.error(f"Calendar reconcile worker error: {e}")
-            self._stop_event.wait(interval)
-
-    def _reconcile_batch(self) -> None:
-        doctor_emails = self._get_next_doctor_batch()
-        if not doctor_emails:
-            return
-        logger.info(
-            "Calendar reconcile: syncing %s doctors",
-            len(doctor_emails)
+            batch = self._get_next_doctor_batch(stale_before, cursor)
+            if not batch:
+                break
+            cursor = batch[-1]
+            results = await asyncio.gather(
+                *(self._sync_doctor(doctor_email, semaphore) for _, doctor_email in batch)
+            )
+            attempted += len(results)
+            succeeded += sum(results)
+        self._last_sweep_seconds = time.monotonic() - started
+        if attempted:
+            logger.info(
+                f"Calendar reconcile: synced {succeeded}/{attempted} stale doctors "
+                f"in {time.monotonic() - started:.1f}s"
+            )
+
+    def _stale_before(self, now: datetime, interval: int) -> datetime:
+        """
+        Sync threshold for a sweep starting at now.
+
+        Sweeps start about one interval apart, so a doctor synced d seconds
+        into the previous sweep was synced interval - d seconds ago; moving
+        the threshold forward by the previous sweep's duration keeps every
+        such doctor due instead of skipping it until the sweep after.
+        """
+        margin = max(interval / 10, self._last_sweep_seconds)
+        return min(
+            now - timedelta(seconds=interval - margin),
+            now - timedelta(seconds=MIN_RESYNC_SECONDS)
         )
-        for doctor_email in doctor_emails:
-            if self._stop_event.is_set():
-                return
-            self._sync_doctor(doctor_email)
 
-    def _get_next_doctor_batch(self) -> List[str]:
+    def _get_next_doctor_batch(
+        self,
+        stale_before: datetime,
+        cursor: Optional[Tuple[datetime, str]] = None
+    ) -> List[Tuple[datetime, str]]:
+        """
+        Next (last_synced_at, email) page of stale doctors after cursor.
+
+        Doctors synced during the sweep move past stale_before and drop out;
+        doctors whose sync failed keep their timestamp and are passed by the
+        cursor, so each is attempted once per sweep.
+        """
         db = SessionLocal()
         try:
-            doctor_query = db.query(Doctor.email).filter(Doctor.is_active == True)
+            synced_at = func.coalesce(CalendarSyncState.last_synced_at, literal(NEVER_SYNCED))
+            doctor_query = (
+                db.query(synced_at, Doctor.email)
+                .outerjoin(CalendarSyncState, CalendarSyncState.doctor_email == Doctor.email)
+                .filter(Doctor.is_active == True, synced_at < stale_before)
+            )
             if settings.CALENDAR_RECONCILE_REQUIRE_ACTIVE_WATCH:
-                doctor_query = doctor_query.join(
-                    CalendarWatch,
-                    CalendarWatch.doctor_email == Doctor.email
-                ).filter(CalendarWatch.is_active == True)
-            doctor_query = doctor_query.distinct().order_by(Doctor.email)
-
-            total = doctor_query.count()
-            if total == 0:
-                return []
-            if self._offset >= total:
-                self._offset = 0
-            batch = (
+                doctor_query = doctor_query.filter(
+                    exists().where(
+                        CalendarWatch.doctor_email == Doctor.email,
+                        CalendarWatch.is_active == True
+                    )
+                )
+            if cursor is not None:
+                doctor_query = doctor_query.filter(tuple_(synced_at, Doctor.email) > tuple_(*cursor))
+            rows = (
                 doctor_query
-                .offset(self._offset)
+                .order_by(synced_at, Doctor.email)
                 .limit(settings.CALENDAR_RECONCILE_BATCH_SIZE)
                 .all()
             )
-            if not batch:
-                self._offset = 0
-                return []
-            self._offset += len(batch)
-            return [row[0] for row in batch]
+            return [(row[0], row[1]) for row in rows]
         finally:
             db.close()
 
-    def _sync_doctor(self, doctor_email: str) -> None:
+    async def _sync_doctor(self, doctor_email: str, semaphore: asyncio.Semaphore) -> bool:
+        async with semaphore:
+            if self._stop_event.is_set():
+                return False
+            # A doctor waiting on Postgres holds only its own thread, not the sweep
+            return await asyncio.to_thread(self._sync_doctor_in_thread, doctor_email)
+
+    def _sync_doctor_in_thread(self, doctor_email: str) -> bool:
         db = SessionLocal()
         try:
-            self._run_sync(self._sync_service.sync_calendar_to_db, doctor_email, db)
+            # Skip doctors a webhook sync holds instead of waiting on the row lock
+            asyncio.run(self._sync_service.sync_calendar_to_db(doctor_email, db, wait=False))
+            return True
         except Exception as e:
             logger.error(f"Calendar reconcile failed for {doctor_email}: {e}")
+            return False
         finally:
             db.close()
 
-    def _run_sync(self, coro, *args) -> None:
-        loop = asyncio.new_event_loop()
-        try:
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(coro(*args))
-        finally:
-            loop.close()
-
 
 calendar_reconcile_service = CalendarReconcileService()
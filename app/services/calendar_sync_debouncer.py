@@ -0,0 +1,160 @@
+"""
+Calendar Sync Debouncer - turns bursts of Google Calendar push notifications
+into one Google -> DB sync per doctor.
+
+The webhook only verifies and acks; it hands the doctor to notify(). A doctor's
+sync starts CALENDAR_WEBHOOK_DEBOUNCE_SECONDS after the first notification of a
+burst, never less than CALENDAR_WEBHOOK_MIN_SYNC_INTERVAL_SECONDS after the
+previous sync started, and once more after any notification that arrives while
+it runs, so the last change is always picked up. Syncs run on a small thread
+pool, one at a time per doctor.
+"""
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Set
+
+from app.config import settings
+from app.database import SessionLocal
+from app.services.calendar_sync_service import CalendarSyncService
+
+logger = logging.getLogger(__name__)
+
+
+class CalendarSyncDebouncer:
+    """Per-doctor throttled, trailing-edge scheduler for webhook-triggered calendar syncs."""
+
+    def __init__(
+        self,
+        delay_seconds: float = settings.CALENDAR_WEBHOOK_DEBOUNCE_SECONDS,
+        min_interval_seconds: float = settings.CALENDAR_WEBHOOK_MIN_SYNC_INTERVAL_SECONDS,
+        concurrency: int = settings.CALENDAR_WEBHOOK_SYNC_CONCURRENCY,
+        max_tracked_channels: int = 10000
+    ):
+        self._delay = delay_seconds
+        self._min_interval = min_interval_seconds
+        self._concurrency = max(1, concurrency)
+        self._max_tracked_channels = max_tracked_channels
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._due: Dict[str, float] = {}
+        self._running: Set[str] = set()
+        self._dirty: Set[str] = set()
+        self._last_started: Dict[str, float] = {}
+        self._message_numbers: "OrderedDict[str, int]" = OrderedDict()
+        self._worker: Optional[threading.Thread] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._stop_event = threading.Event()
+        self._stats = {"notifications": 0, "duplicates": 0, "coalesced": 0, "syncs": 0, "failures": 0}
+
+    def start(self) -> None:
+        with self._lock:
+            if self._worker and self._worker.is_alive():
+                return
+            self._stop_event.clear()
+            self._pool = ThreadPoolExecutor(max_workers=self._concurrency, thread_name_prefix="calendar-webhook-sync")
+            self._worker = threading.Thread(target=self._run, daemon=True)
+            self._worker.start()
+        logger.info("Calendar webhook sync debouncer started")
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        with self._lock:
+            self._wakeup.notify_all()
+        if self._worker:
+            self._worker.join(timeout=5)
+        if self._pool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def is_running(self) -> bool:
+        return bool(self._worker and self._worker.is_alive())
+
+    def is_duplicate(self, channel_id: str, message_number: Optional[str]) -> bool:
+        """
+        True if this channel already delivered this message number or a later one.
+        Google numbers a channel's messages in increasing order and redelivers on
+        timeouts, so an old number carries nothing a later sync will not see.
+        """
+        try:
+            number = int(message_number)
+        except (TypeError, ValueError):
+            return False
+        with self._lock:
+            last = self._message_numbers.get(channel_id)
+            if last is not None and number <= last:
+                self._stats["duplicates"] += 1
+                return True
+            self._message_numbers[channel_id] = number
+            self._message_numbers.move_to_end(channel_id)
+            while len(self._message_numbers) > self._max_tracked_channels:
+                self._message_numbers.popitem(last=False)
+            return False
+
+    def notify(self, doctor_email: str) -> None:
+        """Request a sync of doctor_email's calendar; returns immediately."""
+        with self._lock:
+            self._stats["notifications"] += 1
+            if doctor_email in self._running:
+                # Sync again once the running one finishes
+                self._dirty.add(doctor_email)
+                self._stats["coalesced"] += 1
+            elif doctor_email in self._due:
+                self._stats["coalesced"] += 1
+            else:
+                self._due[doctor_email] = self._due_time(doctor_email)
+                self._wakeup.notify()
+        if not self.is_running():
+            self.start()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats, scheduled=len(self._due), running=len(self._running))
+
+    def _due_time(self, doctor_email: str) -> float:
+        last_started = self._last_started.get(doctor_email)
+        due = time.monotonic() + self._delay
+        if last_started is not None:
+            due = max(due, last_started + self._min_interval)
+        return due
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            with self._lock:
+                now = time.monotonic()
+                ready = [doctor for doctor, due in self._due.items() if due <= now]
+                if not ready:
+                    timeout = min(self._due.values()) - now if self._due else None
+                    self._wakeup.wait(timeout)
+                    continue
+                for doctor_email in ready:
+                    del self._due[doctor_email]
+                    self._running.add(doctor_email)
+                    self._last_started[doctor_email] = now
+            for doctor_email in ready:
+                self._pool.submit(self._sync, doctor_email)
+
+    def _sync(self, doctor_email: str) -> None:
+        db = SessionLocal()
+        try:
+            result = asyncio.run(CalendarSyncService().sync_calendar_to_db(doctor_email, db))
+            logger.info(f"Webhook-triggered calendar sync completed for {doctor_email}: {result}")
+            with self._lock:
+                self._stats["syncs"] += 1
+        except Exception as e:
+            logger.error(f"Webhook-triggered calendar sync failed for {doctor_email}: {e}")
+            with self._lock:
+                self._stats["failures"] += 1
+        finally:
+            db.close()
+            with self._lock:
+                self._running.discard(doctor_email)
+                if doctor_email in self._dirty:
+                    self._dirty.discard(doctor_email)
+                    self._due[doctor_email] = self._due_time(doctor_email)
+                    self._wakeup.notify()
+
+
+calendar_sync_debouncer = CalendarSyncDebouncer()
@@ -1,24 +1,44 @@
 """
 Calendar Sync Queue - persistent worker for Google Calendar sync jobs.
+
+The worker sleeps on a Postgres LISTEN connection and is woken by the
+calendar_sync_jobs_notify trigger when jobs are committed; a timer only covers
+delayed retries. If LISTEN is unavailable it falls back to polling. Claimed
+jobs run on a thread pool, in parallel across doctors and in order per doctor.
+
+Any number of processes can run the worker. A claimed job carries a lease
+that its worker renews while it holds the job; if the worker dies the lease
+expires and another process claims the job again.
 """
 import logging
+import os
+import socket
 import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
-from typing import Optional
-from uuid import UUID
+from typing import Deque, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
 
-from sqlalchemy import inspect
+import psycopg
+from sqlalchemy import and_, exists, func, inspect, or_
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session, aliased
 
 from app.config import settings
 from app.database import SessionLocal
 from app.models.appointment import Appointment, AppointmentStatus
 from app.models.patient import Patient
 from app.models.calendar_sync_job import CalendarSyncJob
-from app.services.google_calendar_service import GoogleCalendarService
+from app.services.google_calendar_service import BATCH_MAX_OPERATIONS, GoogleCalendarService
+from app.services.google_rate_limiter import google_rate_limiter
 
 logger = logging.getLogger(__name__)
 
+# Signalled by the calendar_sync_jobs_notify trigger when a PENDING job is written
+NOTIFY_CHANNEL = "calendar_sync_jobs"
+
 
 class CalendarSyncQueue:
     """Background queue for retrying calendar sync."""
@@ -27,14 +47,38 @@ class CalendarSyncQueue:
         self,
         max_retries: int = settings.CALENDAR_SYNC_MAX_RETRIES,
         retry_base_seconds: int = settings.CALENDAR_SYNC_RETRY_BASE_SECONDS,
-        poll_interval_seconds: int = settings.CALENDAR_SYNC_POLL_INTERVAL_SECONDS
+        poll_interval_seconds: int = settings.CALENDAR_SYNC_POLL_INTERVAL_SECONDS,
+        idle_timeout_seconds: int = settings.CALENDAR_SYNC_IDLE_TIMEOUT_SECONDS,
+        batch_size: int = settings.CALENDAR_SYNC_BATCH_SIZE,
+        concurrency: int = settings.CALENDAR_SYNC_CONCURRENCY,
+        lease_seconds: int = settings.CALENDAR_SYNC_LEASE_SECONDS
     ):
         self._worker: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
         self._max_retries = max_retries
         self._retry_base = retry_base_seconds
         self._poll_interval = poll_interval_seconds
-        self._calendar_service = GoogleCalendarService()
+        self._idle_timeout = idle_timeout_seconds
+        self._batch_size = batch_size
+        self._concurrency = max(1, concurrency)
+        self._lease_seconds = lease_seconds
+        self._worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self._next_lease_renewal = 0.0
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._queue_lock = threading.Lock()
+        self._doctor_queues: Dict[str, Deque] = {}
+        self._queued = 0
+        self._thread_state = threading.local()
+        self._stats = {"jobs_coalesced": 0, "google_calls_saved": 0}
+
+    @property
+    def _calendar_service(self) -> GoogleCalendarService:
+        # One client per pool thread: GoogleCalendarService keeps last_error on the instance
+        service = getattr(self._thread_state, "calendar_service", None)
+        if service is None:
+            service = self._thread_state.calendar_service = GoogleCalendarService()
+        return service
 
     def start(self) -> None:
         if self._worker and self._worker.is_alive():
@@ -46,60 +90,155 @@ class CalendarSyncQueue:
             )
             return
         self._stop_event.clear()
+        self._pool = ThreadPoolExecutor(max_workers=self._concurrency, thread_name_prefix="calendar-sync")
         self._worker = threading.Thread(target=self._run, daemon=True)
         self._worker.start()
-        logger.info("Calendar sync queue started")
+        logger.info(f"Calendar sync queue started ({self._concurrency} workers)")
 
     def stop(self) -> None:
         self._stop_event.set()
+        self._wake_event.set()
         if self._worker:
             self._worker.join(timeout=5)
+        if self._pool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._release_queued_jobs()
 
     def is_running(self) -> bool:
         return bool(self._worker and self._worker.is_alive())
 
-    def enqueue_create(self, appointment_id: str) -> None:
-        self._enqueue(appointment_id, "CREATE")
+    def enqueue_create(self, appointment_id: str, db: Optional[Session] = None) -> None:
+        self._enqueue(appointment_id, "CREATE", db)
+
+    def enqueue_update(self, appointment_id: str, db: Optional[Session] = None) -> None:
+        self._enqueue(appointment_id, "UPDATE", db)
 
-    def enqueue_update(self, appointment_id: str) -> None:
-        self._enqueue(appointment_id, "UPDATE")
+    def enqueue_delete(self, appointment_id: str, db: Optional[Session] = None) -> None:
+        self._enqueue(appointment_id, "DELETE", db)
 
-    def enqueue_delete(self, appointment_id: str) -> None:
-        self._enqueue(appointment_id, "DELETE")
+    def _enqueue(self, appointment_id: str, action: str, db: Optional[Session] = None) -> None:
+        """
+        Add a PENDING job, coalesced with jobs already waiting (see _add_job).
 
-    def _enqueue(self, appointment_id: str, action: str) -> None:
+        With db, the job is an outbox row written in the caller's transaction:
+        it becomes visible to the worker exactly when the appointment change
+        commits and is discarded with it on rollback. The caller is expected to
+        set appointment.calendar_sync_status itself. Without db, a separate
+        session is used and committed immediately.
+        """
         if not appointment_id:
             return
+        if db is not None:
+            self._add_job(db, UUID(appointment_id), action)
+            return
+
         db = SessionLocal()
         try:
-            job = (
-                db.query(CalendarSyncJob)
+            if self._add_job(db, UUID(appointment_id), action):
+                appointment = db.query(Appointment).filter(Appointment.id == UUID(appointment_id)).first()
+                if appointment:
+                    appointment.calendar_sync_status = "PENDING"
+                db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to enqueue calendar sync job: {e}")
+        finally:
+            db.close()
+
+    def _add_job(self, db: Session, appointment_id: UUID, action: str) -> bool:
+        """
+        Add a job for the appointment, coalesced with the jobs still waiting.
+
+        CREATE and UPDATE read the appointment when they run, so one waiting
+        CREATE/UPDATE covers any later change. DELETE supersedes waiting
+        CREATE/UPDATE jobs, and is itself dropped when no event exists and none
+        can appear (nothing in flight). Waiting jobs are locked first so a
+        worker cannot claim one mid-decision; in-flight jobs are never touched.
+
+        Returns:
+            True if a job row was added
+        """
+        pending = (
+            db.query(CalendarSyncJob)
+            .filter(
+                CalendarSyncJob.appointment_id == appointment_id,
+                CalendarSyncJob.status == "PENDING"
+            )
+            .order_by(CalendarSyncJob.created_at)
+            .with_for_update()
+            .all()
+        )
+        if any(job.action == action for job in pending):
+            return False
+
+        if action in {"CREATE", "UPDATE"}:
+            if any(job.action in {"CREATE", "UPDATE"} for job in pending):
+                self._record_coalesced(jobs=1, calls=1)
+                return False
+        else:
+            superseded = [job for job in pending if job.action in {"CREATE", "UPDATE"}]
+            for job in superseded:
+                job.status = "COALESCED"
+            in_flight = (
+                db.query(CalendarSyncJob.action)
                 .filter(
-                    CalendarSyncJob.appointment_id == UUID(appointment_id),
-                    CalendarSyncJob.action == action,
-                    CalendarSyncJob.status.in_(["PENDING", "IN_PROGRESS"])
+                    CalendarSyncJob.appointment_id == appointment_id,
+                    CalendarSyncJob.status == "IN_PROGRESS"
                 )
-                .first()
+                .all()
             )
-            if job:
-                return
-            new_job = CalendarSyncJob(
-                appointment_id=UUID(appointment_id),
-                action=action,
-                status="PENDING"
+            appointment = db.get(Appointment, appointment_id)
+            event_possible = (
+                appointment is None
+                or appointment.google_calendar_event_id
+                or any(job_action != "DELETE" for job_action, in in_flight)
             )
-            db.add(new_job)
+            if not event_possible:
+                appointment.calendar_sync_status = "SYNCED"
+                self._record_coalesced(jobs=len(superseded) + 1, calls=0)
+                return False
+            # Superseded jobs would have seen the cancellation and skipped Google anyway
+            self._record_coalesced(jobs=len(superseded), calls=0)
 
-            appointment = db.query(Appointment).filter(Appointment.id == UUID(appointment_id)).first()
-            if appointment:
-                appointment.calendar_sync_status = "PENDING"
+        db.add(CalendarSyncJob(
+            appointment_id=appointment_id,
+            action=action,
+            status="PENDING"
+        ))
+        return True
 
-            db.commit()
-        except Exception as e:
-            db.rollback()
-            logger.error(f"Failed to enqueue calendar sync job: {e}")
-        finally:
-            db.close()
+    def _record_coalesced(self, jobs: int, calls: int) -> None:
+        if not jobs:
+            return
+        with self._queue_lock:
+            self._stats["jobs_coalesced"] += jobs
+            self._stats["google_calls_saved"] += calls
+
+    def stats(self) -> Dict[str, int]:
+        """Coalescing counters for jobs enqueued by this process."""
+        with self._queue_lock:
+            return dict(self._stats, queued=self._queued)
+
+    def dispatch(self, appointment_id: str, action: str) -> bool:
+        """
+        Hand a committed job to the worker without blocking the caller.
+
+        The worker is woken and claims the job within milliseconds, so request
+        latency does not depend on Google. With CALENDAR_SYNC_INLINE set the job
+        is processed in the calling thread instead (legacy behaviour).
+
+        Returns:
+            True if the job was processed inline
+        """
+        if settings.CALENDAR_SYNC_INLINE:
+            self.trigger_immediate_sync(appointment_id, action)
+            return True
+        self.wake()
+        return False
+
+    def wake(self) -> None:
+        """Make the worker poll for due jobs now instead of after the poll interval."""
+        self._wake_event.set()
 
     def trigger_immediate_sync(self, appointment_id: str, action: str = "CREATE") -> None:
         """
@@ -126,6 +265,8 @@ class CalendarSyncQueue:
             if job:
                 job.status = "IN_PROGRESS"
                 job.attempts += 1
+                job.worker_id = self._worker_id
+                job.lease_expires_at = datetime.now(timezone.utc) + timedelta(seconds=self._lease_seconds)
                 db.add(job)
                 db.commit()
                 job_id = job.id
@@ -138,38 +279,288 @@ class CalendarSyncQueue:
             self._process_job(job_id)
 
     def _run(self) -> None:
+        listener = None
         while not self._stop_event.is_set():
+            processed = 0
+            self._renew_leases()
             try:
-                self._process_batch()
+                processed = self._process_batch()
             except Exception as e:
                 logger.error(f"Calendar sync worker error: {e}")
-            time.sleep(self._poll_interval)
+            if processed:
+                continue
+            if self._saturated():
+                # Pool is full; a finished job sets the wake event
+                self._wake_event.wait(self._poll_interval)
+                self._wake_event.clear()
+                continue
+
+            if listener is None:
+                listener = self._open_listener()
+            if listener is None:
+                # LISTEN unavailable: fall back to polling
+                self._wake_event.wait(self._poll_interval)
+                self._wake_event.clear()
+                continue
+            try:
+                # Wake at least every third of a lease so held jobs are renewed in time
+                self._wait_for_notify(listener, min(self._seconds_until_next_due(), self._lease_seconds / 3))
+            except Exception as e:
+                logger.warning(f"Calendar sync listener lost, reconnecting: {e}")
+                self._close_listener(listener)
+                listener = None
+        self._close_listener(listener)
+
+    def _open_listener(self):
+        """Open a dedicated autocommit connection listening on NOTIFY_CHANNEL."""
+        try:
+            url = make_url(settings.DATABASE_URL).set(drivername="postgresql")
+            conn = psycopg.connect(url.render_as_string(hide_password=False), autocommit=True)
+            conn.execute(f"LISTEN {NOTIFY_CHANNEL}")
+            return conn
+        except Exception as e:
+            logger.warning(f"Calendar sync LISTEN unavailable, polling every {self._poll_interval}s: {e}")
+            return None
+
+    @staticmethod
+    def _close_listener(listener) -> None:
+        if listener is not None:
+            try:
+                listener.close()
+            except Exception:
+                pass
+
+    def _wait_for_notify(self, listener, timeout: float) -> None:
+        """
+        Block until a job NOTIFY arrives, an in-process wake, stop, or timeout.
+        Waits in short slices so stop and wake are honoured promptly; waiting
+        itself issues no queries.
+        """
+        deadline = time.monotonic() + timeout
+        while not self._stop_event.is_set():
+            if self._wake_event.is_set():
+                self._wake_event.clear()
+                return
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            for _ in listener.notifies(timeout=min(remaining, 0.25), stop_after=1):
+                # Drain coalesced notifications so a burst causes a single wake
+                for _ in listener.notifies(timeout=0):
+                    pass
+                return
 
-    def _process_batch(self) -> None:
+    def _seconds_until_next_due(self) -> float:
+        """Seconds until the earliest delayed retry is due, capped at the idle timeout."""
+        db = SessionLocal()
+        try:
+            next_due = db.query(func.min(CalendarSyncJob.next_attempt_at)).filter(
+                CalendarSyncJob.status == "PENDING"
+            ).scalar()
+        except Exception as e:
+            logger.warning(f"Calendar sync next-due lookup failed: {e}")
+            return float(self._poll_interval)
+        finally:
+            db.close()
+        if next_due is None:
+            return float(self._idle_timeout)
+        delay = (next_due - datetime.now(timezone.utc)).total_seconds()
+        if delay <= 0:
+            # Due but not claimable (in flight elsewhere); a finished job or NOTIFY wakes us sooner
+            return float(self._poll_interval)
+        return min(delay, float(self._idle_timeout))
+
+    def _saturated(self) -> bool:
+        with self._queue_lock:
+            return self._queued >= self._batch_size
+
+    def _process_batch(self) -> int:
+        """
+        Claim due jobs and hand them to the worker pool.
+
+        Jobs are queued per doctor and each doctor's queue is drained by one
+        pool thread at a time, so different doctors sync in parallel while one
+        doctor's jobs run in claim (created_at) order. At most batch_size jobs
+        are held in memory; a finished job wakes the loop to claim more.
+
+        Returns:
+            Number of jobs claimed
+        """
+        with self._queue_lock:
+            room = self._batch_size - self._queued
+        if room <= 0:
+            return 0
+
+        claimed = self._claim_jobs(room)
+        for job_id, doctor_email in claimed:
+            with self._queue_lock:
+                queue = self._doctor_queues.get(doctor_email)
+                start_drain = queue is None
+                if start_drain:
+                    queue = self._doctor_queues[doctor_email] = deque()
+                queue.append(job_id)
+                self._queued += 1
+            if start_drain:
+                self._pool.submit(self._drain_doctor, doctor_email)
+        return len(claimed)
+
+    def _claim_jobs(self, limit: int) -> List[Tuple[UUID, str]]:
+        """
+        Lease up to limit due jobs to this worker and return (job_id, doctor_email).
+
+        Due jobs are PENDING jobs past next_attempt_at and IN_PROGRESS jobs
+        whose lease expired (their worker died). A job is skipped while another
+        job for the same appointment holds a live lease, which keeps one
+        appointment's jobs ordered across processes. SKIP LOCKED lets several
+        workers claim concurrently.
+        """
         db = SessionLocal()
         now = datetime.now(timezone.utc)
-        jobs = []
         try:
-            jobs = (
-                db.query(CalendarSyncJob)
+            in_flight = aliased(CalendarSyncJob)
+            rows = (
+                db.query(CalendarSyncJob, Appointment.doctor_email)
+                .join(Appointment, Appointment.id == CalendarSyncJob.appointment_id)
                 .filter(
-                    CalendarSyncJob.status == "PENDING",
-                    CalendarSyncJob.next_attempt_at <= now
+                    or_(
+                        and_(CalendarSyncJob.status == "PENDING", CalendarSyncJob.next_attempt_at <= now),
+                        and_(CalendarSyncJob.status == "IN_PROGRESS", self._lease_expired(CalendarSyncJob, now))
+                    ),
+                    ~exists().where(
+                        in_flight.appointment_id == CalendarSyncJob.appointment_id,
+                        in_flight.id != CalendarSyncJob.id,
+                        in_flight.status == "IN_PROGRESS",
+                        self._lease_live(in_flight, now)
+                    )
                 )
-                .with_for_update(skip_locked=True)
-                .limit(10)
+                .order_by(CalendarSyncJob.created_at)
+                .with_for_update(of=CalendarSyncJob, skip_locked=True)
+                .limit(limit)
                 .all()
             )
-            for job in jobs:
+            lease_expires_at = now + timedelta(seconds=self._lease_seconds)
+            for job, _ in rows:
+                if job.status == "IN_PROGRESS":
+                    logger.warning(f"Reclaiming calendar sync job {job.id}: lease of {job.worker_id} expired")
                 job.status = "IN_PROGRESS"
                 job.attempts += 1
-                db.add(job)
+                job.worker_id = self._worker_id
+                job.lease_expires_at = lease_expires_at
             db.commit()
+            return [(job.id, doctor_email) for job, doctor_email in rows]
         finally:
             db.close()
 
-        for job in jobs:
-            self._process_job(job.id)
+    def _lease_expired(self, job, now: datetime):
+        """SQL condition: job's lease has expired. Jobs claimed before leases existed expire by updated_at."""
+        return or_(
+            job.lease_expires_at < now,
+            and_(job.lease_expires_at.is_(None), job.updated_at < now - timedelta(seconds=self._lease_seconds))
+        )
+
+    def _lease_live(self, job, now: datetime):
+        """SQL condition: job's lease has not expired (spelled out so NULL leases compare cleanly)."""
+        return or_(
+            job.lease_expires_at >= now,
+            and_(job.lease_expires_at.is_(None), job.updated_at >= now - timedelta(seconds=self._lease_seconds))
+        )
+
+    def _renew_leases(self) -> None:
+        """Extend the leases of jobs this worker holds, at most every third of a lease."""
+        if time.monotonic() < self._next_lease_renewal:
+            return
+        self._next_lease_renewal = time.monotonic() + self._lease_seconds / 3
+        with self._queue_lock:
+            if not self._queued:
+                return
+        db = SessionLocal()
+        try:
+            db.query(CalendarSyncJob).filter(
+                CalendarSyncJob.worker_id == self._worker_id,
+                CalendarSyncJob.status == "IN_PROGRESS"
+            ).update(
+                {CalendarSyncJob.lease_expires_at: datetime.now(timezone.utc) + timedelta(seconds=self._lease_seconds)},
+                synchronize_session=False
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Failed to renew calendar sync job leases: {e}")
+        finally:
+            db.close()
+
+    def _drain_doctor(self, doctor_email: str) -> None:
+        """
+        Process one doctor's queued jobs in order on a pool thread.
+        Several queued jobs go to Google as one batch request.
+        """
+        while not self._stop_event.is_set():
+            with self._queue_lock:
+                queue = self._doctor_queues.get(doctor_email)
+                if not queue:
+                    self._doctor_queues.pop(doctor_email, None)
+                    return
+                job_ids = [queue.popleft() for _ in range(min(len(queue), BATCH_MAX_OPERATIONS))]
+            # Reschedule instead of blocking a pool thread while the Google budget refills
+            delay = google_rate_limiter.delay(self._calendar_service.quota_user(doctor_email), len(job_ids))
+            if delay > 0:
+                self._defer_doctor(doctor_email, job_ids, delay)
+                return
+            try:
+                if len(job_ids) == 1:
+                    self._process_job(job_ids[0])
+                else:
+                    self._process_job_batch(doctor_email, job_ids)
+            except Exception as e:
+                logger.error(f"Calendar sync jobs {job_ids} crashed: {e}")
+            finally:
+                with self._queue_lock:
+                    self._queued -= len(job_ids)
+                self._wake_event.set()
+
+    def _defer_doctor(self, doctor_email: str, job_ids: List, delay: float) -> None:
+        """Return a rate-limited doctor's claimed jobs to PENDING, due once the budget allows."""
+        with self._queue_lock:
+            queue = self._doctor_queues.pop(doctor_email, None) or ()
+            job_ids = list(job_ids) + list(queue)
+            self._queued -= len(job_ids)
+        google_rate_limiter.record_deferral()
+        logger.info(f"Google API budget exhausted for {doctor_email}; deferring {len(job_ids)} job(s) by {delay:.1f}s")
+        self._release_jobs(job_ids, datetime.now(timezone.utc) + timedelta(seconds=delay))
+        self._wake_event.set()
+
+    def _release_queued_jobs(self) -> None:
+        """Return claimed but unstarted jobs to PENDING on shutdown."""
+        with self._queue_lock:
+            job_ids = [job_id for queue in self._doctor_queues.values() for job_id in queue]
+            self._doctor_queues.clear()
+            self._queued = 0
+        self._release_jobs(job_ids)
+
+    def _release_jobs(self, job_ids: List, next_attempt_at: Optional[datetime] = None) -> None:
+        """Set claimed jobs back to PENDING without counting the claim as an attempt."""
+        if not job_ids:
+            return
+        values = {
+            CalendarSyncJob.status: "PENDING",
+            CalendarSyncJob.attempts: CalendarSyncJob.attempts - 1,
+            CalendarSyncJob.worker_id: None,
+            CalendarSyncJob.lease_expires_at: None
+        }
+        if next_attempt_at is not None:
+            values[CalendarSyncJob.next_attempt_at] = next_attempt_at
+        db = SessionLocal()
+        try:
+            db.query(CalendarSyncJob).filter(
+                CalendarSyncJob.id.in_(job_ids),
+                CalendarSyncJob.status == "IN_PROGRESS"
+            ).update(values, synchronize_session=False)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.warning(f"Failed to release {len(job_ids)} claimed calendar sync jobs: {e}")
+        finally:
+            db.close()
 
     def _calendar_sync_table_available(self) -> bool:
         db = SessionLocal()
@@ -205,12 +596,7 @@ class CalendarSyncQueue:
 
                 patient = db.query(Patient).filter(Patient.id == appointment.patient_id).first()
                 if not patient:
-                    job.status = "FAILED"
-                    job.last_error = "Patient not found"
-                    appointment.calendar_sync_status = "FAILED"
-                    appointment.calendar_sync_last_error = job.last_error
-                    appointment.calendar_sync_attempts = job.attempts
-                    appointment.calendar_sync_next_attempt_at = None
+                    self._fail_missing_patient(job, appointment)
                     db.commit()
                     return
 
@@ -226,11 +612,7 @@ class CalendarSyncQueue:
                     )
                     if event_id:
                         appointment.google_calendar_event_id = event_id
-                        appointment.calendar_sync_status = "SYNCED"
-                        appointment.calendar_sync_attempts = job.attempts
-                        appointment.calendar_sync_next_attempt_at = None
-                        appointment.calendar_sync_last_error = None
-                        job.status = "COMPLETED"
+                        self._mark_synced(job, appointment)
                         db.commit()
                         return
                     job.last_error = self._calendar_service.last_error or "Calendar event creation failed"
@@ -249,11 +631,7 @@ class CalendarSyncQueue:
                         # If update_event returned a new event ID (old event was deleted), update DB
                         if isinstance(result, str):
                             appointment.google_calendar_event_id = result
-                        appointment.calendar_sync_status = "SYNCED"
-                        appointment.calendar_sync_attempts = job.attempts
-                        appointment.calendar_sync_next_attempt_at = None
-                        appointment.calendar_sync_last_error = None
-                        job.status = "COMPLETED"
+                        self._mark_synced(job, appointment)
                         db.commit()
                         return
                     job.last_error = self._calendar_service.last_error or "Calendar event update failed"
@@ -269,28 +647,12 @@ class CalendarSyncQueue:
                 else:
                     deleted = True  # No event to delete
                 if deleted:
-                    appointment.calendar_sync_status = "SYNCED"
-                    appointment.calendar_sync_attempts = job.attempts
-                    appointment.calendar_sync_next_attempt_at = None
-                    appointment.calendar_sync_last_error = None
-                    job.status = "COMPLETED"
+                    self._mark_synced(job, appointment)
                     db.commit()
                     return
                 job.last_error = self._calendar_service.last_error or "Calendar event delete failed"
 
-            # Retry or fail
-            job.status = "PENDING"
-            if not job.last_error:
-                job.last_error = "Calendar sync failed"
-            appointment.calendar_sync_last_error = job.last_error
-            appointment.calendar_sync_attempts = job.attempts
-            job.next_attempt_at = datetime.now(timezone.utc) + self._retry_delay(job.attempts)
-            appointment.calendar_sync_next_attempt_at = job.next_attempt_at
-            if job.attempts >= self._max_retries:
-                job.status = "FAILED"
-                appointment.calendar_sync_status = "FAILED"
-                appointment.calendar_sync_attempts = job.attempts
-                appointment.calendar_sync_next_attempt_at = None
+            self._schedule_retry(job, appointment)
             db.commit()
         except Exception as e:
             db.rollback()
@@ -317,6 +679,150 @@ class CalendarSyncQueue:
         finally:
             db.close()
 
+    def _process_job_batch(self, doctor_email: str, job_ids: List[UUID]) -> None:
+        """
+        Process one doctor's jobs with a single Google batch request.
+
+        Outcomes map back to each CalendarSyncJob and Appointment exactly as in
+        _process_job; failed items follow the usual retry and backoff. Items
+        needing the single-job path run afterwards, in order: a later job for
+        an appointment already in this batch, and an update whose event was
+        deleted in Google (update_event recreates it).
+        """
+        deferred: List[UUID] = []
+        db = SessionLocal()
+        try:
+            jobs_by_id = {
+                job.id: job
+                for job in db.query(CalendarSyncJob).filter(CalendarSyncJob.id.in_(job_ids)).all()
+            }
+            jobs = [jobs_by_id[job_id] for job_id in job_ids if job_id in jobs_by_id]
+            appointments = {
+                appointment.id: appointment
+                for appointment in db.query(Appointment).filter(
+                    Appointment.id.in_({job.appointment_id for job in jobs})
+                ).all()
+            }
+            patients = {
+                patient.id: patient
+                for patient in db.query(Patient).filter(
+                    Patient.id.in_({appointment.patient_id for appointment in appointments.values()})
+                ).all()
+            }
+
+            batched: List[Tuple[CalendarSyncJob, Appointment, str]] = []
+            operations: List[Tuple[str, dict]] = []
+            seen_appointments = set()
+            for job in jobs:
+                appointment = appointments.get(job.appointment_id)
+                if not appointment:
+                    job.status = "FAILED"
+                    job.last_error = "Appointment not found"
+                    continue
+                if deferred or appointment.id in seen_appointments:
+                    # Keep per-appointment (and per-doctor) order behind this batch
+                    deferred.append(job.id)
+                    continue
+                seen_appointments.add(appointment.id)
+
+                if job.action in {"CREATE", "UPDATE"}:
+                    if appointment.status == AppointmentStatus.CANCELLED:
+                        job.status = "COMPLETED"
+                        appointment.calendar_sync_status = "SYNCED"
+                        appointment.calendar_sync_attempts = job.attempts
+                        continue
+                    patient = patients.get(appointment.patient_id)
+                    if not patient:
+                        self._fail_missing_patient(job, appointment)
+                        continue
+                    body = GoogleCalendarService.build_event_body(
+                        patient_name=patient.name,
+                        appointment_date=appointment.date,
+                        start_time=appointment.start_time,
+                        end_time=appointment.end_time,
+                        description=f"Appointment with {patient.name}",
+                        timezone_name=appointment.timezone
+                    )
+                    if appointment.google_calendar_event_id:
+                        operations.append(("patch", {"eventId": appointment.google_calendar_event_id, "body": body}))
+                    else:
+                        operations.append(("insert", {"body": body}))
+                elif job.action == "DELETE":
+                    if not appointment.google_calendar_event_id:
+                        self._mark_synced(job, appointment)  # No event to delete
+                        continue
+                    operations.append(("delete", {"eventId": appointment.google_calendar_event_id}))
+                else:
+                    continue
+                batched.append((job, appointment, operations[-1][0]))
+
+            if operations:
+                try:
+                    results = self._calendar_service.execute_batch(doctor_email, operations)
+                except Exception as e:
+                    results = [(None, e)] * len(operations)
+
+                recreate: List[UUID] = []
+                for (job, appointment, method), (response, error) in zip(batched, results):
+                    if error is None and method == "insert" and not (response or {}).get("id"):
+                        # Without the event id later updates and deletes cannot reach it
+                        error = RuntimeError("Insert returned no event id")
+                    status = getattr(getattr(error, "resp", None), "status", None)
+                    if error is None:
+                        if method == "insert":
+                            appointment.google_calendar_event_id = response["id"]
+                        self._mark_synced(job, appointment)
+                    elif method == "delete" and status in {404, 410}:
+                        self._mark_synced(job, appointment)  # Already deleted
+                    elif method == "patch" and status in {404, 410}:
+                        recreate.append(job.id)
+                    else:
+                        job.last_error = f"Google API error: {error}"[:500]
+                        self._schedule_retry(job, appointment)
+                deferred = recreate + deferred
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Calendar sync batch for {doctor_email} failed, processing jobs individually: {e}")
+            deferred = list(job_ids)
+        finally:
+            db.close()
+
+        for job_id in deferred:
+            self._process_job(job_id)
+
+    @staticmethod
+    def _mark_synced(job: CalendarSyncJob, appointment: Appointment) -> None:
+        appointment.calendar_sync_status = "SYNCED"
+        appointment.calendar_sync_attempts = job.attempts
+        appointment.calendar_sync_next_attempt_at = None
+        appointment.calendar_sync_last_error = None
+        job.status = "COMPLETED"
+
+    @staticmethod
+    def _fail_missing_patient(job: CalendarSyncJob, appointment: Appointment) -> None:
+        job.status = "FAILED"
+        job.last_error = "Patient not found"
+        appointment.calendar_sync_status = "FAILED"
+        appointment.calendar_sync_last_error = job.last_error
+        appointment.calendar_sync_attempts = job.attempts
+        appointment.calendar_sync_next_attempt_at = None
+
+    def _schedule_retry(self, job: CalendarSyncJob, appointment: Appointment) -> None:
+        """Return a failed job to PENDING with backoff, or mark it FAILED after max retries."""
+        job.status = "PENDING"
+        if not job.last_error:
+            job.last_error = "Calendar sync failed"
+        appointment.calendar_sync_last_error = job.last_error
+        appointment.calendar_sync_attempts = job.attempts
+        job.next_attempt_at = datetime.now(timezone.utc) + self._retry_delay(job.attempts)
+        appointment.calendar_sync_next_attempt_at = job.next_attempt_at
+        if job.attempts >= self._max_retries:
+            job.status = "FAILED"
+            appointment.calendar_sync_status = "FAILED"
+            appointment.calendar_sync_attempts = job.attempts
+            appointment.calendar_sync_next_attempt_at = None
+
     def _retry_delay(self, attempts: int) -> timedelta:
         delay = self._retry_base * (2 ** max(attempts - 1, 0))
         return timedelta(seconds=delay)
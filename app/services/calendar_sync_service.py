@@ -2,21 +2,49 @@
 Calendar Sync Service - syncs changes between Google Calendar and Database.
 Handles bidirectional synchronization with conflict resolution.
 """
-from datetime import datetime, date, time, timezone
+import asyncio
+from datetime import datetime, date, time, timedelta, timezone
+from googleapiclient.errors import HttpError
+from sqlalchemy import inspect
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional, Set, Tuple
 import logging
 
 from app.services.google_calendar_service import GoogleCalendarService
-from app.services.availability_service import AvailabilityService
+from app.services.availability_service import AvailabilityService, SlotConflictIndex
+from app.services.availability_cache import availability_cache
+from app.services.availability_materializer import availability_materializer
 from app.models.appointment import Appointment, AppointmentStatus, AppointmentSource
+from app.models.calendar_sync_state import CalendarSyncState
 from app.models.doctor import Doctor
 from app.models.patient import Patient
 from app.config import settings
+from app.utils.advisory_locks import lock_doctor_days
 from app.utils.datetime_utils import to_utc
 
 logger = logging.getLogger(__name__)
 
+# Postgres lock_not_available, raised by FOR UPDATE NOWAIT
+LOCK_NOT_AVAILABLE = "55P03"
+
+# Events per events.list page (Google allows up to 2500)
+EVENTS_PAGE_SIZE = 250
+
+# Only the event fields the sync reads, to keep pages small
+EVENTS_LIST_FIELDS = "nextPageToken,nextSyncToken,items(id,etag,updated,status,summary,start,end)"
+
+
+class CalendarDiff(NamedTuple):
+    """Changes found by CalendarSyncService._diff_calendar."""
+    modified_events: List[Tuple[Dict, Appointment]]
+    new_events: List[Dict]
+    deleted: List[Appointment]
+    appointments: List[Appointment]  # Every appointment loaded for the diff
+    unchanged: int
+    next_sync_token: Optional[str]
+
 
 class CalendarSyncService:
     """Service for bidirectional calendar synchronization."""
@@ -28,17 +56,25 @@ class CalendarSyncService:
     async def sync_calendar_to_db(
         self,
         doctor_email: str,
-        db: Session
-    ) -> Dict:
+        db: Session,
+        wait: bool = True
+    ) -> Optional[Dict]:
         """
         Sync Google Calendar events to database.
         Called when webhook receives notification.
+
+        With wait=False the sync is skipped, returning None, when another
+        session is already syncing this doctor, instead of blocking on it.
         
         Strategy:
-        1. Fetch all upcoming events from Google Calendar
-        2. Compare with database appointments
-        3. Identify: new, modified, deleted events
-        4. Update database accordingly with conflict resolution
+        1. Stream the events changed since the doctor's stored sync token
+           (every event on the first sync, or after Google answers 410 Gone;
+           see _list_full_calendar for what that costs)
+        2. Compare each page with the matching database appointments,
+           skipping events whose etag matches the one stored at the last import
+        3. Identify: new (within MAX_AVAILABILITY_DAYS), modified, deleted events
+        4. Update database accordingly with conflict resolution, storing the
+           new sync token in the same transaction
         """
         logger.info(f"Starting calendar sync for {doctor_email}")
         
@@ -46,100 +82,371 @@ class CalendarSyncService:
         doctor = db.query(Doctor).filter(Doctor.email == doctor_email).first()
         if not doctor:
             raise ValueError(f"Doctor with email {doctor_email} not found")
+
+        # Serializes syncs per doctor until commit, so each token is consumed once
+        sync_state = self._lock_sync_state(db, doctor.email, nowait=not wait)
+        if sync_state is None:
+            logger.info(f"Calendar sync for {doctor_email} skipped: another sync is running")
+            return None
         
-        # 1. Fetch events from Google Calendar
-        calendar_events = await self._fetch_calendar_events(doctor_email)
-        
-        # 2. Fetch appointments from database
-        db_appointments = db.query(Appointment).filter(
-            Appointment.doctor_email == doctor.email,
-            Appointment.date >= date.today(),
-            Appointment.status.in_([AppointmentStatus.BOOKED, AppointmentStatus.RESCHEDULED])
-        ).all()
-        
-        # 3. Create lookup maps
-        calendar_map = {
-            event['id']: event 
-            for event in calendar_events 
-            if event.get('id')
-        }
-        
-        db_map = {
-            apt.google_calendar_event_id: apt 
-            for apt in db_appointments 
-            if apt.google_calendar_event_id
-        }
+        # 1-3. Stream changed events from Google Calendar and diff each page
+        # against the matching appointments as it arrives
+        full_sync = not sync_state.sync_token
+        if not full_sync:
+            try:
+                diff = await self._diff_calendar(
+                    db, doctor, self._iter_calendar_pages(doctor.email, sync_state.sync_token)
+                )
+            except HttpError as e:
+                if getattr(e.resp, "status", None) != 410:
+                    raise
+                logger.warning(f"Sync token for {doctor_email} expired; running a full resync")
+                full_sync = True
+        if full_sync:
+            last_synced_at = sync_state.last_synced_at
+            pages = await self._list_full_calendar(db, doctor_email)
+            sync_state = self._lock_sync_state(db, doctor_email, nowait=not wait)
+            if sync_state is None:
+                logger.info(f"Calendar sync for {doctor_email} skipped: another sync is running")
+                return None
+            if sync_state.last_synced_at != last_synced_at:
+                # Another sync committed while we listed; this listing may predate its
+                # imports, so continue incrementally from the token it stored
+                db.rollback()
+                logger.info(f"Calendar sync for {doctor_email} superseded during full listing; retrying")
+                return await self.sync_calendar_to_db(doctor_email, db, wait)
+            diff = await self._diff_calendar(db, doctor, self._replay_pages(pages), full_sync=True)
         
+        original_days = {apt.id: apt.date for apt in diff.appointments}
+
         # 4. Process changes
         stats = {
             'updated': 0,
             'created': 0,
             'deleted': 0,
             'conflicts': 0,
-            'skipped': 0
+            'skipped': 0,
+            'unchanged': diff.unchanged
         }
+        now = datetime.now(timezone.utc)
+        modified_events = diff.modified_events
+        new_events = diff.new_events
+
+        # Serialize with bookings on every doctor-day this import writes to
+        import_days = self._import_days(doctor.email, modified_events, new_events)
+        lock_doctor_days(db, import_days)
+
+        # Leaves and appointments for those days are loaded once; every
+        # conflict check below is answered in memory and all writes go out
+        # in the commit's single flush
+        slot_index = self._load_conflict_index(db, doctor, {day for _, day in import_days})
+        walkin_patients: Dict[str, Patient] = {}
+
+        for calendar_event, db_appointment in modified_events:
+            result = await self._update_appointment_from_calendar(
+                calendar_event,
+                db_appointment,
+                slot_index,
+                db
+            )
+            stats[result] += 1
+
+        for calendar_event in new_events:
+            result = await self._create_appointment_from_calendar(
+                calendar_event,
+                slot_index,
+                db,
+                walkin_patients
+            )
+            stats[result] += 1
         
-        # Find modified events (in both calendar and DB)
-        for event_id, calendar_event in calendar_map.items():
-            if event_id in db_map:
-                # Event exists in both - check if modified
-                db_appointment = db_map[event_id]
-                if await self._is_event_modified(calendar_event, db_appointment):
-                    result = await self._update_appointment_from_calendar(
-                        calendar_event,
-                        db_appointment,
-                        doctor,
-                        db
-                    )
-                    stats[result] += 1
-            else:
-                # Event in calendar but not in DB - doctor created new event
-                result = await self._create_appointment_from_calendar(
-                    calendar_event,
-                    doctor,
-                    db
-                )
-                stats[result] += 1
-        
-        # Find deleted events (in DB but not in calendar)
-        for event_id, db_appointment in db_map.items():
-            if event_id not in calendar_map:
-                # Event was deleted from calendar
-                result = await self._handle_deleted_event(db_appointment, db)
-                stats[result] += 1
+        for db_appointment in diff.deleted:
+            # Event was deleted from calendar
+            result = await self._handle_deleted_event(db_appointment, db)
+            stats[result] += 1
         
+        sync_state.sync_token = diff.next_sync_token
+        sync_state.last_synced_at = now
+        if full_sync:
+            sync_state.last_full_sync_at = now
+
+        changed_days = self._changed_days(db, doctor.email, diff.appointments, original_days)
+        availability_materializer.refresh_days(db, changed_days)
         db.commit()
+        availability_cache.invalidate_days(changed_days)
+        stats['full_sync'] = full_sync
         logger.info(f"Calendar sync completed for {doctor_email}: {stats}")
         return stats
-    
-    async def _fetch_calendar_events(
+
+    def _lock_sync_state(
         self,
-        doctor_email: str
-    ) -> List[Dict]:
-        """Fetch all upcoming events from Google Calendar."""
+        db: Session,
+        doctor_email: str,
+        nowait: bool = False
+    ) -> Optional[CalendarSyncState]:
+        """
+        Return the doctor's sync state row, created if missing and locked FOR UPDATE.
+        With nowait, returns None (transaction rolled back) if another sync holds it.
+        """
+        db.execute(
+            pg_insert(CalendarSyncState)
+            .values(doctor_email=doctor_email)
+            .on_conflict_do_nothing(index_elements=[CalendarSyncState.doctor_email])
+        )
         try:
-            service = self.calendar_service._get_service(doctor_email)
-            
-            # Fetch events from today onwards
-            now = datetime.now(timezone.utc).isoformat()
-            
-            events_result = self.calendar_service._execute_with_retry(
-                lambda: service.events().list(
-                    calendarId=doctor_email,
-                    timeMin=now,
-                    maxResults=100,  # Adjust as needed
-                    singleEvents=True,
-                    orderBy='startTime'
-                ).execute()
+            return (
+                db.query(CalendarSyncState)
+                .filter(CalendarSyncState.doctor_email == doctor_email)
+                .with_for_update(nowait=nowait)
+                .one()
             )
-            
-            events = events_result.get('items', [])
-            logger.info(f"Fetched {len(events)} events from {doctor_email}")
-            return events
-            
-        except Exception as e:
-            logger.error(f"Error fetching calendar events: {str(e)}")
-            raise
+        except OperationalError as e:
+            if not nowait or getattr(e.orig, "sqlstate", None) != LOCK_NOT_AVAILABLE:
+                raise
+            db.rollback()
+            return None
+
+    def _load_conflict_index(self, db: Session, doctor: Doctor, dates: Set[date]) -> SlotConflictIndex:
+        return self.availability_service.load_conflict_index(db, doctor, dates)
+
+    def _get_walkin_patient(
+        self,
+        db: Session,
+        doctor: Doctor,
+        walkin_patients: Dict[str, Patient]
+    ) -> Patient:
+        """Placeholder patient for doctor-created events, looked up once per sync."""
+        placeholder_patient = walkin_patients.get(doctor.email)
+        if placeholder_patient is None:
+            placeholder_mobile = f"WALKIN-{doctor.email}"
+            placeholder_patient = db.query(Patient).filter(
+                Patient.mobile_number == placeholder_mobile
+            ).first()
+            if not placeholder_patient:
+                placeholder_patient = Patient(
+                    name="Walk-in Patient",
+                    mobile_number=placeholder_mobile
+                )
+                db.add(placeholder_patient)
+            walkin_patients[doctor.email] = placeholder_patient
+        return placeholder_patient
+
+    @staticmethod
+    def _event_fingerprint(calendar_event: Dict) -> Optional[str]:
+        """Version of a Google event: its etag, else its updated timestamp."""
+        return calendar_event.get('etag') or calendar_event.get('updated')
+
+    async def _list_full_calendar(self, db: Session, doctor_email: str) -> List[Dict]:
+        """
+        List every event in the doctor's calendar for a full sync.
+
+        Sync tokens rule out timeMin, so a full listing spans the calendar's
+        whole history: its pages, time and memory grow with the calendar's
+        lifetime, not with MAX_AVAILABILITY_DAYS. The transaction (and the
+        sync-state row lock) is released first so nothing is held open while
+        paging; the caller locks the row again before diffing.
+        """
+        db.rollback()
+        return [page async for page in self._iter_calendar_pages(doctor_email)]
+
+    @staticmethod
+    async def _replay_pages(pages: List[Dict]) -> AsyncIterator[Dict]:
+        for page in pages:
+            yield page
+
+    async def _diff_calendar(
+        self,
+        db: Session,
+        doctor: Doctor,
+        pages: AsyncIterator[Dict],
+        full_sync: bool = False
+    ) -> CalendarDiff:
+        """
+        Diff events.list pages of the doctor's Google Calendar against the
+        database page by page.
+
+        Only events that need action are kept; the rest of each page is
+        dropped once compared. With full_sync the pages list every event and
+        appointments whose event is no longer listed count as deleted.
+
+        Raises:
+            HttpError: 410 when the pages' sync token has expired and a full sync is needed
+        """
+        now = datetime.now(timezone.utc)
+        horizon = now + timedelta(days=settings.MAX_AVAILABILITY_DAYS)
+        appointment_query = db.query(Appointment).filter(
+            Appointment.doctor_email == doctor.email,
+            Appointment.date >= date.today(),
+            Appointment.status.in_([AppointmentStatus.BOOKED, AppointmentStatus.RESCHEDULED])
+        )
+        db_map: Dict[str, Appointment] = {}
+        if full_sync:
+            db_map = {
+                apt.google_calendar_event_id: apt
+                for apt in appointment_query.all()
+                if apt.google_calendar_event_id
+            }
+
+        listed_ids: Set[str] = set()
+        deleted: Dict[str, Appointment] = {}
+        modified_events: List[Tuple[Dict, Appointment]] = []
+        new_events: List[Dict] = []
+        unchanged = 0
+        next_sync_token = None
+        async for page in pages:
+            events = [event for event in page.get('items', []) if event.get('id')]
+            if not full_sync and events:
+                page_appointments = appointment_query.filter(
+                    Appointment.google_calendar_event_id.in_([event['id'] for event in events])
+                ).all()
+                db_map.update({apt.google_calendar_event_id: apt for apt in page_appointments})
+
+            for calendar_event in events:
+                event_id = calendar_event['id']
+                db_appointment = db_map.get(event_id)
+                # Incremental results include deleted events with status "cancelled"
+                if calendar_event.get('status') == 'cancelled':
+                    if db_appointment is not None:
+                        deleted[event_id] = db_appointment
+                    continue
+                listed_ids.add(event_id)
+                if db_appointment is not None:
+                    # Event exists in both - check if modified
+                    fingerprint = self._event_fingerprint(calendar_event)
+                    if fingerprint and fingerprint == db_appointment.google_calendar_event_etag:
+                        unchanged += 1
+                    elif await self._is_event_modified(calendar_event, db_appointment):
+                        modified_events.append((calendar_event, db_appointment))
+                    else:
+                        # Same times (e.g. our own write, or a summary edit); skip it next time
+                        db_appointment.google_calendar_event_etag = fingerprint
+                elif self._in_import_window(calendar_event, now, horizon):
+                    # Event in calendar but not in DB - doctor created new event
+                    new_events.append(calendar_event)
+            next_sync_token = page.get('nextSyncToken')
+
+        if full_sync:
+            # Listed nowhere in the full listing: deleted from the calendar
+            for event_id, db_appointment in db_map.items():
+                if event_id not in listed_ids:
+                    deleted.setdefault(event_id, db_appointment)
+
+        return CalendarDiff(
+            modified_events=modified_events,
+            new_events=new_events,
+            deleted=list(deleted.values()),
+            appointments=list(db_map.values()),
+            unchanged=unchanged,
+            next_sync_token=next_sync_token
+        )
+
+    @staticmethod
+    def _in_import_window(calendar_event: Dict, now: datetime, horizon: datetime) -> bool:
+        """
+        True if the event has not ended and starts before horizon (all-day
+        events are left to the importer).
+        """
+        start = calendar_event.get('start', {}).get('dateTime')
+        end = calendar_event.get('end', {}).get('dateTime')
+        if not start or not end:
+            return True
+        return (
+            datetime.fromisoformat(end.replace('Z', '+00:00')) > now and
+            datetime.fromisoformat(start.replace('Z', '+00:00')) < horizon
+        )
+    
+    def _import_days(
+        self,
+        doctor_email: str,
+        modified_events: List[Tuple[Dict, Appointment]],
+        new_events: List[Dict]
+    ) -> Set[Tuple[str, date]]:
+        """Doctor-days an import may write to: old and new dates of moved events, dates of new events."""
+        days = {(doctor_email, apt.date) for _, apt in modified_events}
+        for calendar_event in [event for event, _ in modified_events] + new_events:
+            start = calendar_event.get('start', {}).get('dateTime')
+            if start:
+                days.add((doctor_email, datetime.fromisoformat(start.replace('Z', '+00:00')).date()))
+        return days
+
+    def _changed_days(
+        self,
+        db: Session,
+        doctor_email: str,
+        db_appointments: List[Appointment],
+        original_days: Dict
+    ) -> Set[Tuple[str, date]]:
+        """Doctor-days touched by pending appointment changes in this session."""
+        changed = set()
+        for apt in db_appointments:
+            if apt in db.dirty and self._slot_changed(apt):
+                changed.add((doctor_email, original_days[apt.id]))
+                changed.add((doctor_email, apt.date))
+        for obj in db.new:
+            if isinstance(obj, Appointment):
+                changed.add((obj.doctor_email, obj.date))
+        return changed
+
+    @staticmethod
+    def _slot_changed(apt: Appointment) -> bool:
+        """True if a pending change moves or cancels apt (not just a new etag)."""
+        state = inspect(apt)
+        return any(
+            state.attrs[key].history.has_changes()
+            for key in ('date', 'start_time', 'end_time', 'status')
+        )
+
+    async def _iter_calendar_pages(
+        self,
+        doctor_email: str,
+        sync_token: Optional[str] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        Stream events.list pages from Google Calendar, following pageToken.
+
+        Without sync_token this lists every event and is the full sync; with it,
+        only events changed since that token, deletions included. The last page
+        carries nextSyncToken.
+
+        Raises:
+            HttpError: 410 when sync_token has expired and a full sync is needed
+        """
+        service = self.calendar_service._get_service(doctor_email)
+
+        # timeMin/timeMax and orderBy cannot be combined with sync tokens;
+        # the time window is applied by the caller instead
+        fetched = 0
+        page_token = None
+        while True:
+            try:
+                # Google calls block; run them off the event loop so concurrent syncs overlap
+                page = await asyncio.to_thread(
+                    self.calendar_service._execute_with_retry,
+                    lambda: service.events().list(
+                        calendarId=doctor_email,
+                        syncToken=sync_token,
+                        pageToken=page_token,
+                        maxResults=EVENTS_PAGE_SIZE,
+                        singleEvents=True,
+                        fields=EVENTS_LIST_FIELDS
+                    ).execute(),
+                    doctor_email
+                )
+            except HttpError as e:
+                if not (sync_token and getattr(e.resp, "status", None) == 410):
+                    logger.error(f"Error fetching calendar events: {str(e)}")
+                raise
+            except Exception as e:
+                logger.error(f"Error fetching calendar events: {str(e)}")
+                raise
+            fetched += len(page.get('items', []))
+            yield page
+            page_token = page.get('nextPageToken')
+            if not page_token:
+                break
+
+        mode = "changed" if sync_token else "total"
+        logger.info(f"Fetched {fetched} {mode} events from {doctor_email}")
     
     async def _is_event_modified(
         self,
@@ -177,10 +484,11 @@ class CalendarSyncService:
         self,
         calendar_event: Dict,
         db_appointment: Appointment,
-        doctor: Doctor,
+        slot_index: SlotConflictIndex,
         db: Session
     ) -> str:
         """Update database appointment with calendar event data."""
+        doctor = slot_index.doctor
         try:
             # Parse new times from calendar
             cal_start_str = calendar_event['start'].get('dateTime')
@@ -195,9 +503,7 @@ class CalendarSyncService:
             
             # CONFLICT RESOLUTION: Check if new slot is available
             # Temporarily exclude current appointment from availability check
-            is_available = self.availability_service.is_slot_available(
-                db=db,
-                doctor_email=doctor.email,
+            is_available = slot_index.is_slot_available(
                 slot_date=new_date,
                 slot_start_time=new_start_time,
                 slot_end_time=new_end_time,
@@ -231,6 +537,8 @@ class CalendarSyncService:
             db_appointment.status = AppointmentStatus.RESCHEDULED
             db_appointment.calendar_sync_status = "SYNCED"
             db_appointment.calendar_sync_last_error = None
+            db_appointment.google_calendar_event_etag = self._event_fingerprint(calendar_event)
+            slot_index.claim(new_date, new_start_time, new_end_time, db_appointment.id)
             
             logger.info(
                 f"Updated appointment {db_appointment.id} from calendar: "
@@ -246,13 +554,15 @@ class CalendarSyncService:
     async def _create_appointment_from_calendar(
         self,
         calendar_event: Dict,
-        doctor: Doctor,
-        db: Session
+        slot_index: SlotConflictIndex,
+        db: Session,
+        walkin_patients: Dict[str, Patient]
     ) -> str:
         """
         Create new appointment in DB from calendar event.
         This happens when doctor manually creates event in calendar.
         """
+        doctor = slot_index.doctor
         try:
             # Parse event details
             summary = calendar_event.get('summary', 'Manual Booking')
@@ -267,9 +577,7 @@ class CalendarSyncService:
             cal_end = datetime.fromisoformat(cal_end_str.replace('Z', '+00:00'))
             
             # Check if slot is available (conflict with AI/admin bookings)
-            is_available = self.availability_service.is_slot_available(
-                db=db,
-                doctor_email=doctor.email,
+            is_available = slot_index.is_slot_available(
                 slot_date=cal_start.date(),
                 slot_start_time=cal_start.time(),
                 slot_end_time=cal_end.time()
@@ -288,30 +596,19 @@ class CalendarSyncService:
                 return 'conflicts'
             
             # Create "placeholder" appointment for doctor-created events
-            # Get or create placeholder patient
-            placeholder_mobile = f"WALKIN-{doctor.email}"
-            placeholder_patient = db.query(Patient).filter(
-                Patient.mobile_number == placeholder_mobile
-            ).first()
-            
-            if not placeholder_patient:
-                placeholder_patient = Patient(
-                    name="Walk-in Patient",
-                    mobile_number=placeholder_mobile
-                )
-                db.add(placeholder_patient)
-                db.flush()
+            placeholder_patient = self._get_walkin_patient(db, doctor, walkin_patients)
             
-            # Create appointment
+            # Create appointment (the patient relationship fills patient_id at flush)
             appointment_tz = doctor.timezone or settings.DEFAULT_TIMEZONE
             appointment = Appointment(
                 doctor_email=doctor.email,
-                patient_id=placeholder_patient.id,
+                patient=placeholder_patient,
                 date=cal_start.date(),
                 start_time=cal_start.time(),
                 end_time=cal_end.time(),
                 status=AppointmentStatus.BOOKED,
                 google_calendar_event_id=calendar_event['id'],
+                google_calendar_event_etag=self._event_fingerprint(calendar_event),
                 source=AppointmentSource.ADMIN,  # Doctor created it manually
                 timezone=appointment_tz,
                 start_at_utc=to_utc(cal_start.date(), cal_start.time(), appointment_tz),
@@ -320,6 +617,7 @@ class CalendarSyncService:
             appointment.calendar_sync_status = "SYNCED"
             
             db.add(appointment)
+            slot_index.claim(cal_start.date(), cal_start.time(), cal_end.time())
             
             logger.info(
                 f"Created appointment from calendar event: "
@@ -365,7 +663,8 @@ class CalendarSyncService:
         """Revert calendar event to match database (conflict resolution)."""
         try:
             # Update calendar event to match DB
-            self.calendar_service.update_event(
+            await asyncio.to_thread(
+                self.calendar_service.update_event,
                 doctor_email=doctor_email,
                 event_id=event_id,
                 patient_name=db_appointment.patient.name,
@@ -388,7 +687,7 @@ class CalendarSyncService:
     ):
         """Delete event from calendar (conflict resolution)."""
         try:
-            self.calendar_service.delete_event(doctor_email, event_id)
+            await asyncio.to_thread(self.calendar_service.delete_event, doctor_email, event_id)
             logger.info(f"Deleted conflicting calendar event {event_id}")
         except Exception as e:
             logger.error(f"Error deleting calendar event: {str(e)}")
@@ -1,10 +1,21 @@
 """
 Calendar Watch Service - manages Google Calendar push notification channels.
+
+Watches are created with a randomly shortened lifetime (up to
+CALENDAR_WATCH_EXPIRATION_JITTER_HOURS) so channels set up together do not
+all come due in the same renewal run, and renewals run on a bounded thread
+pool. Webhook lookups of channel_id -> (doctor_email, token) are served from
+a per-process TTL cache, invalidated when this process renews or stops the
+channel.
 """
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+import random
 import threading
-import time
 import secrets
+import time
 from sqlalchemy.orm import Session
 import uuid
 import logging
@@ -16,14 +27,29 @@ from app.database import SessionLocal
 
 logger = logging.getLogger(__name__)
 
+# Watches are renewed once they expire within this window
+RENEW_BEFORE = timedelta(days=1)
+
 
 class CalendarWatchService:
     """Service for managing Google Calendar watch channels."""
     
-    def __init__(self):
+    def __init__(self, channel_cache_size: int = 10000):
         self.calendar_service = GoogleCalendarService()
         self._worker: threading.Thread | None = None
         self._stop_event = threading.Event()
+        self._channel_cache: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._channel_cache_size = channel_cache_size
+        self._lock = threading.Lock()
+        self._stats = {
+            "channel_cache_hits": 0,
+            "channel_cache_misses": 0,
+            "renewals": 0,
+            "renewal_failures": 0,
+            "expired_before_renewal": 0,
+            "last_renew_lag_seconds": 0.0,
+            "max_renew_lag_seconds": 0.0
+        }
 
     def start(self) -> None:
         if self._worker and self._worker.is_alive():
@@ -51,7 +77,7 @@ class CalendarWatchService:
                     db.close()
             except Exception as e:
                 logger.error(f"Calendar watch renewal worker error: {e}")
-            time.sleep(3600)
+            self._stop_event.wait(3600)
     
     def setup_watch_for_doctor(
         self,
@@ -82,20 +108,26 @@ class CalendarWatchService:
             token = secrets.token_urlsafe(32)
             
             # Create watch request
-            # Note: Google Calendar watches expire after max 7 days (604800000 ms)
+            # Note: Google Calendar watches expire after max 7 days (604800000 ms);
+            # the jitter spreads the renewals of watches created together
+            jitter = random.uniform(0, settings.CALENDAR_WATCH_EXPIRATION_JITTER_HOURS * 3600)
+            expiration = datetime.now(timezone.utc) + timedelta(days=7) - timedelta(seconds=jitter)
             body = {
                 'id': channel_id,
                 'type': 'web_hook',
                 'address': webhook_url,
                 'token': token,
-                'expiration': int((datetime.now(timezone.utc) + timedelta(days=7)).timestamp() * 1000)
+                'expiration': int(expiration.timestamp() * 1000)
             }
             
             # Execute watch request
-            watch_response = service.events().watch(
-                calendarId=doctor_email,
-                body=body
-            ).execute()
+            watch_response = self.calendar_service._execute_with_retry(
+                lambda: service.events().watch(
+                    calendarId=doctor_email,
+                    body=body
+                ).execute(),
+                doctor_email
+            )
             
             # Store watch info in database
             calendar_watch = CalendarWatch(
@@ -132,6 +164,10 @@ class CalendarWatchService:
     ) -> CalendarWatch:
         """
         Renew expiring watch channel.
+
+        The new channel is created before the old one is stopped, so no
+        notification is missed in between; if creating it fails the old
+        channel stays active.
         
         Args:
             watch: Existing CalendarWatch to renew
@@ -141,15 +177,15 @@ class CalendarWatchService:
             New CalendarWatch object
         """
         try:
-            # Stop old channel
-            self.stop_watch(watch, db)
-            
             # Create new watch
             new_watch = self.setup_watch_for_doctor(
                 watch.doctor_email,
                 db
             )
             
+            # Stop old channel
+            self.stop_watch(watch, db)
+            
             logger.info(f"Renewed watch for {watch.doctor_email}")
             return new_watch
             
@@ -169,16 +205,20 @@ class CalendarWatchService:
             watch: CalendarWatch to stop
             db: Database session
         """
+        self._invalidate_channel(watch.channel_id)
         try:
             service = self.calendar_service._get_service(watch.doctor_email)
             
             # Stop the channel
-            service.channels().stop(
-                body={
-                    'id': watch.channel_id,
-                    'resourceId': watch.resource_id
-                }
-            ).execute()
+            self.calendar_service._execute_with_retry(
+                lambda: service.channels().stop(
+                    body={
+                        'id': watch.channel_id,
+                        'resourceId': watch.resource_id
+                    }
+                ).execute(),
+                watch.doctor_email
+            )
             
             # Mark as inactive in DB
             watch.is_active = False
@@ -195,48 +235,116 @@ class CalendarWatchService:
     def renew_expiring_watches(self, db: Session):
         """
         Background job: Renew watches that are about to expire.
-        Run this daily via cron or background worker.
+        Runs hourly in the watch renewal worker, up to
+        CALENDAR_WATCH_RENEW_CONCURRENCY renewals at a time, each with its
+        own session.
         
         Args:
             db: Database session
         """
         # Find watches expiring in next 24 hours
-        expiring_soon = db.query(CalendarWatch).filter(
+        expiring_soon = db.query(CalendarWatch.id).filter(
             CalendarWatch.is_active == True,
-            CalendarWatch.expiration < datetime.now(timezone.utc) + timedelta(days=1)
+            CalendarWatch.expiration < datetime.now(timezone.utc) + RENEW_BEFORE
         ).all()
         
         logger.info(f"Found {len(expiring_soon)} watches expiring soon")
-        
-        for watch in expiring_soon:
+        if not expiring_soon:
+            return
+
+        workers = max(1, min(settings.CALENDAR_WATCH_RENEW_CONCURRENCY, len(expiring_soon)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="calendar-watch-renew") as pool:
+            results = pool.map(self._renew_watch_by_id, [row[0] for row in expiring_soon])
+            lags = [lag for lag in results if lag is not None]
+        if lags:
+            worst = round(max(lags), 1)
+            with self._lock:
+                self._stats["last_renew_lag_seconds"] = worst
+                self._stats["max_renew_lag_seconds"] = max(self._stats["max_renew_lag_seconds"], worst)
+
+    def _renew_watch_by_id(self, watch_id) -> Optional[float]:
+        """
+        Renew one watch in its own session.
+
+        Returns:
+            Renew lag in seconds (how long after entering the renewal window
+            it was renewed), or None if it was not renewed
+        """
+        db = SessionLocal()
+        try:
+            watch = db.get(CalendarWatch, watch_id)
+            if watch is None or not watch.is_active:
+                return None
+            now = datetime.now(timezone.utc)
+            lag = max(0.0, (now - (watch.expiration - RENEW_BEFORE)).total_seconds())
+            expired = watch.expiration <= now
+            doctor_email = watch.doctor_email
             try:
                 self.renew_watch(watch, db)
-                logger.info(f"✓ Renewed watch for {watch.doctor_email}")
+                logger.info(f"✓ Renewed watch for {doctor_email}")
             except Exception as e:
-                logger.error(f"✗ Failed to renew watch for {watch.doctor_email}: {e}")
-    
-    def get_channel_info(self, channel_id: str, db: Session) -> dict:
+                logger.error(f"✗ Failed to renew watch for {doctor_email}: {e}")
+                with self._lock:
+                    self._stats["renewal_failures"] += 1
+                return None
+            with self._lock:
+                self._stats["renewals"] += 1
+                if expired:
+                    self._stats["expired_before_renewal"] += 1
+            return lag
+        finally:
+            db.close()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(self._stats, channel_cache_size=len(self._channel_cache))
+
+    def get_channel_info(self, channel_id: str, db: Session) -> Optional[dict]:
         """
-        Retrieve channel info from database.
+        Retrieve channel info, from the TTL cache or the database.
+
+        Unknown channels are not cached: Google's first notification can
+        arrive before a new watch is committed.
 
         Args:
             channel_id: Google Calendar channel ID
             db: Database session
 
         Returns:
-            Dictionary with doctor_email, or None if not found
+            Dictionary with doctor_email and token, or None if not found
         """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._channel_cache.get(channel_id)
+            if entry is not None and entry[0] > now:
+                self._channel_cache.move_to_end(channel_id)
+                self._stats["channel_cache_hits"] += 1
+                return entry[1]
+            self._stats["channel_cache_misses"] += 1
+
         watch = db.query(CalendarWatch).filter(
             CalendarWatch.channel_id == channel_id,
             CalendarWatch.is_active == True
         ).first()
         
-        if watch:
-            return {
-                'doctor_email': watch.doctor_email,
-                'token': watch.token
-            }
-        return None
+        if not watch:
+            self._invalidate_channel(channel_id)
+            return None
+
+        channel_info = {
+            'doctor_email': watch.doctor_email,
+            'token': watch.token
+        }
+        with self._lock:
+            self._channel_cache[channel_id] = (now + settings.CALENDAR_WATCH_CHANNEL_CACHE_TTL_SECONDS, channel_info)
+            self._channel_cache.move_to_end(channel_id)
+            while len(self._channel_cache) > self._channel_cache_size:
+                self._channel_cache.popitem(last=False)
+        return channel_info
+
+    def _invalidate_channel(self, channel_id: str) -> None:
+        with self._lock:
+            self._channel_cache.pop(channel_id, None)
 
 
 calendar_watch_service = CalendarWatchService()
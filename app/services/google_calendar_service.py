@@ -3,18 +3,21 @@ Google Calendar Service - syncs appointments with Google Calendar.
 Google Calendar is ONLY a mirror of confirmed appointments.
 Never reads availability from Google Calendar.
 """
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from datetime import datetime, date, time, timezone
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 from app.config import settings
+from app.services.google_client_cache import google_client_cache
+from app.services.google_rate_limiter import google_rate_limiter
 import logging
 import time as time_module
 from zoneinfo import ZoneInfo
 
 logger = logging.getLogger(__name__)
 
+# Google's batch endpoint accepts at most 50 calls per request
+BATCH_MAX_OPERATIONS = 50
+
 
 class GoogleCalendarService:
     """Service for interacting with Google Calendar API."""
@@ -37,18 +40,9 @@ class GoogleCalendarService:
             Google Calendar service instance
         """
         try:
-            credentials = service_account.Credentials.from_service_account_file(
-                self.credentials_path,
-                scopes=['https://www.googleapis.com/auth/calendar']
-            )
-
-            if self._should_delegate(user_email):
-                delegated_credentials = credentials.with_subject(user_email)
-                logger.info(f"Using domain-wide delegation for {user_email}")
-                return build('calendar', 'v3', credentials=delegated_credentials)
-
-            logger.info(f"Using service account access for {user_email}")
-            return build('calendar', 'v3', credentials=credentials)
+            delegate = self._should_delegate(user_email)
+            # Built clients (credentials + parsed discovery doc) are cached per subject
+            return google_client_cache.get(user_email, delegate)
         except Exception as e:
             logger.error(f"Failed to create Google Calendar service for {user_email}: {str(e)}")
             raise
@@ -63,6 +57,12 @@ class GoogleCalendarService:
             return False
         return admin_domain == user_domain
 
+    def quota_user(self, user_email: str) -> str:
+        """Return the identity Google charges per-user quota to for calls on user_email's calendar."""
+        if self._should_delegate(user_email):
+            return user_email.lower()
+        return "service-account"
+
     def _extract_domain(self, email: Optional[str]) -> Optional[str]:
         """Extract domain portion from an email address."""
         if not email or "@" not in email:
@@ -73,6 +73,37 @@ class GoogleCalendarService:
         """Return True for consumer email domains without delegation support."""
         return domain in {"gmail.com", "googlemail.com"}
     
+    @staticmethod
+    def build_event_body(
+        patient_name: str,
+        appointment_date: date,
+        start_time: time,
+        end_time: time,
+        description: Optional[str] = None,
+        timezone_name: Optional[str] = None
+    ) -> dict:
+        """Build the summary, description, start and end fields of an appointment event."""
+        try:
+            tz = ZoneInfo(timezone_name) if timezone_name else timezone.utc
+        except Exception:
+            tz = timezone.utc
+        start_datetime = datetime.combine(appointment_date, start_time).replace(tzinfo=tz)
+        end_datetime = datetime.combine(appointment_date, end_time).replace(tzinfo=tz)
+
+        # Format for Google Calendar (RFC3339)
+        return {
+            'summary': f'Appointment: {patient_name}',
+            'description': description or f'Appointment with {patient_name}',
+            'start': {
+                'dateTime': start_datetime.isoformat(),
+                'timeZone': str(tz),
+            },
+            'end': {
+                'dateTime': end_datetime.isoformat(),
+                'timeZone': str(tz),
+            },
+        }
+
     def create_event(
         self,
         doctor_email: str,
@@ -101,32 +132,18 @@ class GoogleCalendarService:
         try:
             service = self._get_service(doctor_email)
             
-            try:
-                tz = ZoneInfo(timezone_name) if timezone_name else timezone.utc
-            except Exception:
-                tz = timezone.utc
-            start_datetime = datetime.combine(appointment_date, start_time).replace(tzinfo=tz)
-            end_datetime = datetime.combine(appointment_date, end_time).replace(tzinfo=tz)
-            
-            # Format for Google Calendar (RFC3339)
-            start_rfc3339 = start_datetime.isoformat()
-            end_rfc3339 = end_datetime.isoformat()
-            
-            event = {
-                'summary': f'Appointment: {patient_name}',
-                'description': description or f'Appointment with {patient_name}',
-                'start': {
-                    'dateTime': start_rfc3339,
-                    'timeZone': str(tz),
-                },
-                'end': {
-                    'dateTime': end_rfc3339,
-                    'timeZone': str(tz),
-                },
-            }
+            event = self.build_event_body(
+                patient_name=patient_name,
+                appointment_date=appointment_date,
+                start_time=start_time,
+                end_time=end_time,
+                description=description,
+                timezone_name=timezone_name
+            )
             
             event = self._execute_with_retry(
-                lambda: service.events().insert(calendarId=doctor_email, body=event).execute()
+                lambda: service.events().insert(calendarId=doctor_email, body=event).execute(),
+                doctor_email
             )
             
             logger.info(f"Created Google Calendar event {event.get('id')} for doctor {doctor_email}")
@@ -179,7 +196,8 @@ class GoogleCalendarService:
                     lambda: service.events().get(
                         calendarId=doctor_email,
                         eventId=event_id
-                    ).execute()
+                    ).execute(),
+                    doctor_email
                 )
             except HttpError as e:
                 if e.resp.status == 404:
@@ -217,7 +235,8 @@ class GoogleCalendarService:
             event['end']['timeZone'] = str(tz)
 
             updated_event = self._execute_with_retry(
-                lambda: service.events().update(calendarId=doctor_email, eventId=event_id, body=event).execute()
+                lambda: service.events().update(calendarId=doctor_email, eventId=event_id, body=event).execute(),
+                doctor_email
             )
 
             logger.info(f"Updated Google Calendar event {event_id} for doctor {doctor_email}")
@@ -248,7 +267,8 @@ class GoogleCalendarService:
             service = self._get_service(doctor_email)
             
             self._execute_with_retry(
-                lambda: service.events().delete(calendarId=doctor_email, eventId=event_id).execute()
+                lambda: service.events().delete(calendarId=doctor_email, eventId=event_id).execute(),
+                doctor_email
             )
             
             logger.info(f"Deleted Google Calendar event {event_id} for doctor {doctor_email}")
@@ -267,9 +287,65 @@ class GoogleCalendarService:
             logger.error(f"Unexpected error deleting Google Calendar event: {self.last_error}")
             return False
 
-    def _execute_with_retry(self, func, max_attempts: int = 3, base_delay_seconds: int = 1):
-        """Retry helper for transient Google Calendar API failures."""
+    def execute_batch(
+        self,
+        doctor_email: str,
+        operations: List[Tuple[str, dict]]
+    ) -> List[Tuple[Optional[dict], Optional[Exception]]]:
+        """
+        Run event operations for one doctor through the Google batch endpoint.
+
+        Args:
+            doctor_email: Doctor's Google Calendar email
+            operations: Up to BATCH_MAX_OPERATIONS (method, kwargs) pairs, where
+                method is "insert", "patch" or "delete" on events() and kwargs
+                omit calendarId
+
+        Returns:
+            (response, error) per operation, in input order
+
+        Raises:
+            Exception: If the batch request itself fails after retries
+        """
+        if len(operations) > BATCH_MAX_OPERATIONS:
+            raise ValueError(f"A batch holds at most {BATCH_MAX_OPERATIONS} operations")
+        service = self._get_service(doctor_email)
+        results: Dict[str, Tuple[Optional[dict], Optional[Exception]]] = {}
+
+        def collect(request_id, response, exception):
+            results[request_id] = (response, exception)
+
+        def run_batch():
+            results.clear()
+            batch = service.new_batch_http_request(callback=collect)
+            for index, (method, kwargs) in enumerate(operations):
+                request = getattr(service.events(), method)(calendarId=doctor_email, **kwargs)
+                batch.add(request, request_id=str(index))
+            batch.execute()
+
+        # Google charges quota for every call inside a batch
+        self._execute_with_retry(run_batch, doctor_email, cost=len(operations))
+        logger.info(f"Executed Google Calendar batch of {len(operations)} operation(s) for {doctor_email}")
+        missing = (None, RuntimeError("No response for batch item"))
+        return [results.get(str(index), missing) for index in range(len(operations))]
+
+    def _execute_with_retry(
+        self,
+        func,
+        user_email: str,
+        cost: int = 1,
+        max_attempts: int = 3,
+        base_delay_seconds: int = 1
+    ):
+        """
+        Retry helper for transient Google Calendar API failures.
+
+        Every attempt first takes cost tokens from user_email's and the
+        project's rate-limit budgets, waiting for them if necessary.
+        """
+        quota_user = self.quota_user(user_email)
         for attempt in range(max_attempts):
+            google_rate_limiter.acquire(quota_user, cost)
             try:
                 return func()
             except HttpError as e:
@@ -0,0 +1,122 @@
+"""
+Google Client Cache - reusable Google Calendar API service objects.
+
+Building a client used to re-read the service-account file, mint new
+credentials (and therefore a fresh token exchange) and parse the discovery
+document on every call. Clients are now built once per (subject, delegation)
+from a discovery document loaded once from googleapiclient's bundled static
+copy, and kept in a bounded LRU. Credentials live inside the cached client and
+refresh their token only when it expires.
+
+httplib2 connections are not thread-safe, so cached clients build each request
+on a per-thread authorized connection; one client can be shared by the sync
+worker pool, watch renewals and reconciles.
+"""
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import google_auth_httplib2
+from google.oauth2 import service_account
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import build_from_document
+from googleapiclient.http import HttpRequest, build_http
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+CALENDAR_SCOPES = ["https://www.googleapis.com/auth/calendar"]
+
+
+class GoogleClientCache:
+    """Bounded, thread-safe LRU of Calendar API clients keyed by (subject, delegation)."""
+
+    def __init__(self, max_entries: int = settings.GOOGLE_CLIENT_CACHE_SIZE):
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, bool], object]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._base_credentials: Optional[service_account.Credentials] = None
+        self._discovery_doc: Optional[dict] = None
+        self._thread_state = threading.local()
+        self._stats = {"hits": 0, "builds": 0, "build_seconds": 0.0}
+
+    def get(self, user_email: str, delegate: bool):
+        """Return a Calendar API client acting as user_email (delegated) or as the service account."""
+        key = (user_email.lower(), delegate) if delegate else ("", False)
+        with self._lock:
+            client = self._entries.get(key)
+            if client is not None:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                return client
+
+        started = time.perf_counter()
+        client = self._build(user_email if delegate else None)
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            self._stats["builds"] += 1
+            self._stats["build_seconds"] += elapsed
+            self._entries[key] = client
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        if delegate:
+            logger.info(f"Built delegated Google Calendar client for {user_email} in {elapsed * 1000:.0f}ms")
+        else:
+            logger.info(f"Built service-account Google Calendar client in {elapsed * 1000:.0f}ms")
+        return client
+
+    def stats(self) -> Dict[str, float]:
+        """Cache counters, including build time saved by hits (estimated from the mean build time)."""
+        with self._lock:
+            builds = self._stats["builds"]
+            mean_build = self._stats["build_seconds"] / builds if builds else 0.0
+            return {
+                "entries": len(self._entries),
+                "hits": self._stats["hits"],
+                "builds": builds,
+                "build_seconds": round(self._stats["build_seconds"], 3),
+                "build_seconds_saved": round(self._stats["hits"] * mean_build, 3),
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        with self._build_lock:
+            self._base_credentials = None
+
+    def _build(self, subject: Optional[str]):
+        with self._build_lock:
+            if self._base_credentials is None:
+                self._base_credentials = service_account.Credentials.from_service_account_file(
+                    settings.GOOGLE_CALENDAR_CREDENTIALS_PATH,
+                    scopes=CALENDAR_SCOPES
+                )
+            if self._discovery_doc is None:
+                self._discovery_doc = json.loads(discovery_cache.get_static_doc("calendar", "v3"))
+            credentials = self._base_credentials.with_subject(subject) if subject else self._base_credentials
+
+        def request_builder(http, *args, **kwargs):
+            return HttpRequest(self._authorized_http(credentials), *args, **kwargs)
+
+        return build_from_document(
+            self._discovery_doc,
+            http=self._authorized_http(credentials),
+            requestBuilder=request_builder
+        )
+
+    def _authorized_http(self, credentials) -> google_auth_httplib2.AuthorizedHttp:
+        """Authorize this thread's reusable httplib2 connection pool with credentials."""
+        http = getattr(self._thread_state, "http", None)
+        if http is None:
+            http = self._thread_state.http = build_http()
+        return google_auth_httplib2.AuthorizedHttp(credentials, http=http)
+
+
+google_client_cache = GoogleClientCache()
@@ -0,0 +1,203 @@
+"""
+Google Rate Limiter - token buckets in front of every Google Calendar API call.
+
+Google enforces a per-user quota (per delegated subject, or the service account
+itself when not delegating) and a per-project quota. Each call takes one token
+from the caller's user bucket and from the shared project bucket, so a reconcile
+sweep or sync backlog slows down before Google starts answering 429.
+
+Buckets live in process memory. With GOOGLE_API_RATE_LIMIT_REDIS set they live
+in Redis at REDIS_URL instead, so limits hold across all API and worker
+processes; if Redis is unreachable the in-process buckets are used until it
+comes back.
+
+Callers that can reschedule work (the sync worker) use delay() to find out how
+long to wait without taking tokens; acquire() blocks and is meant for callers
+that have nothing better to do.
+"""
+from typing import Dict, List, Optional, Tuple
+import logging
+import threading
+import time
+
+from app.config import settings
+
+try:
+    import redis
+except ImportError:  # Optional dependency
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "google_quota"
+PROJECT_BUCKET = "project"
+
+# KEYS: bucket keys. ARGV: cost, consume flag, then rate and burst per key.
+# Returns the seconds until every bucket holds cost tokens ("0" when they do,
+# in which case the tokens are taken if consume is set). Returned as a string
+# because Redis truncates Lua numbers to integers.
+_TAKE_SCRIPT = """
+local clock = redis.call("TIME")
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local cost = tonumber(ARGV[1])
+local wait = 0
+local levels = {}
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[1 + i * 2])
+    local burst = tonumber(ARGV[2 + i * 2])
+    local state = redis.call("HMGET", key, "tokens", "ts")
+    local tokens = tonumber(state[1]) or burst
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+    levels[i] = tokens
+    if tokens < cost then
+        wait = math.max(wait, (cost - tokens) / rate)
+    end
+end
+if wait == 0 and ARGV[2] == "1" then
+    for i, key in ipairs(KEYS) do
+        local rate = tonumber(ARGV[1 + i * 2])
+        local burst = tonumber(ARGV[2 + i * 2])
+        redis.call("HSET", key, "tokens", levels[i] - cost, "ts", now)
+        redis.call("EXPIRE", key, math.ceil(burst / rate) + 1)
+    end
+end
+return tostring(wait)
+"""
+
+
+class GoogleRateLimiter:
+    """Per-user and per-project token buckets, in-process or shared through Redis."""
+
+    def __init__(
+        self,
+        user_rate: float = settings.GOOGLE_API_USER_RATE_PER_SECOND,
+        user_burst: int = settings.GOOGLE_API_USER_BURST,
+        project_rate: float = settings.GOOGLE_API_PROJECT_RATE_PER_SECOND,
+        project_burst: int = settings.GOOGLE_API_PROJECT_BURST,
+        redis_url: Optional[str] = settings.REDIS_URL if settings.GOOGLE_API_RATE_LIMIT_REDIS else None,
+        retry_after_seconds: int = 30
+    ):
+        self._user_limit = (float(user_rate), float(user_burst))
+        self._project_limit = (float(project_rate), float(project_burst))
+        self._redis_url = redis_url
+        self._retry_after = retry_after_seconds
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+        self._client = None
+        self._script = None
+        self._next_connect_at = 0.0
+        self._connect_lock = threading.Lock()
+        self._stats = {"acquired": 0, "throttled": 0, "throttled_seconds": 0.0, "deferred": 0, "redis_errors": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return settings.GOOGLE_API_RATE_LIMIT_ENABLED
+
+    def delay(self, quota_user: str, cost: int = 1) -> float:
+        """
+        Seconds until cost calls for quota_user fit in both budgets, without
+        taking tokens. 0 means the calls can be made now.
+        """
+        if not self.enabled:
+            return 0.0
+        return self._take(quota_user, cost, consume=False)
+
+    def acquire(self, quota_user: str, cost: int = 1) -> float:
+        """
+        Take cost tokens for quota_user, sleeping until both budgets allow it.
+
+        Returns:
+            Seconds spent waiting
+        """
+        if not self.enabled:
+            return 0.0
+        waited = 0.0
+        while True:
+            wait = self._take(quota_user, cost, consume=True)
+            if wait <= 0:
+                with self._lock:
+                    self._stats["acquired"] += 1
+                    if waited:
+                        self._stats["throttled"] += 1
+                        self._stats["throttled_seconds"] += waited
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+    def record_deferral(self) -> None:
+        """Count work a caller rescheduled instead of waiting for tokens."""
+        with self._lock:
+            self._stats["deferred"] += 1
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["throttled_seconds"] = round(stats["throttled_seconds"], 3)
+        stats["backend"] = "redis" if self._get_client() else "memory"
+        return stats
+
+    def _take(self, quota_user: str, cost: int, consume: bool) -> float:
+        keys = [f"user:{quota_user.lower()}", PROJECT_BUCKET]
+        limits = [self._user_limit, self._project_limit]
+        # A request larger than a bucket could never be satisfied; charge a full bucket instead
+        cost = min(float(cost), *(burst for _, burst in limits))
+
+        client = self._get_client()
+        if client is not None:
+            try:
+                args: List[float] = [cost, 1 if consume else 0]
+                for rate, burst in limits:
+                    args.extend([rate, burst])
+                return float(self._script(keys=[f"{_KEY_PREFIX}:{key}" for key in keys], args=args, client=client))
+            except Exception as e:
+                self._on_error(e)
+
+        now = time.monotonic()
+        with self._lock:
+            levels = []
+            wait = 0.0
+            for key, (rate, burst) in zip(keys, limits):
+                tokens, updated = self._buckets.get(key, (burst, now))
+                tokens = min(burst, tokens + (now - updated) * rate)
+                levels.append(tokens)
+                if tokens < cost:
+                    wait = max(wait, (cost - tokens) / rate)
+            if wait == 0 and consume:
+                for key, tokens in zip(keys, levels):
+                    self._buckets[key] = (tokens - cost, now)
+            return wait
+
+    def _get_client(self):
+        if not self._redis_url or redis is None:
+            return None
+        if self._client is not None:
+            return self._client
+        if time.monotonic() < self._next_connect_at:
+            return None
+        with self._connect_lock:
+            if self._client is None and time.monotonic() >= self._next_connect_at:
+                try:
+                    client = redis.Redis.from_url(
+                        self._redis_url,
+                        decode_responses=True,
+                        socket_timeout=0.5,
+                        socket_connect_timeout=0.5
+                    )
+                    client.ping()
+                    self._script = client.register_script(_TAKE_SCRIPT)
+                    self._client = client
+                except Exception as e:
+                    logger.warning(f"Redis unavailable, Google API rate limits are per process: {e}")
+                    self._next_connect_at = time.monotonic() + self._retry_after
+        return self._client
+
+    def _on_error(self, error: Exception) -> None:
+        with self._lock:
+            self._stats["redis_errors"] += 1
+        logger.warning(f"Google rate limiter Redis error, using in-process buckets: {error}")
+        self._client = None
+        self._next_connect_at = time.monotonic() + self._retry_after
+
+
+google_rate_limiter = GoogleRateLimiter()
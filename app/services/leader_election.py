@@ -0,0 +1,117 @@
+"""
+Leader Election - run a service in exactly one process.
+
+Candidates race for a session-level Postgres advisory lock on a dedicated
+connection. The winner keeps the connection open and pings it every interval;
+Postgres releases the lock when the connection closes, so a crashed or
+partitioned leader is replaced within one interval without any lease table.
+A leader that loses its connection steps down before trying again.
+"""
+import logging
+import threading
+from typing import Callable, Optional
+
+import psycopg
+from sqlalchemy.engine import make_url
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Two-key (int4, int4) advisory locks; the second key keeps election locks apart
+# from the doctor-day locks in app.utils.advisory_locks, which use day numbers
+_ELECTION_NAMESPACE = -1
+
+
+class LeaderElector:
+    """Holds leadership for name while this process's lock connection is alive."""
+
+    def __init__(
+        self,
+        name: str,
+        on_elected: Callable[[], None],
+        on_revoked: Callable[[], None],
+        interval_seconds: int = settings.LEADER_ELECTION_INTERVAL_SECONDS
+    ):
+        self._name = name
+        self._on_elected = on_elected
+        self._on_revoked = on_revoked
+        self._interval = interval_seconds
+        self._conn: Optional[psycopg.Connection] = None
+        self._worker: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    @property
+    def is_leader(self) -> bool:
+        return self._conn is not None
+
+    def start(self) -> None:
+        if self._worker and self._worker.is_alive():
+            return
+        self._stop_event.clear()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+        logger.info(f"Leader election for '{self._name}' started")
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._worker:
+            self._worker.join(timeout=5)
+        if self.is_leader:
+            self._step_down()
+
+    def is_running(self) -> bool:
+        return bool(self._worker and self._worker.is_alive())
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            if self.is_leader:
+                self._check_connection()
+            else:
+                self._try_acquire()
+            self._stop_event.wait(self._interval)
+
+    def _try_acquire(self) -> None:
+        try:
+            url = make_url(settings.DATABASE_URL).set(drivername="postgresql")
+            conn = psycopg.connect(url.render_as_string(hide_password=False), autocommit=True)
+        except Exception as e:
+            logger.warning(f"Leader election for '{self._name}' could not connect: {e}")
+            return
+        try:
+            acquired = conn.execute(
+                "SELECT pg_try_advisory_lock(hashtext(%s), %s)",
+                (self._name, _ELECTION_NAMESPACE)
+            ).fetchone()[0]
+        except Exception as e:
+            logger.warning(f"Leader election for '{self._name}' failed: {e}")
+            acquired = False
+        if not acquired:
+            conn.close()
+            return
+        self._conn = conn
+        logger.info(f"This process is now leader for '{self._name}'")
+        try:
+            self._on_elected()
+        except Exception as e:
+            logger.error(f"Starting '{self._name}' after election failed: {e}")
+            self._step_down()
+
+    def _check_connection(self) -> None:
+        try:
+            self._conn.execute("SELECT 1")
+        except Exception as e:
+            logger.warning(f"Lost leadership for '{self._name}': {e}")
+            self._step_down()
+
+    def _step_down(self) -> None:
+        conn, self._conn = self._conn, None
+        try:
+            self._on_revoked()
+        except Exception as e:
+            logger.error(f"Stopping '{self._name}' after losing leadership failed: {e}")
+        if conn is not None:
+            try:
+                conn.close()  # Releases the advisory lock
+            except Exception:
+                pass
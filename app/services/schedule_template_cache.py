@@ -0,0 +1,95 @@
+"""
+Schedule Template Cache - pre-parsed per-doctor working schedules.
+
+Availability reads used to re-parse working_hours, rebuild the working-day list
+and regenerate the slot grid on every call. Templates are cached per doctor and
+keyed on Doctor.updated_at, so a doctor row changed by any process (API, admin
+or doctor portal) is re-parsed the next time it is read.
+"""
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, time
+from typing import NamedTuple, Optional, Tuple
+
+from app.models.doctor import Doctor
+from app.services import slot_engine
+
+WEEKDAY_NAMES = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+
+class ScheduleTemplate(NamedTuple):
+    """Immutable, pre-parsed working schedule for a doctor."""
+    updated_at: Optional[datetime]
+    working_start: time
+    working_end: time
+    weekday_mask: int  # bit N set when the doctor works on date.weekday() == N
+    slot_duration_minutes: int
+    grid: Tuple[int, ...]  # slot start minutes since midnight
+
+    def works_on(self, day: date) -> bool:
+        return bool((self.weekday_mask >> day.weekday()) & 1)
+
+
+def build_schedule_template(doctor: Doctor) -> ScheduleTemplate:
+    """Parse a doctor's working schedule into a ScheduleTemplate."""
+    working_start = datetime.strptime(doctor.working_hours["start"], "%H:%M").time()
+    working_end = datetime.strptime(doctor.working_hours["end"], "%H:%M").time()
+
+    weekday_mask = 0
+    for day in doctor.working_days or []:
+        name = str(day).strip().lower()
+        if name in WEEKDAY_NAMES:
+            weekday_mask |= 1 << WEEKDAY_NAMES.index(name)
+
+    return ScheduleTemplate(
+        updated_at=doctor.updated_at,
+        working_start=working_start,
+        working_end=working_end,
+        weekday_mask=weekday_mask,
+        slot_duration_minutes=doctor.slot_duration_minutes,
+        grid=slot_engine.build_slot_grid(
+            slot_engine.minute_of_day(working_start),
+            slot_engine.minute_of_day(working_end),
+            doctor.slot_duration_minutes
+        )
+    )
+
+
+class ScheduleTemplateCache:
+    """Bounded, thread-safe LRU of ScheduleTemplate keyed by doctor email."""
+
+    def __init__(self, max_entries: int = 4096):
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[str, ScheduleTemplate]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, doctor: Doctor) -> ScheduleTemplate:
+        """Return the cached template, rebuilding it if the doctor row changed."""
+        with self._lock:
+            template = self._entries.get(doctor.email)
+            if template is not None and template.updated_at == doctor.updated_at:
+                self._entries.move_to_end(doctor.email)
+                return template
+
+        template = build_schedule_template(doctor)
+        if doctor.updated_at is None:
+            # Transient or unsaved doctor; no reliable version to key on
+            return template
+
+        with self._lock:
+            self._entries[doctor.email] = template
+            self._entries.move_to_end(doctor.email)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+        return template
+
+    def invalidate(self, doctor_email: str) -> None:
+        with self._lock:
+            self._entries.pop(doctor_email, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+schedule_template_cache = ScheduleTemplateCache()
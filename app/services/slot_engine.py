@@ -0,0 +1,120 @@
+"""
+Slot Engine - minute-resolution bitmap arithmetic for doctor-day availability.
+
+A doctor-day is represented as a Python int where bit N is set when minute N
+(counted from midnight) is busy. Masking bookings is one shift/OR per booking
+and checking a slot is one shift/AND, so filtering is linear in
+slots + bookings instead of slots x bookings.
+"""
+from datetime import time
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from app.schemas.appointment import AvailabilitySlot
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def minute_of_day(value: time) -> int:
+    """Return minutes since midnight, truncating seconds."""
+    return value.hour * 60 + value.minute
+
+
+def _ceil_minute_of_day(value: time) -> int:
+    """Return minutes since midnight, rounding partial minutes up."""
+    minutes = minute_of_day(value)
+    if value.second or value.microsecond:
+        minutes += 1
+    return minutes
+
+
+def minute_to_time(minutes: int) -> time:
+    """Convert minutes since midnight to a time (24:00 wraps to 00:00)."""
+    minutes %= MINUTES_PER_DAY
+    return time(minutes // 60, minutes % 60)
+
+
+def range_mask(start_minute: int, end_minute: int) -> int:
+    """Bitmask covering the half-open minute range [start_minute, end_minute)."""
+    if end_minute <= start_minute:
+        return 0
+    return ((1 << (end_minute - start_minute)) - 1) << start_minute
+
+
+def busy_mask(ranges: Iterable[Tuple[time, time]]) -> int:
+    """
+    Build a busy bitmap from (start_time, end_time) ranges.
+
+    Start times are floored and end times ceiled to the minute, so a slot on the
+    minute grid is masked exactly when it overlaps the original range.
+    """
+    mask = 0
+    for start, end in ranges:
+        mask |= range_mask(minute_of_day(start), _ceil_minute_of_day(end))
+    return mask
+
+
+def build_slot_grid(
+    start_minute: int,
+    end_minute: int,
+    slot_duration_minutes: int
+) -> Tuple[int, ...]:
+    """Start minutes of every slot that fits between start and end."""
+    if slot_duration_minutes <= 0:
+        return ()
+    return tuple(range(start_minute, end_minute - slot_duration_minutes + 1, slot_duration_minutes))
+
+
+def free_slot_starts(
+    grid: Sequence[int],
+    slot_duration_minutes: int,
+    busy: int
+) -> List[int]:
+    """Return the grid entries whose slot does not intersect the busy bitmap."""
+    if not busy:
+        return list(grid)
+    slot_bits = (1 << slot_duration_minutes) - 1
+    return [start for start in grid if not (busy >> start) & slot_bits]
+
+
+def to_availability_slots(
+    starts: Iterable[int],
+    slot_duration_minutes: int
+) -> List[AvailabilitySlot]:
+    """Materialize slot start minutes as AvailabilitySlot objects."""
+    return [
+        AvailabilitySlot(
+            start_time=minute_to_time(start),
+            end_time=minute_to_time(start + slot_duration_minutes)
+        )
+        for start in starts
+    ]
+
+
+def available_slots(
+    working_start: time,
+    working_end: time,
+    slot_duration_minutes: int,
+    booked_ranges: Iterable[Tuple[time, time]],
+    grid: Optional[Sequence[int]] = None
+) -> List[AvailabilitySlot]:
+    """
+    Compute free slots for a doctor-day.
+
+    Args:
+        working_start: Start of working hours
+        working_end: End of working hours
+        slot_duration_minutes: Duration of each slot in minutes
+        booked_ranges: (start_time, end_time) of booked appointments
+        grid: Optional precomputed slot grid (start minutes)
+
+    Returns:
+        List of AvailabilitySlot objects
+    """
+    if grid is None:
+        grid = build_slot_grid(
+            minute_of_day(working_start),
+            minute_of_day(working_end),
+            slot_duration_minutes
+        )
+    starts = free_slot_starts(grid, slot_duration_minutes, busy_mask(booked_ranges))
+    return to_availability_slots(starts, slot_duration_minutes)
@@ -0,0 +1,31 @@
+"""
+Postgres advisory locks for serializing writes to a doctor-day.
+"""
+from datetime import date
+from typing import Iterable, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# Two-key form: (hash of doctor email, days since epoch) keeps collisions per doctor-day rare
+_LOCK_DOCTOR_DAY = text(
+    "SELECT pg_advisory_xact_lock(hashtext(:doctor_email), (:day - DATE '1970-01-01'))"
+)
+
+
+def lock_doctor_day(db: Session, doctor_email: str, day: date) -> None:
+    """Block until this transaction holds the advisory lock for a doctor-day."""
+    lock_doctor_days(db, [(doctor_email, day)])
+
+
+def lock_doctor_days(db: Session, doctor_days: Iterable[Tuple[str, date]]) -> None:
+    """
+    Take transaction-scoped advisory locks for several doctor-days.
+
+    Locks are acquired in sorted order so writers touching overlapping sets of
+    days cannot deadlock, and are released automatically on commit or rollback.
+    Take them before reading availability: under READ COMMITTED, the next
+    statement after the wait sees the previous holder's committed booking.
+    """
+    for doctor_email, day in sorted(set(doctor_days)):
+        db.execute(_LOCK_DOCTOR_DAY, {"doctor_email": doctor_email, "day": day})
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark: booking slot validation round trips, legacy vs. single statement.
+
+Runs the pre-booking validation for one doctor-day against the configured
+database (DATABASE_URL) and reports SQL round trips per validation plus latency
+percentiles under concurrency. Each validation runs in its own transaction and
+is rolled back, so nothing is written.
+
+Legacy path: doctor lookup, is_slot_available (doctor, leave, overlap), then a
+SELECT ... FOR UPDATE overlap re-check. New path: AvailabilityService.check_slot.
+
+Usage:
+    python benchmarks/bench_booking_validation.py --doctor doc@example.com \\
+        --date 2026-10-19 --start 09:00 [--iterations 500] [--concurrency 16]
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time as time_module
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event  # noqa: E402
+
+from app.database import SessionLocal, engine  # noqa: E402
+from app.models.appointment import Appointment, AppointmentStatus  # noqa: E402
+from app.models.doctor import Doctor  # noqa: E402
+from app.models.doctor_leave import DoctorLeave  # noqa: E402
+from app.services.availability_service import AvailabilityService  # noqa: E402
+
+_counter = threading.local()
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _count_round_trip(conn, cursor, statement, parameters, context, executemany):
+    _counter.value = getattr(_counter, "value", 0) + 1
+
+
+def legacy_validate(db, doctor_email, slot_date, start_time):
+    """Pre-consolidation validation sequence kept for comparison."""
+    doctor = db.query(Doctor).filter(Doctor.email == doctor_email).first()
+    if not doctor or not doctor.is_active:
+        return False
+    end_time = (datetime.combine(slot_date, start_time) + timedelta(minutes=doctor.slot_duration_minutes)).time()
+    active = [AppointmentStatus.BOOKED, AppointmentStatus.RESCHEDULED]
+
+    doctor = db.query(Doctor).filter(Doctor.email == doctor_email, Doctor.is_active == True).first()  # noqa: E712
+    if not doctor:
+        return False
+    leave = db.query(DoctorLeave).filter(DoctorLeave.doctor_email == doctor_email, DoctorLeave.date == slot_date).first()
+    if leave:
+        return False
+    overlapping = db.query(Appointment).filter(
+        Appointment.doctor_email == doctor_email,
+        Appointment.date == slot_date,
+        Appointment.status.in_(active),
+        Appointment.start_time < end_time,
+        Appointment.end_time > start_time
+    ).first()
+    if overlapping:
+        return False
+    locked = db.query(Appointment).filter(
+        Appointment.doctor_email == doctor_email,
+        Appointment.date == slot_date,
+        Appointment.status.in_(active),
+        Appointment.start_time < end_time,
+        Appointment.end_time > start_time
+    ).with_for_update().first()
+    return locked is None
+
+
+def consolidated_validate(db, doctor_email, slot_date, start_time):
+    return AvailabilityService.check_slot(db, doctor_email, slot_date, start_time).available
+
+
+def run_once(fn, doctor_email, slot_date, start_time):
+    db = SessionLocal()
+    try:
+        _counter.value = 0
+        started = time_module.perf_counter()
+        fn(db, doctor_email, slot_date, start_time)
+        elapsed = time_module.perf_counter() - started
+        return elapsed, _counter.value
+    finally:
+        db.rollback()
+        db.close()
+
+
+def run(fn, args):
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(
+            lambda _: run_once(fn, args.doctor, args.date, args.start),
+            range(args.iterations)
+        ))
+    latencies = sorted(r[0] * 1000 for r in results)
+    trips = statistics.mean(r[1] for r in results)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return trips, statistics.median(latencies), p99
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--doctor", required=True, help="Email of an existing doctor")
+    parser.add_argument("--date", type=date.fromisoformat, required=True)
+    parser.add_argument("--start", type=lambda v: datetime.strptime(v, "%H:%M").time(), required=True)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        legacy = legacy_validate(db, args.doctor, args.date, args.start)
+        db.rollback()
+        consolidated = consolidated_validate(db, args.doctor, args.date, args.start)
+        assert legacy == consolidated, "consolidated validation diverged from legacy path"
+    finally:
+        db.rollback()
+        db.close()
+
+    print(f"{'path':>14} {'round trips':>12} {'p50 (ms)':>10} {'p99 (ms)':>10}")
+    for name, fn in (("legacy", legacy_validate), ("consolidated", consolidated_validate)):
+        trips, p50, p99 = run(fn, args)
+        print(f"{name:>14} {trips:>12.1f} {p50:>10.2f} {p99:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
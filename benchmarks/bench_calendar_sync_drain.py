@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark: calendar sync backlog drain rate vs. worker pool size.
+
+Starts a local fake Google Calendar endpoint that answers each request after
+--latency-ms, then drains a backlog of --jobs jobs spread over --doctors
+doctors through CalendarSyncQueue's claim/pool machinery. Job claiming is served
+from memory and each job makes one HTTP call to the fake endpoint, so the
+numbers isolate scheduling and Google round-trip cost from Postgres.
+
+Usage:
+    python benchmarks/bench_calendar_sync_drain.py [--jobs 500] [--doctors 50] \\
+        [--latency-ms 150] [--concurrency 1 4 8 16]
+
+Requires the same environment variables as the API (app.config.Settings).
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time as time_module
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.services.calendar_sync_queue import CalendarSyncQueue  # noqa: E402
+
+
+def start_fake_google(latency_seconds):
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            time_module.sleep(latency_seconds)
+            body = json.dumps({"id": "evt", "status": "confirmed"}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class InMemoryQueue(CalendarSyncQueue):
+    """CalendarSyncQueue whose claims come from a list and whose jobs call the fake endpoint."""
+
+    def __init__(self, jobs, endpoint, batch_size, concurrency):
+        super().__init__(batch_size=batch_size, concurrency=concurrency)
+        self._backlog = list(jobs)
+        self._backlog_lock = threading.Lock()
+        self._endpoint = endpoint
+        self._client = httpx.Client(limits=httpx.Limits(max_connections=concurrency * 2))
+        self.done = threading.Semaphore(0)
+
+    def _claim_jobs(self, limit):
+        with self._backlog_lock:
+            claimed, self._backlog = self._backlog[:limit], self._backlog[limit:]
+        return claimed
+
+    def _process_job(self, job_id):
+        self._client.post(self._endpoint, json={"job": job_id})
+        self.done.release()
+
+
+def drain(job_count, doctors, endpoint, batch_size, concurrency):
+    jobs = [(i, f"doctor{i % doctors}@example.com") for i in range(job_count)]
+    queue = InMemoryQueue(jobs, endpoint, batch_size, concurrency)
+    queue._pool = ThreadPoolExecutor(max_workers=concurrency)
+    started = time_module.perf_counter()
+    processed = 0
+    while processed < job_count:
+        queue._process_batch()
+        queue._wake_event.wait(0.5)
+        queue._wake_event.clear()
+        while queue.done.acquire(blocking=False):
+            processed += 1
+    elapsed = time_module.perf_counter() - started
+    queue._pool.shutdown(wait=True)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=500)
+    parser.add_argument("--doctors", type=int, default=50)
+    parser.add_argument("--latency-ms", type=int, default=150)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args()
+    # The fake endpoint has no quota; measure scheduling, not the Google rate limiter
+    settings.GOOGLE_API_RATE_LIMIT_ENABLED = False
+
+    server = start_fake_google(args.latency_ms / 1000)
+    endpoint = f"http://127.0.0.1:{server.server_address[1]}/calendar/v3/calendars/primary/events"
+
+    print(f"{'workers':>8} {'seconds':>9} {'jobs/s':>9}")
+    for concurrency in args.concurrency:
+        elapsed = drain(args.jobs, args.doctors, endpoint, args.batch_size, concurrency)
+        print(f"{concurrency:>8} {elapsed:>9.2f} {args.jobs / elapsed:>9.1f}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
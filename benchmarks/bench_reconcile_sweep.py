@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark: calendar reconcile sweep time vs. concurrency.
+
+Runs CalendarReconcileService._sweep over --doctors stale doctors served from
+memory. Each simulated sync spends --google-ms in a blocking Google call (run
+in asyncio.to_thread, as sync_calendar_to_db does) and --db-ms of blocking
+database work; the sweep runs each doctor's sync in its own thread. Compare
+the sweep time with CALENDAR_RECONCILE_INTERVAL_SECONDS.
+
+Usage:
+    python benchmarks/bench_reconcile_sweep.py [--doctors 2000] [--google-ms 300] \\
+        [--db-ms 5] [--concurrency 1 8 16]
+
+Requires the same environment variables as the API (app.config.Settings).
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time as time_module
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings  # noqa: E402
+from app.services.calendar_reconcile_service import CalendarReconcileService  # noqa: E402
+
+
+class SimulatedSyncService:
+    def __init__(self, google_seconds, db_seconds):
+        self.google_seconds = google_seconds
+        self.db_seconds = db_seconds
+
+    async def sync_calendar_to_db(self, doctor_email, db, wait=True):
+        await asyncio.to_thread(time_module.sleep, self.google_seconds)
+        time_module.sleep(self.db_seconds)
+
+
+class InMemoryReconcile(CalendarReconcileService):
+    def __init__(self, doctor_count, sync_service):
+        super().__init__()
+        base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        self._doctors = [(base + timedelta(seconds=i), f"doctor{i}@example.com") for i in range(doctor_count)]
+        self._sync_service = sync_service
+
+    def _get_next_doctor_batch(self, stale_before, cursor=None):
+        start = 0 if cursor is None else self._doctors.index(cursor) + 1
+        return self._doctors[start:start + settings.CALENDAR_RECONCILE_BATCH_SIZE]
+
+
+def sweep(doctor_count, concurrency, google_seconds, db_seconds):
+    settings.CALENDAR_RECONCILE_CONCURRENCY = concurrency
+    service = InMemoryReconcile(doctor_count, SimulatedSyncService(google_seconds, db_seconds))
+    loop = asyncio.new_event_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=concurrency))
+    started = time_module.perf_counter()
+    with patch("app.services.calendar_reconcile_service.SessionLocal"):
+        loop.run_until_complete(service._sweep(settings.CALENDAR_RECONCILE_INTERVAL_SECONDS))
+    elapsed = time_module.perf_counter() - started
+    loop.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--doctors", type=int, default=2000)
+    parser.add_argument("--google-ms", type=int, default=300)
+    parser.add_argument("--db-ms", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 16])
+    args = parser.parse_args()
+
+    print(f"interval: {settings.CALENDAR_RECONCILE_INTERVAL_SECONDS}s")
+    print(f"{'workers':>8} {'seconds':>9} {'doctors/s':>10}")
+    for concurrency in args.concurrency:
+        elapsed = sweep(args.doctors, concurrency, args.google_ms / 1000, args.db_ms / 1000)
+        print(f"{concurrency:>8} {elapsed:>9.1f} {args.doctors / elapsed:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Load test: requests/sec of one API worker on the hot read paths.
+
+Keeps --concurrency requests in flight against a running API for --duration
+seconds and reports throughput and latency percentiles per endpoint. To
+compare event-loop blocking before and after the async session port, start
+one worker on each build and run the same command against both:
+
+    uvicorn app.main:app --workers 1 --port 8000
+    python benchmarks/load_api_throughput.py --base-url http://localhost:8000 \\
+        --api-key $SERVICE_API_KEY --doctor doc@example.com [--concurrency 50] [--duration 20]
+
+With blocking Session calls inside async routes, throughput stays near one
+request per database round trip regardless of --concurrency; with AsyncSession
+it should grow with --concurrency until the database or pool saturates.
+availability and availability-search run in FastAPI's threadpool (they also
+call Redis), so they stop scaling at the threadpool size (40 by default)
+rather than the async pool.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import date, timedelta
+
+import httpx
+
+
+def endpoints(doctor_email):
+    day = (date.today() + timedelta(days=1)).isoformat()
+    week_end = (date.today() + timedelta(days=7)).isoformat()
+    return {
+        "availability": (f"/api/v1/appointments/availability/{doctor_email}", {"date": day}),
+        "availability-range": (
+            "/api/v1/appointments/availability-range",
+            {"start_date": day, "end_date": week_end, "doctor_email": doctor_email}
+        ),
+        "availability-search": ("/api/v1/appointments/availability-search", {"date": day}),
+        "availability-earliest": ("/api/v1/appointments/availability-earliest", {}),
+        "export": ("/api/v1/appointments/doctors/export", {}),
+    }
+
+
+async def run_endpoint(client, path, params, concurrency, duration):
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                response = await client.get(path, params=params)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return len(latencies), errors, time.perf_counter() - started, latencies
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--api-key", required=True)
+    parser.add_argument("--doctor", required=True, help="Email of an active doctor")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds per endpoint")
+    parser.add_argument("--endpoint", action="append", help="Limit to these endpoints (repeatable)")
+    args = parser.parse_args()
+
+    targets = endpoints(args.doctor)
+    names = args.endpoint or list(targets)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(
+        base_url=args.base_url,
+        headers={"X-API-Key": args.api_key},
+        limits=limits,
+        timeout=30.0
+    ) as client:
+        print(f"{'endpoint':<24} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+        for name in names:
+            path, params = targets[name]
+            count, errors, elapsed, latencies = await run_endpoint(
+                client, path, params, args.concurrency, args.duration
+            )
+            if not latencies:
+                print(f"{name:<24} {'-':>8} {'-':>8} {'-':>8} {errors:>7}")
+                continue
+            latencies.sort()
+            p50 = statistics.median(latencies) * 1000
+            p95 = latencies[int(len(latencies) * 0.95) - 1] * 1000 if len(latencies) > 1 else p50
+            print(f"{name:<24} {count / elapsed:>8.1f} {p50:>8.1f} {p95:>8.1f} {errors:>7}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Stress test: hundreds of simultaneous bookings for the same doctor-day.
+
+Fires --requests concurrent booking transactions at a handful of slots on one
+doctor-day against the configured Postgres (DATABASE_URL) and reports
+throughput, how many bookings won, and latency of successful and conflicting
+attempts. Each attempt runs the booking write path: advisory lock (unless
+--no-lock), AvailabilityService.check_slot, insert, commit. Without the lock,
+losers only fail at the exclude_overlapping_appointments constraint on commit.
+
+Appointments and the stress patient created here are deleted at the end.
+
+Usage:
+    python benchmarks/stress_booking_concurrency.py --doctor doc@example.com \\
+        --date 2027-01-04 [--requests 300] [--concurrency 100] [--slots 4] [--no-lock]
+
+Pick a --date the doctor works on and has no bookings for.
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time as time_module
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.exc import IntegrityError  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.models.appointment import Appointment, AppointmentSource, AppointmentStatus  # noqa: E402
+from app.models.doctor import Doctor  # noqa: E402
+from app.models.patient import Patient  # noqa: E402
+from app.services import slot_engine  # noqa: E402
+from app.services.availability_service import AvailabilityService  # noqa: E402
+from app.services.schedule_template_cache import schedule_template_cache  # noqa: E402
+from app.utils.advisory_locks import lock_doctor_day  # noqa: E402
+from app.utils.datetime_utils import to_utc  # noqa: E402
+
+
+def attempt_booking(Session, doctor_email, patient_id, slot_date, start_time, use_lock):
+    """Run one booking transaction. Returns (outcome, seconds)."""
+    db = Session()
+    started = time_module.perf_counter()
+    try:
+        if use_lock:
+            lock_doctor_day(db, doctor_email, slot_date)
+        check = AvailabilityService.check_slot(db, doctor_email, slot_date, start_time)
+        if not check.available:
+            db.rollback()
+            return "rejected", time_module.perf_counter() - started
+
+        doctor = check.doctor
+        tz = doctor.timezone or settings.DEFAULT_TIMEZONE
+        end_time = (datetime.combine(slot_date, start_time) + timedelta(minutes=doctor.slot_duration_minutes)).time()
+        db.add(Appointment(
+            doctor_email=doctor_email,
+            patient_id=patient_id,
+            date=slot_date,
+            start_time=start_time,
+            end_time=end_time,
+            timezone=tz,
+            start_at_utc=to_utc(slot_date, start_time, tz),
+            end_at_utc=to_utc(slot_date, end_time, tz),
+            status=AppointmentStatus.BOOKED,
+            source=AppointmentSource.ADMIN,
+            calendar_sync_status="PENDING"
+        ))
+        db.commit()
+        return "booked", time_module.perf_counter() - started
+    except IntegrityError:
+        db.rollback()
+        return "constraint", time_module.perf_counter() - started
+    finally:
+        db.close()
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--doctor", required=True, help="Email of an existing active doctor")
+    parser.add_argument("--date", type=date.fromisoformat, required=True)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--slots", type=int, default=4, help="Distinct slots contended for")
+    parser.add_argument("--no-lock", action="store_true", help="Skip the advisory lock (baseline)")
+    args = parser.parse_args()
+
+    engine = create_engine(settings.DATABASE_URL, pool_size=args.concurrency, max_overflow=0)
+    Session = sessionmaker(bind=engine, autoflush=False)
+
+    db = Session()
+    doctor = db.query(Doctor).filter(Doctor.email == args.doctor).one()
+    template = schedule_template_cache.get(doctor)
+    starts = [slot_engine.minute_to_time(minute) for minute in template.grid[:args.slots]]
+    patient = Patient(name="Stress Test", mobile_number=f"STRESS-{uuid.uuid4().hex[:12]}")
+    db.add(patient)
+    db.commit()
+    patient_id = patient.id
+    db.close()
+
+    results = []
+    results_lock = threading.Lock()
+
+    def worker(i):
+        outcome = attempt_booking(Session, args.doctor, patient_id, args.date, starts[i % len(starts)], not args.no_lock)
+        with results_lock:
+            results.append(outcome)
+
+    started = time_module.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(worker, range(args.requests)))
+    elapsed = time_module.perf_counter() - started
+
+    db = Session()
+    try:
+        db.query(Appointment).filter(Appointment.patient_id == patient_id).delete(synchronize_session=False)
+        db.query(Patient).filter(Patient.id == patient_id).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+        engine.dispose()
+
+    by_outcome = {}
+    for outcome, seconds in results:
+        by_outcome.setdefault(outcome, []).append(seconds * 1000)
+
+    print(f"mode: {'no lock' if args.no_lock else 'advisory lock'}, requests: {args.requests}, "
+          f"concurrency: {args.concurrency}, slots: {len(starts)}")
+    print(f"throughput: {len(results) / elapsed:.1f} attempts/s over {elapsed:.2f}s")
+    print(f"{'outcome':>12} {'count':>6} {'p50 (ms)':>10} {'p99 (ms)':>10}")
+    for outcome in ("booked", "rejected", "constraint"):
+        latencies = by_outcome.get(outcome, [])
+        median = statistics.median(latencies) if latencies else 0.0
+        print(f"{outcome:>12} {len(latencies):>6} {median:>10.1f} {percentile(latencies, 0.99):>10.1f}")
+
+    booked = len(by_outcome.get("booked", []))
+    assert booked <= len(starts), f"double booking: {booked} bookings for {len(starts)} slots"
+
+
+if __name__ == "__main__":
+    main()
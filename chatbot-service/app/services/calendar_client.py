@@ -105,6 +105,35 @@ class CalendarClient:
             logger.error(f"Error checking availability: {e}")
             return {"doctors": [], "error": str(e)}
 
+    async def get_earliest_availability(
+        self,
+        specialization: Optional[str] = None,
+        language: Optional[str] = None,
+        limit: int = 5,
+        horizon_days: int = 14
+    ) -> Dict[str, Any]:
+        """Get the earliest open slots across doctors matching the filters."""
+        try:
+            params = {
+                "specialization": specialization,
+                "language": language,
+                "limit": limit,
+                "horizon_days": horizon_days
+            }
+            params = {key: value for key, value in params.items() if value is not None}
+
+            response = await self.client.get(
+                f"{self.base_url}/api/v1/appointments/availability-earliest",
+                params=params,
+                headers=self._build_headers()
+            )
+            response.raise_for_status()
+            return response.json()
+
+        except httpx.HTTPError as e:
+            logger.error(f"Error getting earliest availability: {e}")
+            return {"slots": [], "error": str(e)}
+
     async def get_doctor_availability(
         self,
         doctor_email: str,
@@ -124,6 +153,31 @@ class CalendarClient:
             logger.error(f"Error getting doctor availability: {e}")
             return {"available_slots": [], "error": str(e)}
 
+    async def get_doctors_availability_range(
+        self,
+        doctor_emails: List[str],
+        start_date: date,
+        end_date: date
+    ) -> Dict[str, Any]:
+        """Get per-day availability for one or more doctors across a date range."""
+        try:
+            params = [("doctor_email", email) for email in doctor_emails]
+            params.extend([
+                ("start_date", start_date.isoformat()),
+                ("end_date", end_date.isoformat()),
+            ])
+            response = await self.client.get(
+                f"{self.base_url}/api/v1/appointments/availability-range",
+                params=params,
+                headers=self._build_headers()
+            )
+            response.raise_for_status()
+            return response.json()
+
+        except httpx.HTTPError as e:
+            logger.error(f"Error getting availability range: {e}")
+            return {"doctors": [], "error": str(e)}
+
     async def book_appointment(self, booking_data: Dict[str, Any], idempotency_key: Optional[str] = None) -> Dict[str, Any]:
         """Book an appointment."""
         try:
@@ -658,6 +658,10 @@ class ChatService:
             )
 
         if not date_obj:
+            if specialization and not doctor_name:
+                earliest_reply = await self._earliest_availability_reply(specialization, conversation_id)
+                if earliest_reply:
+                    return earliest_reply
             if specialization:
                 return f"For {specialization}, what date would you like to check availability for?"
             return "Please tell me the date you want to check availability for."
@@ -741,6 +745,39 @@ class ChatService:
 
         return "Please tell me which doctor or specialty you'd like and the date you're looking for."
 
+    async def _earliest_availability_reply(
+        self,
+        specialization: str,
+        conversation_id: str
+    ) -> Optional[str]:
+        """Offer the soonest open slots for a specialty when no date was given."""
+        normalized_specialization = self._normalize_specialization(specialization)
+        async with CalendarClient() as calendar_client:
+            earliest = await calendar_client.get_earliest_availability(
+                specialization=normalized_specialization,
+                limit=3
+            )
+        slots = earliest.get("slots", []) if isinstance(earliest, dict) else []
+        if not slots:
+            return None
+
+        first = slots[0]
+        self.conversation_manager.update_conversation(
+            conversation_id=conversation_id,
+            context={
+                "availability_date": first.get("date"),
+                "availability_specialization": normalized_specialization,
+                "last_doctor_name": first.get("doctor_name"),
+                "last_doctor_email": first.get("doctor_id")
+            }
+        )
+
+        summaries = [
+            f"{self._format_doctor_name(slot.get('doctor_name'))} on {slot.get('date')} at {slot.get('start_time')}"
+            for slot in slots
+        ]
+        return f"The earliest available {specialization} appointments are: " + " | ".join(summaries)
+
     async def _handle_my_appointments_intent(self, conversation_id: str) -> str:
         """Handle requests for user's appointments."""
         conversation = self.conversation_manager.get_conversation(conversation_id)
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Script to regenerate the doctor_day_availability table from appointments and doctor_leaves.
+Run once before enabling AVAILABILITY_MATERIALIZED_ENABLED, and any time the table is suspected stale.
+"""
+import argparse
+import os
+import sys
+from datetime import date, timedelta
+
+# Add the app directory to Python path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from app.config import settings
+from app.database import SessionLocal
+from app.services.availability_materializer import availability_materializer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild materialized doctor-day availability")
+    parser.add_argument("--start", type=date.fromisoformat, default=date.today(), help="First date (YYYY-MM-DD), default today")
+    parser.add_argument("--days", type=int, default=settings.MAX_AVAILABILITY_DAYS + 1, help="Number of days to rebuild")
+    parser.add_argument("--doctor", action="append", dest="doctors", help="Doctor email (repeatable); default all doctors")
+    args = parser.parse_args()
+
+    end = args.start + timedelta(days=max(args.days, 1) - 1)
+    db = SessionLocal()
+    try:
+        written = availability_materializer.rebuild(db, args.start, end, doctor_emails=args.doctors)
+        print(f"Rebuilt doctor_day_availability {args.start.isoformat()}..{end.isoformat()}: {written} row(s)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
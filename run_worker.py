@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Run the calendar background workers without the API.
+
+Starts the calendar sync queue and, in whichever process wins leader election,
+watch renewal and reconcile. Run any number of these next to API processes
+started with DISABLE_CALENDAR_WORKERS=True; jobs are shared through leases.
+Stops cleanly on SIGINT/SIGTERM.
+"""
+import logging
+import signal
+import threading
+
+from app.logging_config import setup_logging
+from app.services.background_workers import background_workers
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    setup_logging()
+    stop_event = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+    signal.signal(signal.SIGINT, lambda *_: stop_event.set())
+
+    background_workers.start()
+    logger.info("Calendar background workers running")
+    try:
+        stop_event.wait()
+    finally:
+        background_workers.stop()
+        logger.info("Calendar background workers stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import inspect
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+from fastapi.testclient import TestClient
+
+from app.database import get_async_db, get_db
+from app.main import app
+from app.routes import appointment as appointment_routes
+from app.security import rate_limiter, verify_api_key
+from app.schemas.appointment import AvailabilityResponse
+
+
+class _FakeAsyncSession:
+    """Runs run_sync callables against a stub sync Session, like AsyncSession.run_sync."""
+
+    def __init__(self):
+        self.sync_session = MagicMock()
+        self.run_sync_calls = []
+
+    async def run_sync(self, fn, *args):
+        self.run_sync_calls.append(fn.__name__)
+        return fn(self.sync_session, *args)
+
+
+class AsyncAppointmentRoutesTest(unittest.TestCase):
+    def setUp(self):
+        self.db = _FakeAsyncSession()
+        self.sync_db = MagicMock()
+
+        async def override():
+            yield self.db
+
+        app.dependency_overrides[get_async_db] = override
+        app.dependency_overrides[get_db] = lambda: self.sync_db
+        app.dependency_overrides[verify_api_key] = lambda: "test-key"
+        app.dependency_overrides[rate_limiter] = lambda: None
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        app.dependency_overrides.clear()
+
+    def test_routes_calling_redis_or_google_run_in_the_threadpool(self):
+        for route in (
+            appointment_routes.get_availability,
+            appointment_routes.book_appointment,
+            appointment_routes.search_availability,
+            appointment_routes.search_availability_alias,
+        ):
+            self.assertFalse(inspect.iscoroutinefunction(route), route.__name__)
+
+    def test_availability_runs_the_service_on_the_sync_session(self):
+        today = datetime.now(timezone.utc).date()
+        result = AvailabilityResponse(doctor_id="doc@clinic.com", date=today, available_slots=[], total_slots=0)
+        with patch("app.routes.appointment.availability_service.get_available_slots", return_value=result) as get:
+            response = self.client.get(
+                "/api/v1/appointments/availability/doc@clinic.com",
+                params={"date": today.isoformat()}
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["doctor_id"], "doc@clinic.com")
+        self.assertIs(get.call_args.kwargs["db"], self.sync_db)
+        self.assertEqual(self.db.run_sync_calls, [])
+
+    def test_service_value_errors_still_map_to_400(self):
+        today = datetime.now(timezone.utc).date()
+        with patch(
+            "app.routes.appointment.availability_service.get_available_slots_for_range",
+            side_effect=ValueError("Doctor(s) not found or inactive: x@clinic.com")
+        ):
+            response = self.client.get(
+                "/api/v1/appointments/availability-range",
+                params={"start_date": today.isoformat(), "end_date": today.isoformat(), "doctor_email": "x@clinic.com"}
+            )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("x@clinic.com", response.json()["detail"])
+        self.assertEqual(self.db.run_sync_calls, ["_get_availability_range"])
+
+
+if __name__ == "__main__":
+    unittest.main()
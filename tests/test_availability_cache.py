@@ -0,0 +1,146 @@
+import asyncio
+import threading
+import time
+import unittest
+from datetime import date
+from unittest.mock import PropertyMock, patch
+
+from app.schemas.appointment import AvailabilityResponse
+from app.services.availability_cache import AvailabilityCache
+
+
+class _FakeRedis:
+    """In-memory subset of the redis-py client used by AvailabilityCache."""
+
+    def __init__(self):
+        self.data = {}
+        self.lock = threading.Lock()
+
+    def mget(self, *keys):
+        return [self.data.get(key) for key in keys]
+
+    def set(self, key, value, nx=False, px=None, ex=None):
+        with self.lock:
+            if nx and key in self.data:
+                return None
+            self.data[key] = value
+            return True
+
+    def exists(self, key):
+        return int(key in self.data)
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+        return int(self.data[key])
+
+    def expire(self, key, seconds):
+        return True
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def eval(self, script, numkeys, key, token):
+        if self.data.get(key) == token:
+            self.data.pop(key)
+
+    def pipeline(self, transaction=False):
+        return self
+
+    def execute(self):
+        return []
+
+
+def _response(total):
+    return AvailabilityResponse(doctor_id="doc@example.com", date=date(2026, 10, 19), available_slots=[], total_slots=total)
+
+
+class AvailabilityCacheTest(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(AvailabilityCache, "enabled", new_callable=PropertyMock, return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache = AvailabilityCache(redis_url="redis://test")
+        self.cache._client = _FakeRedis()
+        self.day = date(2026, 10, 19)
+
+    def test_hit_after_miss_and_invalidation_forces_recompute(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return _response(len(calls))
+
+        self.assertEqual(self.cache.get_or_compute("doc@example.com", self.day, compute).total_slots, 1)
+        self.assertEqual(self.cache.get_or_compute("doc@example.com", self.day, compute).total_slots, 1)
+        self.cache.invalidate("doc@example.com", self.day)
+        self.assertEqual(self.cache.get_or_compute("doc@example.com", self.day, compute).total_slots, 2)
+        self.cache.invalidate_doctor("doc@example.com")
+        self.assertEqual(self.cache.get_or_compute("doc@example.com", self.day, compute).total_slots, 3)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+        self.assertEqual(self.cache.stats()["misses"], 3)
+
+    def test_redis_error_falls_back_to_compute(self):
+        self.cache._client.mget = lambda *keys: (_ for _ in ()).throw(ConnectionError("down"))
+        result = self.cache.get_or_compute("doc@example.com", self.day, lambda: _response(7))
+        self.assertEqual(result.total_slots, 7)
+        self.assertEqual(self.cache.stats()["errors"], 1)
+        self.assertIsNone(self.cache._client)
+
+    def test_compute_errors_propagate_and_keep_redis(self):
+        client = self.cache._client
+        calls = []
+
+        def compute():
+            calls.append(1)
+            raise ValueError("Doctor not found")
+
+        with self.assertRaises(ValueError):
+            self.cache.get_or_compute("doc@example.com", self.day, compute)
+        self.assertEqual(len(calls), 1)
+        self.assertIs(self.cache._client, client)
+        self.assertEqual(self.cache.stats()["errors"], 0)
+        self.assertNotIn("availability:lock:doc@example.com:2026-10-19", client.data)  # lock released
+
+    def test_concurrent_misses_compute_once(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            deadline = time.monotonic() + 1
+            while not self.cache.stats()["lock_waits"] and time.monotonic() < deadline:
+                time.sleep(0.005)  # Hold the lock until the other caller is waiting on it
+            return _response(5)
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.cache.get_or_compute("doc@example.com", self.day, compute)))
+            for _ in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([r.total_slots for r in results], [5, 5])
+        self.assertEqual(self.cache.stats()["lock_waits"], 1)
+
+    def test_contended_miss_computes_after_lock_timeout(self):
+        self.cache._lock_timeout_ms = 50
+        self.cache._client.set("availability:lock:doc@example.com:2026-10-19", "other")
+        result = self.cache.get_or_compute("doc@example.com", self.day, lambda: _response(4))
+        self.assertEqual(result.total_slots, 4)
+        self.assertEqual(self.cache.stats()["lock_waits"], 1)
+        self.assertNotIn("availability:doc@example.com:2026-10-19", self.cache._client.data)
+
+    def test_event_loop_callers_bypass_redis(self):
+        self.cache._client.mget = lambda *keys: self.fail("Redis called on the event loop")
+
+        async def lookup():
+            return self.cache.get_or_compute("doc@example.com", self.day, lambda: _response(6))
+
+        self.assertEqual(asyncio.run(lookup()).total_slots, 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,22 @@
+import unittest
+from datetime import time
+
+from app.services import slot_engine
+from app.services.availability_materializer import decode_bitmap, encode_bitmap
+
+
+class AvailabilityMaterializerTest(unittest.TestCase):
+    def test_bitmap_round_trip(self):
+        busy = slot_engine.busy_mask([(time(0, 0), time(0, 15)), (time(23, 30), time(23, 59))])
+        raw = encode_bitmap(busy)
+        self.assertEqual(len(raw), 180)
+        self.assertEqual(decode_bitmap(raw), busy)
+
+    def test_empty_bitmap_is_compact(self):
+        self.assertEqual(encode_bitmap(0), b"")
+        self.assertEqual(decode_bitmap(b""), 0)
+        self.assertEqual(decode_bitmap(None), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
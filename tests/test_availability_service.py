@@ -1,9 +1,47 @@
 import unittest
-from datetime import time
+from datetime import date, datetime, time, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
 
+from fastapi import HTTPException
+
+from app.config import settings
+from app.routes.appointment import _get_availability_range
 from app.services.availability_service import AvailabilityService
 
 
+def _fake_db(*query_results):
+    """Session stub whose successive query(...).filter(...).all() calls return query_results."""
+    results = list(query_results)
+    db = MagicMock()
+    db.query.return_value.filter.return_value.all.side_effect = lambda: results.pop(0)
+    return db
+
+
+def _doctor(email, timezone_name, start, end, duration):
+    return SimpleNamespace(
+        email=email,
+        name=email.split("@")[0],
+        specialization="Cardiology",
+        timezone=timezone_name,
+        working_days=["Monday", "Tuesday"],
+        working_hours={"start": start, "end": end},
+        slot_duration_minutes=duration,
+        is_active=True,
+        updated_at=None
+    )
+
+
+class _Row(tuple):
+    """Stand-in for the (Doctor, on_leave, overlapping) row returned by check_slot's query."""
+
+    def __new__(cls, doctor, on_leave, overlapping):
+        row = super().__new__(cls, (doctor, on_leave, overlapping))
+        row.on_leave = on_leave
+        row.overlapping = overlapping
+        return row
+
+
 class AvailabilityServiceTest(unittest.TestCase):
     def test_generate_slots(self):
         slots = AvailabilityService._generate_slots(
@@ -17,6 +55,118 @@ class AvailabilityServiceTest(unittest.TestCase):
         self.assertEqual(slots[1].start_time, time(9, 30))
         self.assertEqual(slots[1].end_time, time(10, 0))
 
+    def test_find_earliest_slots_merges_doctors_by_utc_start(self):
+        utc_doctor = _doctor("a@example.com", "UTC", "09:00", "10:00", 30)
+        ist_doctor = _doctor("b@example.com", "Asia/Kolkata", "14:00", "16:00", 60)
+        db = _fake_db(
+            [],  # leaves
+            [("a@example.com", date(2026, 10, 19), time(9, 0), time(9, 30))],  # bookings
+        )
+
+        slots = AvailabilityService.find_earliest_slots(
+            db=db,
+            doctors=[utc_doctor, ist_doctor],
+            start_date=date(2026, 10, 18),
+            end_date=date(2026, 10, 21),
+            limit=3,
+            now=datetime(2026, 10, 19, 8, 0, tzinfo=timezone.utc)
+        )
+
+        self.assertEqual(
+            [(slot.doctor_id, slot.date, slot.start_time) for slot in slots],
+            [
+                ("b@example.com", date(2026, 10, 19), time(14, 0)),
+                ("a@example.com", date(2026, 10, 19), time(9, 30)),
+                ("b@example.com", date(2026, 10, 19), time(15, 0)),
+            ]
+        )
+
+    def test_range_covers_every_doctor_day_in_request_order(self):
+        short = _doctor("a@example.com", "UTC", "09:00", "10:00", 30)
+        long = _doctor("b@example.com", "UTC", "09:00", "10:00", 60)
+        monday, tuesday, wednesday = date(2026, 10, 19), date(2026, 10, 20), date(2026, 10, 21)
+        db = _fake_db(
+            [short, long],  # doctors
+            [("a@example.com", tuesday)],  # leaves
+            [("a@example.com", monday, time(9, 0), time(9, 30))],  # bookings
+        )
+
+        doctors = AvailabilityService.get_available_slots_for_range(
+            db, ["b@example.com", "a@example.com"], monday, wednesday
+        )
+
+        self.assertEqual(db.query.call_count, 3)
+        self.assertEqual([doctor.doctor_id for doctor in doctors], ["b@example.com", "a@example.com"])
+        starts = {
+            doctor.doctor_id: [[slot.start_time for slot in day.available_slots] for day in doctor.days]
+            for doctor in doctors
+        }
+        self.assertEqual(starts["b@example.com"], [[time(9, 0)], [time(9, 0)], []])  # Wednesday is not a working day
+        self.assertEqual(starts["a@example.com"], [[time(9, 30)], [], []])  # booked Monday 9:00, on leave Tuesday
+        self.assertEqual([day.date for day in doctors[0].days], [monday, tuesday, wednesday])
+        self.assertEqual(doctors[1].days[0].total_slots, 1)
+
+    def test_range_rejects_missing_or_inactive_doctors(self):
+        # Inactive doctors are filtered out by the query, like missing ones
+        db = _fake_db([_doctor("a@example.com", "UTC", "09:00", "10:00", 30)])
+        with self.assertRaises(ValueError) as raised:
+            AvailabilityService.get_available_slots_for_range(
+                db, ["a@example.com", "gone@example.com"], date(2026, 10, 19), date(2026, 10, 20)
+            )
+        self.assertIn("gone@example.com", str(raised.exception))
+        self.assertNotIn("a@example.com", str(raised.exception))
+
+    def test_range_route_validates_dates_against_max_availability_days(self):
+        today = datetime.now(timezone.utc).date()
+        db = MagicMock()
+        with patch.object(settings, "MAX_AVAILABILITY_DAYS", 3):
+            for start, end in [
+                (today, today + timedelta(days=3)),  # four days
+                (today + timedelta(days=1), today),  # reversed
+                (today - timedelta(days=1), today),  # in the past
+                (today, today + timedelta(days=4)),  # beyond the horizon
+            ]:
+                with self.assertRaises(HTTPException) as raised:
+                    _get_availability_range(db, start, end, ["a@example.com"])
+                self.assertEqual(raised.exception.status_code, 400)
+        db.query.assert_not_called()
+
+    def test_check_slot_uses_single_query_and_doctor_template(self):
+        doctor = _doctor("a@example.com", "UTC", "09:00", "10:00", 30)
+        db = MagicMock()
+        db.query.return_value.filter.return_value.first.return_value = _Row(doctor, False, False)
+
+        monday = date(2026, 10, 19)
+        self.assertTrue(AvailabilityService.check_slot(db, doctor.email, monday, time(9, 30)).available)
+        self.assertFalse(AvailabilityService.check_slot(db, doctor.email, monday, time(9, 45)).available)
+        self.assertFalse(AvailabilityService.check_slot(db, doctor.email, date(2026, 10, 21), time(9, 0)).available)
+        self.assertEqual(db.query.call_count, 3)
+
+        db.query.return_value.filter.return_value.first.return_value = _Row(doctor, False, True)
+        check = AvailabilityService.check_slot(db, doctor.email, monday, time(9, 0))
+        self.assertIs(check.doctor, doctor)
+        self.assertFalse(check.available)
+
+    def test_conflict_index_loads_once_and_tracks_claims(self):
+        doctor = _doctor("a@example.com", "UTC", "09:00", "11:00", 30)
+        monday, tuesday = date(2026, 10, 19), date(2026, 10, 20)
+        db = _fake_db(
+            [(tuesday,)],  # leaves
+            [("apt-1", monday, time(9, 0), time(9, 30))],  # bookings
+        )
+
+        index = AvailabilityService.load_conflict_index(db, doctor, {monday, tuesday})
+
+        self.assertEqual(db.query.call_count, 2)
+        self.assertFalse(index.is_slot_available(monday, time(9, 0), time(9, 30)))
+        self.assertTrue(index.is_slot_available(monday, time(9, 0), time(9, 30), exclude_appointment_id="apt-1"))
+        self.assertFalse(index.is_slot_available(tuesday, time(9, 0), time(9, 30)))
+        self.assertTrue(index.is_slot_available(monday, time(10, 0), time(10, 30)))
+
+        index.claim(monday, time(10, 0), time(10, 30))
+        self.assertFalse(index.is_slot_available(monday, time(10, 0), time(10, 30)))
+        self.assertEqual(db.query.call_count, 2)
+
 
 if __name__ == "__main__":
     unittest.main()
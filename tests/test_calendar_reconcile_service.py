@@ -0,0 +1,114 @@
+import asyncio
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from app.config import settings
+from app.services.calendar_reconcile_service import CalendarReconcileService
+
+
+class _FakeSyncService:
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.running = 0
+        self.max_running = 0
+        self.synced = []
+        self.lock = threading.Lock()  # Each doctor syncs on its own thread
+
+    async def sync_calendar_to_db(self, doctor_email, db, wait=True):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        with self.lock:
+            self.running -= 1
+        if doctor_email in self.failing:
+            raise RuntimeError("Google unavailable")
+        self.synced.append(doctor_email)
+
+
+class CalendarReconcileSweepTest(unittest.TestCase):
+    def test_sweep_pages_by_keyset_and_syncs_concurrently(self):
+        base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        doctors = [(base + timedelta(minutes=i), f"doc{i:02d}@clinic.com") for i in range(10)]
+        cursors = []
+
+        def next_batch(stale_before, cursor=None):
+            cursors.append(cursor)
+            remaining = [row for row in doctors if cursor is None or row > cursor]
+            return remaining[:4]
+
+        service = CalendarReconcileService()
+        service._sync_service = _FakeSyncService(failing={"doc03@clinic.com"})
+        service._get_next_doctor_batch = next_batch
+
+        with patch.object(settings, "CALENDAR_RECONCILE_CONCURRENCY", 3), \
+                patch("app.services.calendar_reconcile_service.SessionLocal"):
+            started = time.monotonic()
+            asyncio.run(service._sweep(900))
+            elapsed = time.monotonic() - started
+
+        self.assertEqual(cursors, [None, doctors[3], doctors[7], doctors[9]])
+        self.assertEqual(len(service._sync_service.synced), 9)  # failed doctor is not retried this sweep
+        self.assertEqual(service._sync_service.max_running, 3)
+        self.assertLess(elapsed, 0.1 * 0.5 * 10)
+
+    def test_a_blocked_doctor_does_not_stall_the_others(self):
+        doctors = [(datetime(2026, 1, 1, tzinfo=timezone.utc), f"doc{i}@clinic.com") for i in range(5)]
+        others_done = threading.Event()
+
+        class _LockWaitingSync(_FakeSyncService):
+            async def sync_calendar_to_db(self, doctor_email, db, wait=True):
+                if doctor_email == "doc0@clinic.com":
+                    others_done.wait(1)  # Blocking wait, like an advisory lock held elsewhere
+                    self.synced.append(doctor_email)
+                    return
+                await super().sync_calendar_to_db(doctor_email, db, wait)
+                if len(self.synced) == 4:
+                    others_done.set()
+
+        service = CalendarReconcileService()
+        service._sync_service = _LockWaitingSync()
+        service._get_next_doctor_batch = lambda stale_before, cursor=None: [] if cursor else doctors
+
+        with patch.object(settings, "CALENDAR_RECONCILE_CONCURRENCY", 2), \
+                patch("app.services.calendar_reconcile_service.SessionLocal"):
+            started = time.monotonic()
+            asyncio.run(service._sweep(900))
+            elapsed = time.monotonic() - started
+
+        self.assertEqual(service._sync_service.synced[-1], "doc0@clinic.com")
+        self.assertLess(elapsed, 0.5)
+
+    def test_doctors_synced_by_a_sweep_are_due_in_the_next_one(self):
+        interval = 900
+        started = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        last_synced = {f"doc{i}@clinic.com": started - timedelta(days=1) for i in range(5)}
+        sweep_now = {}
+
+        def next_batch(stale_before, cursor=None):
+            rows = sorted((synced_at, email) for email, synced_at in last_synced.items() if synced_at < stale_before)
+            return [row for row in rows if cursor is None or row > cursor][:2]
+
+        class _RecordingSync(_FakeSyncService):
+            async def sync_calendar_to_db(self, doctor_email, db, wait=True):
+                await super().sync_calendar_to_db(doctor_email, db, wait)
+                # Synced a little after the sweep started
+                last_synced[doctor_email] = sweep_now["at"] + timedelta(seconds=5)
+
+        service = CalendarReconcileService()
+        service._sync_service = _RecordingSync()
+        service._get_next_doctor_batch = next_batch
+
+        with patch("app.services.calendar_reconcile_service.SessionLocal"):
+            for sweep in range(2):
+                sweep_now["at"] = started + timedelta(seconds=interval * sweep)
+                asyncio.run(service._sweep(interval, now=sweep_now["at"]))
+
+        self.assertEqual(len(service._sync_service.synced), 10)  # every doctor in both sweeps
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from app.services.calendar_sync_debouncer import CalendarSyncDebouncer
+
+
+class _FakeSyncService:
+    def __init__(self, calls, release):
+        self.calls = calls
+        self.release = release
+
+    async def sync_calendar_to_db(self, doctor_email, db):
+        self.calls.append((doctor_email, time.monotonic()))
+        self.release.wait(2)
+        return {}
+
+
+class CalendarSyncDebouncerTest(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+        patches = [
+            patch(
+                "app.services.calendar_sync_debouncer.CalendarSyncService",
+                side_effect=lambda: _FakeSyncService(self.calls, self.release)
+            ),
+            patch("app.services.calendar_sync_debouncer.SessionLocal", return_value=MagicMock()),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.debouncer = CalendarSyncDebouncer(delay_seconds=0.05, min_interval_seconds=0.3, concurrency=2)
+        self.addCleanup(self.debouncer.stop)
+
+    def _wait_for(self, count, timeout=3):
+        deadline = time.monotonic() + timeout
+        while len(self.calls) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_burst_causes_one_sync(self):
+        for _ in range(5):
+            self.debouncer.notify("doc@clinic.com")
+        self._wait_for(1)
+        time.sleep(0.2)
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(self.debouncer.stats()["coalesced"], 4)
+
+    def test_notification_during_sync_runs_again_after_min_interval(self):
+        self.release.clear()
+        self.debouncer.notify("doc@clinic.com")
+        self._wait_for(1)
+        self.debouncer.notify("doc@clinic.com")
+        self.release.set()
+        self._wait_for(2)
+
+        self.assertEqual(len(self.calls), 2)
+        # Timestamps are taken inside the fake, a moment after the scheduler marks the start
+        self.assertGreaterEqual(self.calls[1][1] - self.calls[0][1], 0.25)
+
+    def test_redelivered_message_numbers_are_duplicates(self):
+        self.assertFalse(self.debouncer.is_duplicate("channel", "7"))
+        self.assertTrue(self.debouncer.is_duplicate("channel", "7"))
+        self.assertTrue(self.debouncer.is_duplicate("channel", "6"))
+        self.assertFalse(self.debouncer.is_duplicate("channel", "8"))
+        self.assertFalse(self.debouncer.is_duplicate("other", "1"))
+        self.assertFalse(self.debouncer.is_duplicate("channel", None))
+
+
+if __name__ == "__main__":
+    unittest.main()
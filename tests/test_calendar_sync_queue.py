@@ -0,0 +1,230 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, time as dt_time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from app.config import settings
+from app.models.calendar_sync_job import CalendarSyncJob
+from app.services.calendar_sync_queue import CalendarSyncQueue
+
+
+class CalendarSyncQueueDispatchTest(unittest.TestCase):
+    def test_dispatch_wakes_worker_without_calling_google(self):
+        queue = CalendarSyncQueue()
+        with patch.object(settings, "CALENDAR_SYNC_INLINE", False), \
+                patch.object(queue, "trigger_immediate_sync") as inline:
+            self.assertFalse(queue.dispatch("00000000-0000-0000-0000-000000000001", "CREATE"))
+        inline.assert_not_called()
+        self.assertTrue(queue._wake_event.is_set())
+
+    def test_inline_mode_processes_in_caller(self):
+        queue = CalendarSyncQueue()
+        with patch.object(settings, "CALENDAR_SYNC_INLINE", True), \
+                patch.object(queue, "trigger_immediate_sync") as inline:
+            self.assertTrue(queue.dispatch("00000000-0000-0000-0000-000000000001", "DELETE"))
+        inline.assert_called_once_with("00000000-0000-0000-0000-000000000001", "DELETE")
+        self.assertFalse(queue._wake_event.is_set())
+
+
+def _pending(db, *jobs):
+    db.query.return_value.filter.return_value.order_by.return_value.with_for_update.return_value.all.return_value = \
+        list(jobs)
+
+
+class CalendarSyncQueueOutboxTest(unittest.TestCase):
+    def test_enqueue_with_session_adds_job_without_committing(self):
+        db = MagicMock()
+        _pending(db)
+        CalendarSyncQueue().enqueue_create("00000000-0000-0000-0000-000000000001", db)
+        job = db.add.call_args[0][0]
+        self.assertIsInstance(job, CalendarSyncJob)
+        self.assertEqual((job.action, job.status), ("CREATE", "PENDING"))
+        db.commit.assert_not_called()
+
+    def test_enqueue_skips_duplicate_pending_job(self):
+        db = MagicMock()
+        _pending(db, SimpleNamespace(action="DELETE", status="PENDING"))
+        CalendarSyncQueue().enqueue_delete("00000000-0000-0000-0000-000000000001", db)
+        db.add.assert_not_called()
+
+
+class CalendarSyncQueueCoalesceTest(unittest.TestCase):
+    def test_updates_fold_into_waiting_create(self):
+        db = MagicMock()
+        _pending(db, SimpleNamespace(action="CREATE", status="PENDING"))
+        queue = CalendarSyncQueue()
+        queue.enqueue_update("00000000-0000-0000-0000-000000000001", db)
+        queue.enqueue_update("00000000-0000-0000-0000-000000000001", db)
+        db.add.assert_not_called()
+        self.assertEqual(queue.stats()["google_calls_saved"], 2)
+
+    def test_create_then_delete_is_a_no_op(self):
+        db = MagicMock()
+        create = SimpleNamespace(action="CREATE", status="PENDING")
+        _pending(db, create)
+        db.query.return_value.filter.return_value.all.return_value = []  # nothing in flight
+        appointment = SimpleNamespace(google_calendar_event_id=None, calendar_sync_status="PENDING")
+        db.get.return_value = appointment
+
+        queue = CalendarSyncQueue()
+        queue.enqueue_delete("00000000-0000-0000-0000-000000000001", db)
+
+        db.add.assert_not_called()
+        self.assertEqual(create.status, "COALESCED")
+        self.assertEqual(appointment.calendar_sync_status, "SYNCED")
+        self.assertEqual(queue.stats()["jobs_coalesced"], 2)
+
+    def test_delete_is_kept_while_a_create_is_in_flight(self):
+        db = MagicMock()
+        _pending(db)
+        db.query.return_value.filter.return_value.all.return_value = [("CREATE",)]
+        db.get.return_value = SimpleNamespace(google_calendar_event_id=None, calendar_sync_status="PENDING")
+        CalendarSyncQueue().enqueue_delete("00000000-0000-0000-0000-000000000001", db)
+        self.assertEqual(db.add.call_args[0][0].action, "DELETE")
+
+
+class _FakeListener:
+    def __init__(self, pending):
+        self.pending = pending
+
+    def notifies(self, timeout=None, stop_after=None):
+        while self.pending:
+            self.pending -= 1
+            yield object()
+
+
+class CalendarSyncQueueListenTest(unittest.TestCase):
+    def test_notify_wakes_worker_and_burst_is_drained(self):
+        listener = _FakeListener(pending=3)
+        started = time.monotonic()
+        CalendarSyncQueue()._wait_for_notify(listener, timeout=30)
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(listener.pending, 0)
+
+    def test_wait_returns_after_timeout_without_notifications(self):
+        started = time.monotonic()
+        CalendarSyncQueue()._wait_for_notify(_FakeListener(pending=0), timeout=0.05)
+        self.assertLess(time.monotonic() - started, 1)
+
+
+class CalendarSyncQueuePoolTest(unittest.TestCase):
+    def test_doctors_run_in_parallel_and_each_doctor_stays_in_order(self):
+        queue = CalendarSyncQueue(batch_size=10, concurrency=4)
+        queue._pool = ThreadPoolExecutor(max_workers=4)
+        claims = [(i, "a@example.com" if i % 2 else "b@example.com") for i in range(6)]
+        queue._claim_jobs = lambda limit: claims[:limit]
+
+        processed = []
+        running = set()
+        same_doctor_overlaps = []
+        overlap = threading.Event()
+        lock = threading.Lock()
+
+        def process(job_id):
+            doctor = dict(claims)[job_id]
+            with lock:
+                if doctor in running:
+                    same_doctor_overlaps.append(job_id)
+                running.add(doctor)
+                if len(running) > 1:
+                    overlap.set()
+            time.sleep(0.02)
+            with lock:
+                running.discard(doctor)
+                processed.append(job_id)
+
+        queue._process_job = process
+        self.assertEqual(queue._process_batch(), 6)
+        queue._pool.shutdown(wait=True)
+
+        self.assertTrue(overlap.is_set())
+        self.assertEqual(same_doctor_overlaps, [])
+        self.assertEqual([j for j in processed if j % 2], [1, 3, 5])
+        self.assertEqual([j for j in processed if not j % 2], [0, 2, 4])
+        self.assertEqual(queue._queued, 0)
+
+
+class _HttpError(Exception):
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.resp = SimpleNamespace(status=status)
+
+
+def _batch_appointment(n, event_id=None):
+    return SimpleNamespace(
+        id=f"apt{n}", patient_id="p", status="BOOKED", google_calendar_event_id=event_id,
+        date=date(2026, 10, 19), start_time=dt_time(9, n), end_time=dt_time(9, n + 15), timezone="UTC",
+        calendar_sync_status="PENDING", calendar_sync_attempts=0, calendar_sync_last_error=None,
+        calendar_sync_next_attempt_at=None
+    )
+
+
+def _batch_job(n, action):
+    return SimpleNamespace(
+        id=f"job{n}", appointment_id=f"apt{n}", action=action, status="IN_PROGRESS",
+        attempts=1, last_error=None, next_attempt_at=None
+    )
+
+
+class CalendarSyncQueueBatchTest(unittest.TestCase):
+    def test_batch_results_map_back_to_jobs(self):
+        job, appointment = _batch_job, _batch_appointment
+        jobs = [job(1, "CREATE"), job(2, "DELETE"), job(3, "UPDATE"), job(4, "UPDATE")]
+        appointments = [appointment(1), appointment(2, "e2"), appointment(3, "e3"), appointment(4, "e4")]
+        db = MagicMock()
+        db.query.return_value.filter.return_value.all.side_effect = [
+            jobs, appointments, [SimpleNamespace(id="p", name="Pat")]
+        ]
+
+        queue = CalendarSyncQueue()
+        calls = []
+        queue._thread_state.calendar_service = SimpleNamespace(
+            execute_batch=lambda doctor, ops: calls.append(ops) or [
+                ({"id": "new1"}, None), (None, _HttpError(410)), (None, _HttpError(500)), (None, _HttpError(404))
+            ]
+        )
+        single = []
+        queue._process_job = single.append
+
+        with patch("app.services.calendar_sync_queue.SessionLocal", return_value=db):
+            queue._process_job_batch("doc@example.com", [j.id for j in jobs])
+
+        self.assertEqual([op[0] for op in calls[0]], ["insert", "delete", "patch", "patch"])
+        self.assertEqual(appointments[0].google_calendar_event_id, "new1")
+        self.assertEqual([j.status for j in jobs[:3]], ["COMPLETED", "COMPLETED", "PENDING"])
+        self.assertIn("500", jobs[2].last_error)
+        self.assertIsNotNone(jobs[2].next_attempt_at)
+        self.assertEqual(single, ["job4"])  # event gone: recreated via the single-job path
+        db.commit.assert_called_once()
+
+    def test_insert_without_event_id_is_retried(self):
+        jobs = [_batch_job(1, "CREATE"), _batch_job(2, "CREATE")]
+        appointments = [_batch_appointment(1), _batch_appointment(2)]
+        db = MagicMock()
+        db.query.return_value.filter.return_value.all.side_effect = [
+            jobs, appointments, [SimpleNamespace(id="p", name="Pat")]
+        ]
+
+        queue = CalendarSyncQueue()
+        queue._thread_state.calendar_service = SimpleNamespace(
+            execute_batch=lambda doctor, ops: [(None, None), ({"status": "confirmed"}, None)]
+        )
+        queue._process_job = MagicMock()
+
+        with patch("app.services.calendar_sync_queue.SessionLocal", return_value=db):
+            queue._process_job_batch("doc@example.com", [j.id for j in jobs])
+
+        for job, appointment in zip(jobs, appointments):
+            self.assertEqual(job.status, "PENDING")
+            self.assertIn("no event id", job.last_error)
+            self.assertIsNotNone(job.next_attempt_at)
+            self.assertIsNone(appointment.google_calendar_event_id)
+            self.assertNotEqual(appointment.calendar_sync_status, "SYNCED")
+        queue._process_job.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,200 @@
+import asyncio
+import unittest
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from googleapiclient.errors import HttpError
+from sqlalchemy.exc import OperationalError
+
+from app.services.calendar_sync_service import CalendarSyncService
+
+
+def _http_error(status):
+    return HttpError(SimpleNamespace(status=status, reason="Gone"), b"")
+
+
+def _event(event_id, status="confirmed", days_ahead=1, etag=None):
+    start = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(days=days_ahead)
+    return {
+        "id": event_id,
+        "status": status,
+        "etag": etag,
+        "start": {"dateTime": start.isoformat()},
+        "end": {"dateTime": (start + timedelta(minutes=30)).isoformat()},
+    }
+
+
+def _appointment(event_id, etag=None):
+    start = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(days=1)
+    return SimpleNamespace(
+        id=event_id, google_calendar_event_id=event_id, google_calendar_event_etag=etag, date=start.date(),
+        start_at_utc=start, end_at_utc=start + timedelta(minutes=30)
+    )
+
+
+class CalendarSyncServiceIncrementalTest(unittest.TestCase):
+    def setUp(self):
+        self.service = CalendarSyncService()
+        self.state = SimpleNamespace(sync_token="token-1", last_synced_at=None, last_full_sync_at=None)
+        self.service._lock_sync_state = lambda db, email, nowait=False: self.state
+        self.service._handle_deleted_event = MagicMock(side_effect=lambda apt, db: asyncio.sleep(0, "deleted"))
+        self.service._create_appointment_from_calendar = MagicMock(
+            side_effect=lambda event, slot_index, db, walkin_patients: asyncio.sleep(0, "created")
+        )
+        self.service._load_conflict_index = MagicMock()
+
+    def _sync(self, fetch, db_appointments, db=None):
+        db = db or MagicMock()
+        db.query.return_value.filter.return_value.first.return_value = SimpleNamespace(email="doc@clinic.com")
+        query = db.query.return_value.filter.return_value
+        query.all.return_value = db_appointments
+        query.filter.return_value.all.return_value = db_appointments
+
+        async def pages(email, token=None):
+            events, next_token = await fetch(email, token)
+            # One page per event; only the last carries the sync token
+            for index, event in enumerate(events):
+                last = index == len(events) - 1
+                yield {"items": [event], "nextSyncToken": next_token if last else None}
+            if not events:
+                yield {"items": [], "nextSyncToken": next_token}
+
+        self.service._iter_calendar_pages = pages
+        with patch("app.services.calendar_sync_service.lock_doctor_days"):
+            return asyncio.run(self.service.sync_calendar_to_db("doc@clinic.com", db))
+
+    def test_only_changed_events_are_applied(self):
+        async def fetch(email, token=None):
+            self.assertEqual(token, "token-1")
+            return [_event("gone", status="cancelled"), _event("new"), _event("old", days_ahead=-2)], "token-2"
+
+        stats = self._sync(fetch, [_appointment("gone")])
+
+        self.assertEqual((stats["deleted"], stats["created"], stats["full_sync"]), (1, 1, False))
+        self.assertEqual(self.state.sync_token, "token-2")
+        self.assertIsNone(self.state.last_full_sync_at)
+
+    def test_new_events_beyond_availability_window_are_not_imported(self):
+        async def fetch(email, token=None):
+            return [_event("soon"), _event("far", days_ahead=400)], "token-2"
+
+        stats = self._sync(fetch, [])
+
+        self.assertEqual(stats["created"], 1)
+        self.assertEqual(self.state.sync_token, "token-2")
+
+    def test_events_with_stored_etag_are_skipped(self):
+        async def fetch(email, token=None):
+            return [_event("same", etag='"1"'), _event("edited", etag='"2"')], "token-2"
+
+        edited = _appointment("edited", etag='"1"')
+        self.service._is_event_modified = MagicMock(side_effect=lambda event, apt: asyncio.sleep(0, False))
+
+        stats = self._sync(fetch, [_appointment("same", etag='"1"'), edited])
+
+        self.assertEqual(stats["unchanged"], 1)
+        self.assertEqual(self.service._is_event_modified.call_count, 1)
+        self.assertEqual(edited.google_calendar_event_etag, '"2"')
+
+    def test_expired_token_triggers_full_resync(self):
+        calls = []
+
+        async def fetch(email, token=None):
+            calls.append(token)
+            if token:
+                raise _http_error(410)
+            return [_event("kept")], "token-full"
+
+        stats = self._sync(fetch, [_appointment("kept"), _appointment("missing")])
+
+        self.assertEqual(calls, ["token-1", None])
+        self.assertTrue(stats["full_sync"])
+        self.assertEqual(stats["deleted"], 1)  # absent from the full listing
+        self.assertEqual(self.state.sync_token, "token-full")
+        self.assertIsNotNone(self.state.last_full_sync_at)
+
+    def test_full_listing_runs_with_the_transaction_released(self):
+        calls = []
+        self.state.sync_token = None
+        self.service._lock_sync_state = lambda db, email, nowait=False: calls.append("lock") or self.state
+        db = MagicMock()
+        db.rollback.side_effect = lambda: calls.append("rollback")
+
+        async def fetch(email, token=None):
+            calls.append("list")
+            return [_event("kept")], "token-full"
+
+        stats = self._sync(fetch, [_appointment("kept")], db=db)
+
+        self.assertEqual(calls, ["lock", "rollback", "list", "lock"])
+        self.assertTrue(stats["full_sync"])
+        self.assertEqual(self.state.sync_token, "token-full")
+
+    def test_full_listing_superseded_by_another_sync_continues_incrementally(self):
+        synced_elsewhere = SimpleNamespace(
+            sync_token="token-other", last_synced_at=datetime.now(timezone.utc), last_full_sync_at=None
+        )
+        states = [SimpleNamespace(sync_token=None, last_synced_at=None, last_full_sync_at=None)] + [synced_elsewhere] * 2
+        self.service._lock_sync_state = lambda db, email, nowait=False: states.pop(0)
+        tokens = []
+
+        async def fetch(email, token=None):
+            tokens.append(token)
+            return [], "token-next"
+
+        stats = self._sync(fetch, [_appointment("kept")])
+
+        self.assertEqual(tokens, [None, "token-other"])
+        self.assertFalse(stats["full_sync"])
+        self.assertEqual(stats["deleted"], 0)  # the stale full listing was not applied
+        self.assertEqual(synced_elsewhere.sync_token, "token-next")
+
+    def test_other_errors_do_not_reset_the_token(self):
+        async def fetch(email, token=None):
+            raise _http_error(500)
+
+        with self.assertRaises(HttpError):
+            self._sync(fetch, [])
+        self.assertEqual(self.state.sync_token, "token-1")
+
+    def test_nowait_lock_skips_a_doctor_already_syncing(self):
+        service = CalendarSyncService()
+        db = MagicMock()
+        locked = OperationalError("SELECT ... FOR UPDATE NOWAIT", {}, SimpleNamespace(sqlstate="55P03"))
+        db.query.return_value.filter.return_value.with_for_update.return_value.one.side_effect = locked
+
+        self.assertIsNone(service._lock_sync_state(db, "doc@clinic.com", nowait=True))
+        db.rollback.assert_called_once()
+        with self.assertRaises(OperationalError):
+            service._lock_sync_state(db, "doc@clinic.com")
+
+
+class CalendarSyncServiceImportTest(unittest.TestCase):
+    def test_new_events_share_one_walkin_lookup_and_see_each_other(self):
+        service = CalendarSyncService()
+        doctor = SimpleNamespace(email="doc@clinic.com", timezone="UTC")
+        slot_index = MagicMock(doctor=doctor)
+        taken = []
+        slot_index.is_slot_available.side_effect = lambda slot_date, slot_start_time, slot_end_time: (
+            (slot_date, slot_start_time) not in taken
+        )
+        slot_index.claim.side_effect = lambda day, start, end, appointment_id=None: taken.append((day, start))
+        service._delete_calendar_event = MagicMock(side_effect=lambda *args: asyncio.sleep(0))
+        db = MagicMock()
+        db.query.return_value.filter.return_value.first.return_value = None
+        walkin_patients = {}
+
+        async def run():
+            results = []
+            for event in [_event("a"), _event("b"), _event("c", days_ahead=2)]:
+                results.append(await service._create_appointment_from_calendar(event, slot_index, db, walkin_patients))
+            return results
+
+        self.assertEqual(asyncio.run(run()), ["created", "conflicts", "created"])
+        self.assertEqual(db.query.call_count, 1)  # placeholder patient looked up once
+        db.flush.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from app.services.calendar_watch_service import CalendarWatchService
+
+
+class CalendarWatchServiceTest(unittest.TestCase):
+    def setUp(self):
+        self.service = CalendarWatchService()
+
+    def test_channel_info_is_cached_until_the_channel_is_stopped(self):
+        watch = SimpleNamespace(doctor_email="doc@clinic.com", token="secret", channel_id="ch-1", resource_id="r-1")
+        db = MagicMock()
+        db.query.return_value.filter.return_value.first.return_value = watch
+
+        for _ in range(3):
+            info = self.service.get_channel_info("ch-1", db)
+        self.assertEqual(info, {"doctor_email": "doc@clinic.com", "token": "secret"})
+        self.assertEqual(db.query.call_count, 1)
+
+        self.service.calendar_service = MagicMock()
+        self.service.stop_watch(watch, db)
+        db.query.return_value.filter.return_value.first.return_value = None
+        self.assertIsNone(self.service.get_channel_info("ch-1", db))
+        self.assertEqual(db.query.call_count, 2)
+
+    def test_renewals_record_lag_and_failures(self):
+        now = datetime.now(timezone.utc)
+        watches = {
+            "late": SimpleNamespace(doctor_email="a@clinic.com", is_active=True, expiration=now + timedelta(hours=20)),
+            "expired": SimpleNamespace(doctor_email="b@clinic.com", is_active=True, expiration=now - timedelta(hours=1)),
+            "broken": SimpleNamespace(doctor_email="c@clinic.com", is_active=True, expiration=now + timedelta(hours=2)),
+        }
+        session = MagicMock()
+        session.get.side_effect = lambda model, watch_id: watches[watch_id]
+        db = MagicMock()
+        db.query.return_value.filter.return_value.all.return_value = [(watch_id,) for watch_id in watches]
+
+        def renew(watch, db):
+            if watch is watches["broken"]:
+                raise RuntimeError("quota")
+
+        self.service.renew_watch = MagicMock(side_effect=renew)
+        with patch("app.services.calendar_watch_service.SessionLocal", return_value=session):
+            self.service.renew_expiring_watches(db)
+
+        stats = self.service.stats()
+        self.assertEqual((stats["renewals"], stats["renewal_failures"], stats["expired_before_renewal"]), (2, 1, 1))
+        # The expired watch entered its renewal window 25 hours ago
+        self.assertAlmostEqual(stats["last_renew_lag_seconds"], 25 * 3600, delta=60)
+
+
+if __name__ == "__main__":
+    unittest.main()
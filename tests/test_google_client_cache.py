@@ -0,0 +1,62 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from app.config import settings
+from app.services.google_client_cache import GoogleClientCache
+
+
+def _service_account_file():
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    ).decode()
+    handle, path = tempfile.mkstemp(suffix=".json")
+    with os.fdopen(handle, "w") as f:
+        json.dump({
+            "type": "service_account",
+            "project_id": "test",
+            "private_key_id": "1",
+            "private_key": pem,
+            "client_email": "svc@test.iam.gserviceaccount.com",
+            "client_id": "1",
+            "token_uri": "https://oauth2.googleapis.com/token"
+        }, f)
+    return path
+
+
+class GoogleClientCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.path = _service_account_file()
+        self.addCleanup(os.remove, self.path)
+        patcher = patch.object(settings, "GOOGLE_CALENDAR_CREDENTIALS_PATH", self.path)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_client_is_built_once_per_subject(self):
+        cache = GoogleClientCache(max_entries=2)
+        first = cache.get("doc@clinic.com", delegate=True)
+        self.assertIs(cache.get("Doc@Clinic.com", delegate=True), first)
+        self.assertIsNot(cache.get("other@clinic.com", delegate=True), first)
+        self.assertIs(cache.get("a@gmail.com", delegate=False), cache.get("b@gmail.com", delegate=False))
+
+        stats = cache.stats()
+        self.assertEqual(stats["builds"], 3)
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["entries"], 2)  # bounded LRU evicted the oldest
+
+    def test_requests_carry_subject_credentials(self):
+        client = GoogleClientCache().get("doc@clinic.com", delegate=True)
+        request = client.events().list(calendarId="doc@clinic.com")
+        self.assertEqual(request.http.credentials._subject, "doc@clinic.com")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+from collections import deque
+from unittest.mock import patch
+
+from app.services.calendar_sync_queue import CalendarSyncQueue
+from app.services.google_rate_limiter import GoogleRateLimiter
+
+
+class GoogleRateLimiterTest(unittest.TestCase):
+    def test_user_budget_is_separate_and_project_budget_is_shared(self):
+        limiter = GoogleRateLimiter(user_rate=1, user_burst=2, project_rate=1, project_burst=3, redis_url=None)
+        limiter.acquire("a@clinic.com", cost=2)
+        self.assertGreater(limiter.delay("a@clinic.com"), 0)
+        self.assertEqual(limiter.delay("b@clinic.com"), 0)
+
+        limiter.acquire("b@clinic.com")
+        self.assertGreater(limiter.delay("c@clinic.com"), 0)  # project bucket is empty
+
+    def test_delay_does_not_take_tokens(self):
+        limiter = GoogleRateLimiter(user_rate=1, user_burst=1, project_rate=10, project_burst=10, redis_url=None)
+        for _ in range(3):
+            self.assertEqual(limiter.delay("a@clinic.com"), 0)
+        self.assertEqual(limiter.acquire("a@clinic.com"), 0)
+
+    def test_acquire_waits_for_refill(self):
+        limiter = GoogleRateLimiter(user_rate=50, user_burst=1, project_rate=50, project_burst=1, redis_url=None)
+        limiter.acquire("a@clinic.com")
+        self.assertGreater(limiter.acquire("a@clinic.com"), 0)
+        self.assertEqual(limiter.stats()["throttled"], 1)
+
+
+class CalendarSyncQueueRateLimitTest(unittest.TestCase):
+    def test_worker_defers_doctor_instead_of_sleeping(self):
+        queue = CalendarSyncQueue()
+        queue._doctor_queues["doc@clinic.com"] = deque(["j1", "j2", "j3"])
+        queue._queued = 3
+        released = []
+        queue._release_jobs = lambda job_ids, next_attempt_at=None: released.append((job_ids, next_attempt_at))
+        queue._process_job = queue._process_job_batch = lambda *args: self.fail("job ran while throttled")
+
+        with patch("app.services.calendar_sync_queue.google_rate_limiter.delay", return_value=2.5):
+            queue._drain_doctor("doc@clinic.com")
+
+        self.assertEqual(released[0][0], ["j1", "j2", "j3"])
+        self.assertIsNotNone(released[0][1])
+        self.assertEqual(queue._queued, 0)
+        self.assertNotIn("doc@clinic.com", queue._doctor_queues)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+from unittest.mock import patch
+
+from app.services.leader_election import LeaderElector
+
+
+class _FakeConnection:
+    def __init__(self, granted):
+        self.granted = granted
+        self.alive = True
+        self.closed = False
+
+    def execute(self, query, params=None):
+        if not self.alive:
+            raise OSError("connection lost")
+        result = self.granted
+
+        class _Result:
+            def fetchone(self):
+                return (result,)
+        return _Result()
+
+    def close(self):
+        self.closed = True
+
+
+class LeaderElectorTest(unittest.TestCase):
+    def setUp(self):
+        self.events = []
+        self.elector = LeaderElector(
+            "test",
+            on_elected=lambda: self.events.append("elected"),
+            on_revoked=lambda: self.events.append("revoked")
+        )
+
+    def test_only_the_lock_holder_becomes_leader(self):
+        conn = _FakeConnection(granted=False)
+        with patch("app.services.leader_election.psycopg.connect", return_value=conn):
+            self.elector._try_acquire()
+        self.assertFalse(self.elector.is_leader)
+        self.assertTrue(conn.closed)
+        self.assertEqual(self.events, [])
+
+    def test_leader_steps_down_when_its_connection_drops(self):
+        conn = _FakeConnection(granted=True)
+        with patch("app.services.leader_election.psycopg.connect", return_value=conn):
+            self.elector._try_acquire()
+        self.assertTrue(self.elector.is_leader)
+
+        self.elector._check_connection()
+        self.assertTrue(self.elector.is_leader)
+        conn.alive = False
+        self.elector._check_connection()
+
+        self.assertFalse(self.elector.is_leader)
+        self.assertEqual(self.events, ["elected", "revoked"])
+        self.assertTrue(conn.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
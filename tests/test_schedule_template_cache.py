@@ -0,0 +1,44 @@
+import unittest
+from datetime import date, datetime, time, timezone
+from types import SimpleNamespace
+
+from app.services.schedule_template_cache import ScheduleTemplateCache
+
+
+def _doctor(updated_at, start="09:00"):
+    return SimpleNamespace(
+        email="doc@example.com",
+        working_days=["Monday", "wednesday"],
+        working_hours={"start": start, "end": "10:00"},
+        slot_duration_minutes=30,
+        updated_at=updated_at
+    )
+
+
+class ScheduleTemplateCacheTest(unittest.TestCase):
+    def test_template_is_parsed_once_per_version(self):
+        cache = ScheduleTemplateCache()
+        version = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        first = cache.get(_doctor(version))
+        self.assertIs(cache.get(_doctor(version)), first)
+        self.assertEqual(first.grid, (540, 570))
+        self.assertTrue(first.works_on(date(2026, 10, 19)))  # Monday
+        self.assertFalse(first.works_on(date(2026, 10, 20)))  # Tuesday
+
+    def test_changed_doctor_rebuilds_template(self):
+        cache = ScheduleTemplateCache()
+        cache.get(_doctor(datetime(2026, 1, 1, tzinfo=timezone.utc)))
+        updated = cache.get(_doctor(datetime(2026, 1, 2, tzinfo=timezone.utc), start="09:30"))
+        self.assertEqual(updated.working_start, time(9, 30))
+        self.assertEqual(updated.grid, (570,))
+
+    def test_invalidate_drops_entry(self):
+        cache = ScheduleTemplateCache()
+        version = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        first = cache.get(_doctor(version))
+        cache.invalidate("doc@example.com")
+        self.assertIsNot(cache.get(_doctor(version)), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
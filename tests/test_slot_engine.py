@@ -0,0 +1,32 @@
+import unittest
+from datetime import time
+
+from app.services import slot_engine
+
+
+class SlotEngineTest(unittest.TestCase):
+    def test_masks_overlapping_bookings(self):
+        slots = slot_engine.available_slots(
+            working_start=time(9, 0),
+            working_end=time(11, 0),
+            slot_duration_minutes=30,
+            booked_ranges=[(time(9, 30), time(10, 0)), (time(10, 15), time(10, 45))]
+        )
+        self.assertEqual(
+            [(slot.start_time, slot.end_time) for slot in slots],
+            [(time(9, 0), time(9, 30))]
+        )
+
+    def test_partial_minutes_round_outwards(self):
+        busy = slot_engine.busy_mask([(time(9, 59, 30), time(10, 0, 1))])
+        grid = slot_engine.build_slot_grid(9 * 60, 11 * 60, 60)
+        self.assertEqual(slot_engine.free_slot_starts(grid, 60, busy), [])
+
+    def test_adjacent_booking_does_not_block(self):
+        busy = slot_engine.busy_mask([(time(8, 0), time(9, 0))])
+        grid = slot_engine.build_slot_grid(9 * 60, 10 * 60, 30)
+        self.assertEqual(slot_engine.free_slot_starts(grid, 30, busy), [540, 570])
+
+
+if __name__ == "__main__":
+    unittest.main()